@@ -0,0 +1,38 @@
+"""
+Microbenchmark of DeductivePredicate evaluation, the hottest frame of the reasoning engine.
+
+Run from the repository root:
+    python -m benchmarks.predicate_evaluation_benchmark
+"""
+import timeit
+from src.business_rules_reasoning.base import OperatorType
+from src.business_rules_reasoning.deductive import PredicateBuilder
+
+CASES = [
+    ("number >=", OperatorType.GREATER_OR_EQUAL, 700, 720),
+    ("string =", OperatorType.EQUAL, "approved", "Approved"),
+    ("between", OperatorType.BETWEEN, [18, 65], 40),
+    ("is in", OperatorType.IS_IN, ["north", "south", "east", "west"], "west"),
+    ("is in 500", OperatorType.IS_IN, [f"P{code}" for code in range(500)], "p499"),
+]
+
+def build_predicate(operator, right_value, left_value):
+    predicate = PredicateBuilder().configure_predicate("variable", operator, right_value).unwrap()
+    predicate.left_term.value = left_value
+    return predicate
+
+def evaluate_once(predicate):
+    predicate.reset_evaluation()
+    predicate.evaluate()
+
+def run(number: int = 100000):
+    print(f"{'case':<12}{'evaluate (us)':>16}{'evaluate_value (us)':>22}{'display (us)':>16}")
+    for name, operator, right_value, left_value in CASES:
+        predicate = build_predicate(operator, right_value, left_value)
+        evaluate_time = min(timeit.repeat(lambda: evaluate_once(predicate), number=number, repeat=3)) / number * 1e6
+        evaluate_value_time = min(timeit.repeat(lambda: predicate.evaluate_value(left_value), number=number, repeat=3)) / number * 1e6
+        display_time = min(timeit.repeat(predicate.display, number=number, repeat=3)) / number * 1e6
+        print(f"{name:<12}{evaluate_time:>16.3f}{evaluate_value_time:>22.3f}{display_time:>16.3f}")
+
+if __name__ == "__main__":
+    run()
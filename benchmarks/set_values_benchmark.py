@@ -0,0 +1,43 @@
+"""
+Cost of DeductiveReasoningService.set_values on knowledge bases of growing size.
+
+Every rule tests its own score variable and the first ten rules also test "region", so setting "region" touches the
+same ten predicates at every size while setting "income" touches one predicate per rule. The time of the first stays
+flat as rules are added, the cached compiled index is looked up in O(1) and only the affected predicates are updated.
+
+Run from the repository root:
+    python -m benchmarks.set_values_benchmark
+"""
+import timeit
+from itertools import cycle
+from src.business_rules_reasoning.base import OperatorType, ReasoningProcess, ReasoningMethod
+from src.business_rules_reasoning.deductive import KnowledgeBaseBuilder, RuleBuilder, PredicateBuilder, VariableBuilder, DeductiveReasoningService
+
+AFFECTED_RULES = 10
+
+def build_knowledge_base(rule_count: int):
+    builder = KnowledgeBaseBuilder().set_id("set_values")
+    for rule_index in range(rule_count):
+        rule_builder = RuleBuilder().set_conclusion(VariableBuilder().set_id("decision").set_value(f"decision_{rule_index % 100}").unwrap())
+        rule_builder.add_predicate(PredicateBuilder().configure_predicate(f"score_{rule_index}", OperatorType.GREATER_OR_EQUAL, rule_index).unwrap())
+        rule_builder.add_predicate(PredicateBuilder().configure_predicate("income", OperatorType.GREATER_OR_EQUAL, rule_index).unwrap())
+        if rule_index < AFFECTED_RULES:
+            rule_builder.add_predicate(PredicateBuilder().configure_predicate("region", OperatorType.EQUAL, "north").unwrap())
+        builder.add_rule(rule_builder.unwrap())
+    return builder.unwrap()
+
+def measure(rule_count: int, variable_id: str, values: list, number: int) -> float:
+    reasoning_process = DeductiveReasoningService.start_reasoning(ReasoningProcess(reasoning_method=ReasoningMethod.DEDUCTION, knowledge_base=build_knowledge_base(rule_count)))
+    # Alternating values re-open the affected rules on every call, like a fact corrected between turns
+    values = cycle(values)
+    return min(timeit.repeat(lambda: DeductiveReasoningService.set_values(reasoning_process, {variable_id: next(values)}), number=number, repeat=3)) / number * 1e6
+
+def run(rule_counts=(1000, 5000, 20000, 50000), number: int = 200):
+    print(f"{'rules':>8}{'region (us)':>14}{'income (us)':>14}")
+    for rule_count in rule_counts:
+        region_time = measure(rule_count, "region", ["north", "south"], number)
+        income_time = measure(rule_count, "income", [0, -1], number // 20)
+        print(f"{rule_count:>8}{region_time:>14.1f}{income_time:>14.1f}")
+
+if __name__ == "__main__":
+    run()
@@ -3,7 +3,7 @@ from .knowledge_base import KnowledgeBase
 from .rule import Rule
 from .predicate import Predicate
 from .reasoning_process import ReasoningProcess
-from .reasoning_enums import ReasoningState, EvaluationMessage, ReasoningMethod, ReasoningType
+from .reasoning_enums import ReasoningState, EvaluationMessage, ReasoningMethod, ReasoningType, HitPolicy
 from .operator_enums import OperatorType
 from .reasoning_service import ReasoningService
 from .conclusion import Conclusion
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 
 class Conclusion(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def is_valid(self) -> bool:
         pass
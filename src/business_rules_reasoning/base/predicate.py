@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 
 class Predicate(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def get_result(self):
         pass
@@ -21,4 +21,11 @@ class ReasoningMethod(Enum):
 
 class ReasoningType(Enum):
     CRISP = "CRISP"
-    FUZZY = "FUZZY"
\ No newline at end of file
+    FUZZY = "FUZZY"
+
+class HitPolicy(Enum):
+    UNIQUE = "UNIQUE"
+    FIRST = "FIRST"
+    PRIORITY = "PRIORITY"
+    ANY = "ANY"
+    COLLECT = "COLLECT"
@@ -3,6 +3,8 @@ from .predicate import Predicate
 from .conclusion import Conclusion
 
 class Rule:
+    __slots__ = ("conclusion", "predicates", "result", "evaluated")
+
     def __init__(self, conclusion: Conclusion = None, predicates: List[Predicate] = None):
         self.conclusion: Conclusion = conclusion
         self.predicates: List[Predicate] = predicates if predicates is not None else []
@@ -13,6 +15,9 @@ class Rule:
         if self.evaluated:
             return
 
+        # Single pass, stops at the first false predicate
+        all_evaluated = True
+        any_false = False
         for predicate in self.predicates:
             if not predicate.get_missing_variables():
                 predicate.evaluate()
@@ -21,9 +26,12 @@ class Rule:
                     self.result = False
                     self.evaluated = True
                     return
+            elif not predicate.is_evaluated():
+                all_evaluated = False
+            elif not predicate.get_result():
+                any_false = True
 
-        if any(predicate.is_evaluated() and not predicate.get_result() for predicate in self.predicates) or \
-           all(predicate.is_evaluated() for predicate in self.predicates):
+        if any_false or all_evaluated:
             self.result = True
             self.evaluated = True
 
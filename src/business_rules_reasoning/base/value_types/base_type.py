@@ -1,4 +1,6 @@
 class BaseType:
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
@@ -68,6 +70,17 @@ class BaseType:
     def get_value(self):
         return self.value
 
+    def get_normalized_value(self):
+        """
+        Returns a hashable value shared by all BaseType instances equal to this one, or None if it equals nothing.
+        """
+        if self.is_number_or_boolean():
+            value = float(self.value)
+            return value if value == value else None
+        if self.is_string():
+            return self.value.lower()
+        return None
+
     def __str__(self):
         return str(self.value)
 
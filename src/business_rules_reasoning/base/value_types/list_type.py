@@ -1,6 +1,9 @@
+from collections import Counter
 from .base_type import BaseType
 
 class ListType:
+    __slots__ = ("values", "_normalized_values", "_unmatched_count")
+
     def __init__(self, lst):
         self.values = []
         try:
@@ -8,20 +11,43 @@ class ListType:
                 self.values.append(BaseType(item))
         except Exception as ex:
             raise Exception("Couldn't convert object to a list") from ex
+        # Built on the first equality or membership test, BETWEEN bounds never need it
+        self._normalized_values = None
+        self._unmatched_count = 0
+
+    @property
+    def normalized_values(self) -> Counter:
+        if self._normalized_values is None:
+            self._normalize()
+        return self._normalized_values
+
+    @property
+    def unmatched_count(self) -> int:
+        if self._normalized_values is None:
+            self._normalize()
+        return self._unmatched_count
+
+    def _normalize(self):
+        # Normalized values follow BaseType equality, items that equal nothing are only counted
+        normalized_values = Counter()
+        unmatched_count = 0
+        for value in self.values:
+            normalized_value = value.get_normalized_value()
+            if normalized_value is None:
+                unmatched_count += 1
+            else:
+                normalized_values[normalized_value] += 1
+        self._unmatched_count = unmatched_count
+        self._normalized_values = normalized_values
 
     def __eq__(self, other):
         if not isinstance(other, ListType):
             return False
         if len(self.values) != len(other.values):
             return False
-
-        right_term_copy = other.values.copy()
-        for value in self.values:
-            if value in right_term_copy:
-                right_term_copy.remove(value)
-            else:
-                return False
-        return True
+        if self.unmatched_count or other.unmatched_count:
+            return False
+        return self.normalized_values == other.normalized_values
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -45,19 +71,18 @@ class ListType:
 
     def __contains__(self, other) -> bool:
         if isinstance(other, BaseType):
-            return other in self.values
+            return self._contains_value(other)
         elif isinstance(other, ListType):
-            for item in other.values:
-                if item in self.values:
-                    continue
-                else:
-                    return False
-            return True
+            return all(self._contains_value(item) for item in other.values)
         else:
             return False
 
+    def _contains_value(self, value: BaseType) -> bool:
+        normalized_value = value.get_normalized_value()
+        return normalized_value is not None and normalized_value in self.normalized_values
+
     def get_value(self):
         return self.values
     
     def get_type(self):
-        return "list"
\ No newline at end of file
+        return "list"
@@ -1,6 +1,8 @@
 from .value_types import BaseType, ListType
 
 class Variable:
+    # Knowledge bases hold several variables per predicate, slots keep them without a __dict__
+    __slots__ = ("id", "name", "value", "frequency")
     _function_escape = "="
 
     def __init__(self, id=None, name=None, value=None):
@@ -10,21 +12,25 @@ class Variable:
         self.frequency = 0
 
     def get_value(self):
+        return Variable.cast_value(self.value, self.id, self.name)
+
+    @staticmethod
+    def cast_value(value, id=None, name=None):
         try:
-            if isinstance(self.value, str):
-                if self.value.startswith(self._function_escape):
-                    # return FunctionType(self.value)
+            if isinstance(value, str):
+                if value.startswith(Variable._function_escape):
+                    # return FunctionType(value)
                     return None
                 else:
-                    return BaseType(self.value)
-            elif isinstance(self.value, (int, float, bool, int)):
-                return BaseType(self.value)
-            elif isinstance(self.value, (list, tuple, set)):
-                return ListType(self.value)
+                    return BaseType(value)
+            elif isinstance(value, (int, float, bool, int)):
+                return BaseType(value)
+            elif isinstance(value, (list, tuple, set)):
+                return ListType(value)
             else:
-                raise Exception(f"Unknown variable type at {self.id}")
+                raise Exception(f"Unknown variable type at {id}")
         except Exception as ex:
-            raise Exception(f"Couldn't cast value of {self.name}. Unknown value type") from ex
+            raise Exception(f"Couldn't cast value of {name}. Unknown value type") from ex
         
     def get_value_type(self):
         return self.get_value().get_type()
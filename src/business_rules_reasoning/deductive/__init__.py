@@ -2,3 +2,20 @@ from .deductive_predicate import DeductivePredicate
 from .knowledge_builder import KnowledgeBaseBuilder, RuleBuilder, PredicateBuilder, VariableBuilder
 from .deductive_reasoning_service import DeductiveReasoningService
 from .deductive_conclusion import DeductiveConclusion
+from .compiled_knowledge_base import CompiledKnowledgeBase
+from .reasoning_session import ReasoningSession
+from .session_reasoning_service import SessionReasoningService
+from .batch_evaluation import BatchEvaluationResult
+from .knowledge_base_normalizer import normalize_knowledge_base, normalize_rules
+from .predicate_ordering import PredicateStatistics, order_predicates_by_cost
+from .interval_index import IntervalIndex
+from .equality_index import EqualityIndex, IndexedEvaluator
+from .discrimination_tree import DiscriminationTree, DiscriminationTreeEvaluator
+from .generated_evaluator import GeneratedEvaluator
+from .bitset_state import BitsetResults
+from .question_planner import QuestionPlanner
+from .backward_chaining import BackwardChainer
+from .reasoning_cache import ReasoningCache
+from .hit_policy import get_hit_policy
+from .knowledge_base_specializer import specialize
+from .rule_set_optimizer import OptimizationReport, optimize_rules, optimize_knowledge_base
\ No newline at end of file
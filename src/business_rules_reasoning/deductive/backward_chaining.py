@@ -0,0 +1,185 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Set
+from ..base import ReasoningProcess, Rule
+from .reasoning_session import ReasoningSession
+
+class ChainingState(ABC):
+    """
+    Facts and rule results of a reasoning process as read and recorded by the BackwardChainer.
+    """
+    @abstractmethod
+    def get_fact(self, variable_id: str):
+        pass
+
+    @abstractmethod
+    def set_fact(self, variable_id: str, value):
+        pass
+
+    @abstractmethod
+    def get_rule_result(self, rule_index: int) -> Optional[bool]:
+        pass
+
+    @abstractmethod
+    def evaluate_rule(self, rule_index: int) -> Optional[bool]:
+        pass
+
+class ProcessChainingState(ChainingState):
+    """
+    State kept in the predicates and rules of the knowledge base, as used by DeductiveReasoningService.
+    """
+    def __init__(self, compiled):
+        self.compiled = compiled
+
+    def get_fact(self, variable_id: str):
+        predicates = self.compiled.predicates_by_variable.get(variable_id, ())
+        return next((predicate.left_term.value for predicate in predicates if not predicate.left_term.is_empty()), None)
+
+    def set_fact(self, variable_id: str, value):
+        self.compiled.set_values({variable_id: value})
+
+    def get_rule_result(self, rule_index: int) -> Optional[bool]:
+        rule = self.compiled.rule_set[rule_index]
+        return rule.result if rule.evaluated else None
+
+    def evaluate_rule(self, rule_index: int) -> Optional[bool]:
+        self.compiled.rule_set[rule_index].evaluate()
+        return self.get_rule_result(rule_index)
+
+class SessionChainingState(ChainingState):
+    """
+    State kept in a ReasoningSession, as used by SessionReasoningService.
+    """
+    def __init__(self, session: ReasoningSession, compiled):
+        self.session = session
+        self.network = compiled.get_rete_network()
+
+    def get_fact(self, variable_id: str):
+        return self.session.facts.get(variable_id)
+
+    def set_fact(self, variable_id: str, value):
+        self.session.facts[variable_id] = value
+        if self.session.agenda is not None:
+            self.session.agenda.update(self.network.get_rule_indexes((variable_id,)))
+
+    def get_rule_result(self, rule_index: int) -> Optional[bool]:
+        return self.session.rule_results.get(rule_index)
+
+    def evaluate_rule(self, rule_index: int) -> Optional[bool]:
+        result = self.session.rule_results.get(rule_index)
+        if result is None:
+            result = self.network.evaluate_join(self.session.facts, self.session.node_results, rule_index)
+            if result is not None:
+                self.session.rule_results[rule_index] = result
+        return result
+
+def create_chaining_state(reasoning_process: ReasoningProcess, compiled) -> ChainingState:
+    if isinstance(reasoning_process, ReasoningSession):
+        return SessionChainingState(reasoning_process, compiled)
+    return ProcessChainingState(compiled)
+
+class ProofPath:
+    def __init__(self, rule_indexes: List[int], variable_ids: List[str]):
+        # Undecided rules of the path and the leaf variables they are missing
+        self.rule_indexes = rule_indexes
+        self.variable_ids = variable_ids
+
+class BackwardChainer:
+    """
+    Goal-directed evaluation of layered rule sets, where predicates of some rules test conclusions of others.
+
+    Only rules reachable from the goal are evaluated. A missing variable concluded by other rules is a subgoal:
+    its rules are proved first and the conclusion of the first one that fires is recorded as a fact. Proved subgoals
+    stay as facts and decided rules keep their results in the state, so a subgoal is expanded once per reasoning process.
+    A variable whose rules all failed, or that no rule concludes, is a leaf fact to ask for. Subgoals already being
+    expanded are not expanded again, so cyclic rules stop.
+    """
+    def __init__(self, rule_set: Iterable[Rule]):
+        self.rule_set = tuple(rule_set)
+        self.rules_by_conclusion_id: Dict[str, List[int]] = {}
+        for rule_index, rule in enumerate(self.rule_set):
+            self.rules_by_conclusion_id.setdefault(rule.conclusion.get_id(), []).append(rule_index)
+        self.rule_variable_ids = [tuple(dict.fromkeys(predicate.left_term.id for predicate in rule.predicates)) for rule in self.rule_set]
+
+    def prove(self, rule_indexes: Iterable[int], state: ChainingState) -> Optional[bool]:
+        """
+        Returns True when one of the goal rules fires, False when all of them failed, None when facts are missing.
+        """
+        rule_indexes = list(rule_indexes)
+        in_progress = self._get_goal_ids(rule_indexes)
+        result = False
+        for rule_index in rule_indexes:
+            rule_result = self._prove_rule(rule_index, state, in_progress)
+            if rule_result:
+                return True
+            if rule_result is None:
+                result = None
+        return result
+
+    def get_proof_path(self, rule_indexes: Iterable[int], state: ChainingState) -> Optional[ProofPath]:
+        """
+        Returns the undecided goal rule needing the fewest leaf facts with the rules of its subgoals, None when no goal rule is open.
+        """
+        rule_indexes = list(rule_indexes)
+        return self._get_cheapest_path(rule_indexes, state, {}, self._get_goal_ids(rule_indexes))
+
+    def _get_goal_ids(self, rule_indexes: List[int]) -> Set[str]:
+        # The goal itself is never expanded as a subgoal of its own rules
+        return {self.rule_set[rule_index].conclusion.get_id() for rule_index in rule_indexes}
+
+    def _prove_rule(self, rule_index: int, state: ChainingState, in_progress: Set[str]) -> Optional[bool]:
+        result = state.evaluate_rule(rule_index)
+        if result is not None:
+            return result
+        for variable_id in self.rule_variable_ids[rule_index]:
+            if state.get_fact(variable_id) is None and self._resolve(variable_id, state, in_progress) is not None:
+                result = state.evaluate_rule(rule_index)
+                if result is not None:
+                    return result
+        return None
+
+    def _resolve(self, variable_id: str, state: ChainingState, in_progress: Set[str]):
+        if variable_id not in self.rules_by_conclusion_id or variable_id in in_progress:
+            return None
+        in_progress.add(variable_id)
+        for rule_index in self.rules_by_conclusion_id[variable_id]:
+            if self._prove_rule(rule_index, state, in_progress):
+                state.set_fact(variable_id, self.rule_set[rule_index].conclusion.get_value())
+                break
+        in_progress.discard(variable_id)
+        return state.get_fact(variable_id)
+
+    def _get_cheapest_path(self, rule_indexes: Iterable[int], state: ChainingState, paths: Dict[str, Optional[ProofPath]], in_progress: Set[str]) -> Optional[ProofPath]:
+        best = None
+        for rule_index in rule_indexes:
+            path = self._get_rule_path(rule_index, state, paths, in_progress)
+            if path is not None and (best is None or len(path.variable_ids) < len(best.variable_ids)):
+                best = path
+        return best
+
+    def _get_rule_path(self, rule_index: int, state: ChainingState, paths: Dict[str, Optional[ProofPath]], in_progress: Set[str]) -> Optional[ProofPath]:
+        if state.get_rule_result(rule_index) is not None:
+            return None
+        rule_indexes = [rule_index]
+        variable_ids = {}
+        for variable_id in self.rule_variable_ids[rule_index]:
+            if state.get_fact(variable_id) is not None:
+                continue
+            if variable_id in in_progress:
+                # Proving the rule would need the subgoal it is part of
+                return None
+            subgoal_path = self._get_subgoal_path(variable_id, state, paths, in_progress)
+            if subgoal_path is None:
+                variable_ids[variable_id] = None
+            else:
+                rule_indexes.extend(subgoal_path.rule_indexes)
+                variable_ids.update(dict.fromkeys(subgoal_path.variable_ids))
+        return ProofPath(rule_indexes, list(variable_ids))
+
+    def _get_subgoal_path(self, variable_id: str, state: ChainingState, paths: Dict[str, Optional[ProofPath]], in_progress: Set[str]) -> Optional[ProofPath]:
+        if variable_id not in self.rules_by_conclusion_id:
+            return None
+        if variable_id not in paths:
+            in_progress.add(variable_id)
+            paths[variable_id] = self._get_cheapest_path(self.rules_by_conclusion_id[variable_id], state, paths, in_progress)
+            in_progress.discard(variable_id)
+        return paths[variable_id]
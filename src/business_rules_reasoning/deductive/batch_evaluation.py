@@ -0,0 +1,70 @@
+from typing import Any, Dict, Iterable, Iterator, List
+from ..base import Variable
+from ..base.reasoning_enums import EvaluationMessage, ReasoningState
+from .compiled_knowledge_base import CompiledKnowledgeBase
+from .reasoning_session import ReasoningSession
+from .session_reasoning_service import SessionReasoningService
+
+class BatchEvaluationResult:
+    def __init__(self, reasoned_items: List[Variable], evaluation_message: EvaluationMessage, missing_variable_ids: List[str], reasoning_error_message: str = None):
+        self.reasoned_items = reasoned_items
+        self.evaluation_message = evaluation_message
+        self.missing_variable_ids = missing_variable_ids
+        self.reasoning_error_message = reasoning_error_message
+
+    def display(self) -> str:
+        reasoned_items_display = ", ".join([item.display() for item in self.reasoned_items])
+        return f"{self.evaluation_message.name}: [{reasoned_items_display}] Missing: [{', '.join(self.missing_variable_ids)}]"
+
+def normalize_fact_value(value: Any) -> Any:
+    """
+    Maps empty table cells (None, NaN) to a missing fact and NumPy scalars to plain Python values.
+    """
+    if value is None:
+        return None
+    if isinstance(value, float) and value != value:
+        return None
+    if hasattr(value, "item") and not isinstance(value, (list, tuple, set, str)):
+        value = value.item()
+        if isinstance(value, float) and value != value:
+            return None
+    return value
+
+def iterate_fact_rows(facts) -> Iterator[Dict[str, Any]]:
+    """
+    Iterates fact rows from a list of dicts, any iterable of dicts or a pandas DataFrame.
+
+    Args:
+        facts: A list or iterator of dictionaries mapping variable IDs to values, or a DataFrame whose headers are variable IDs.
+
+    Returns:
+        Iterator[Dict[str, Any]]: Dictionaries of facts with empty cells removed.
+    """
+    if hasattr(facts, "itertuples") and hasattr(facts, "columns"):
+        columns = [str(column) for column in facts.columns]
+        for values in facts.itertuples(index=False, name=None):
+            yield {column: value for column, value in zip(columns, map(normalize_fact_value, values)) if value is not None}
+        return
+
+    for row in facts:
+        yield {variable_id: value for variable_id, value in ((variable_id, normalize_fact_value(value)) for variable_id, value in row.items()) if value is not None}
+
+def get_missing_variable_ids(compiled: CompiledKnowledgeBase, row: Dict[str, Any], rule_indexes: Iterable[int]) -> List[str]:
+    """
+    Returns ids of variables missing from the row and tested by the given undecided rules, in the order of
+    SessionReasoningService.get_all_missing_variable_ids.
+    """
+    open_variable_ids = {predicate.left_term.id for rule_index in rule_indexes for predicate in compiled.rule_set[rule_index].predicates}
+    return [variable_id for variable_id in compiled.variable_ids if variable_id in open_variable_ids and row.get(variable_id) is None]
+
+def evaluate_fact_row(session: ReasoningSession, row: Dict[str, Any]) -> BatchEvaluationResult:
+    """
+    Runs a full reasoning on a single row of facts reusing the given session.
+    """
+    session = SessionReasoningService.clear_reasoning(session)
+    session.reasoning_error_message = None
+    session.facts = row
+    session.state = ReasoningState.STARTED
+    session = SessionReasoningService.continue_reasoning(session)
+    missing_variable_ids = SessionReasoningService.get_all_missing_variable_ids(session) if session.evaluation_message == EvaluationMessage.MISSING_VALUES else []
+    return BatchEvaluationResult(session.reasoned_items, session.evaluation_message, missing_variable_ids, session.reasoning_error_message)
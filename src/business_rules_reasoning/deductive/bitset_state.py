@@ -0,0 +1,90 @@
+from typing import Dict, Iterator, MutableMapping, Tuple
+
+def count_bits(value: int) -> int:
+    return bin(value).count("1")
+
+class BitsetResults(MutableMapping):
+    """
+    Mapping of node or rule indexes to boolean results packed into two Python integers.
+
+    Bit i of `known` tells whether index i has a result and bit i of `values` holds the result,
+    so a rule fires when its mask is fully set in both, and a snapshot is a few bytes per hundred indexes.
+    """
+    def __init__(self, known: int = 0, values: int = 0):
+        self.known = known
+        self.values = values
+
+    def __getitem__(self, index: int) -> bool:
+        bit = 1 << index
+        if not self.known & bit:
+            raise KeyError(index)
+        return bool(self.values & bit)
+
+    def get(self, index: int, default=None):
+        bit = 1 << index
+        if not self.known & bit:
+            return default
+        return bool(self.values & bit)
+
+    def __setitem__(self, index: int, result: bool):
+        bit = 1 << index
+        self.known |= bit
+        if result:
+            self.values |= bit
+        else:
+            self.values &= ~bit
+
+    def __delitem__(self, index: int):
+        bit = 1 << index
+        if not self.known & bit:
+            raise KeyError(index)
+        self.known &= ~bit
+        self.values &= ~bit
+
+    def __contains__(self, index) -> bool:
+        return isinstance(index, int) and index >= 0 and bool(self.known & (1 << index))
+
+    def __iter__(self) -> Iterator[int]:
+        known = self.known
+        while known:
+            lowest = known & -known
+            yield lowest.bit_length() - 1
+            known ^= lowest
+
+    def __len__(self) -> int:
+        return count_bits(self.known)
+
+    def all_true(self, mask: int) -> bool:
+        return self.known & self.values & mask == mask
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializes the results as the `known` bits followed by the `values` bits.
+        """
+        length = max((self.known.bit_length() + 7) // 8, 1)
+        return length.to_bytes(4, "little") + self.known.to_bytes(length, "little") + self.values.to_bytes(length, "little")
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'BitsetResults':
+        return BitsetResults.read_bytes(data)[0]
+
+    @staticmethod
+    def read_bytes(data: bytes, offset: int = 0) -> Tuple['BitsetResults', int]:
+        """
+        Reads results written by to_bytes at the offset and returns them with the offset of the following data.
+        """
+        length = int.from_bytes(data[offset:offset + 4], "little")
+        start = offset + 4
+        known = int.from_bytes(data[start:start + length], "little")
+        values = int.from_bytes(data[start + length:start + 2 * length], "little")
+        return BitsetResults(known, values), start + 2 * length
+
+    @staticmethod
+    def from_dict(results: Dict[int, bool]) -> 'BitsetResults':
+        bitset = BitsetResults()
+        for index, result in results.items():
+            bitset[index] = result
+        return bitset
+
+    def __repr__(self) -> str:
+        return f"BitsetResults({dict(self.items())})"
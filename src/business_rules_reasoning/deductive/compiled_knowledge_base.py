@@ -0,0 +1,213 @@
+from threading import Lock
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Tuple
+from weakref import WeakKeyDictionary
+from ..base import KnowledgeBase, Rule, Variable
+from .deductive_predicate import DeductivePredicate
+from .rete_network import ReteNetwork
+from .rule_scheduler import RuleScheduler
+from .backward_chaining import BackwardChainer
+
+if TYPE_CHECKING:
+    from .question_planner import QuestionPlanner
+    from .discrimination_tree import DiscriminationTree
+
+class CompiledKnowledgeBase:
+    """
+    Read-only index over a KnowledgeBase built once and reused by the reasoning service.
+
+    It maps every variable id to the predicates and rules that reference it, so
+    setting facts or looking up missing variables only touches the affected
+    predicates instead of walking the whole rule set.
+    """
+    _cache = WeakKeyDictionary()
+    _cache_lock = Lock()
+
+    def __init__(self, knowledge_base: KnowledgeBase):
+        self.knowledge_base = knowledge_base
+        self.rule_set: Tuple[Rule, ...] = tuple(knowledge_base.rule_set)
+        self.predicates_by_variable: Dict[str, List[DeductivePredicate]] = {}
+        self.rules_by_variable: Dict[str, List[int]] = {}
+        self.frequencies: Dict[str, int] = {}
+        self.generic_predicates = []
+        self.validated = False
+        self._rete_network = None
+        self._rule_scheduler = None
+        self._backward_chainer = None
+        self._question_planner = None
+        self._discrimination_trees: Dict[tuple, 'DiscriminationTree'] = {}
+        self._fingerprint = self._get_fingerprint(knowledge_base)
+        # Predicates interned by normalize_knowledge_base are indexed once
+        indexed_predicates = set()
+
+        for rule_index, rule in enumerate(self.rule_set):
+            for predicate in rule.predicates:
+                if not isinstance(predicate, DeductivePredicate):
+                    self.generic_predicates.append(predicate)
+                    continue
+                variable_id = predicate.left_term.id
+                if variable_id not in self.predicates_by_variable:
+                    self.predicates_by_variable[variable_id] = []
+                    self.rules_by_variable[variable_id] = []
+                    self.frequencies[variable_id] = 0
+                if id(predicate) not in indexed_predicates:
+                    indexed_predicates.add(id(predicate))
+                    self.predicates_by_variable[variable_id].append(predicate)
+                rules = self.rules_by_variable[variable_id]
+                if not rules or rules[-1] != rule_index:
+                    rules.append(rule_index)
+                self.frequencies[variable_id] += 1
+
+        # Most frequent variables first, ties keep the order of first appearance
+        self.variable_ids: List[str] = sorted(self.predicates_by_variable.keys(), key=lambda variable_id: self.frequencies[variable_id], reverse=True)
+
+        # Rules by (conclusion id, value), values compare with == like hypothesis testing, unhashable ones are scanned
+        self.rules_by_conclusion: Dict[tuple, List[int]] = {}
+        self.unhashable_conclusion_rules: List[int] = []
+        self.conclusions: List[Variable] = []
+        conclusion_ids = set()
+        for rule_index, rule in enumerate(self.rule_set):
+            conclusion_id = rule.conclusion.get_id()
+            if conclusion_id not in conclusion_ids:
+                conclusion_ids.add(conclusion_id)
+                self.conclusions.append(rule.conclusion.get_variable())
+            try:
+                self.rules_by_conclusion.setdefault((conclusion_id, rule.conclusion.get_value()), []).append(rule_index)
+            except TypeError:
+                self.unhashable_conclusion_rules.append(rule_index)
+
+    @staticmethod
+    def _get_fingerprint(knowledge_base: KnowledgeBase):
+        # Checked on every lookup, so it stays O(1) and never walks the rule set
+        return (id(knowledge_base.rule_set), len(knowledge_base.rule_set))
+
+    def is_stale(self) -> bool:
+        return self._fingerprint != self._get_fingerprint(self.knowledge_base)
+
+    @staticmethod
+    def compile(knowledge_base: KnowledgeBase) -> 'CompiledKnowledgeBase':
+        """
+        Returns the cached index of the knowledge base, rebuilding it when rules were added, removed or the rule set was replaced.
+        Call `invalidate` after replacing a rule or changing its conclusion or predicates in place.
+        """
+        with CompiledKnowledgeBase._cache_lock:
+            compiled = CompiledKnowledgeBase._cache.get(knowledge_base)
+            if compiled is None or compiled.is_stale():
+                compiled = CompiledKnowledgeBase(knowledge_base)
+                CompiledKnowledgeBase._cache[knowledge_base] = compiled
+            return compiled
+
+    @staticmethod
+    def invalidate(knowledge_base: KnowledgeBase):
+        with CompiledKnowledgeBase._cache_lock:
+            CompiledKnowledgeBase._cache.pop(knowledge_base, None)
+
+    def validate(self):
+        if self.validated:
+            return
+        for rule in self.rule_set:
+            rule.validate()
+        self.validated = True
+
+    def get_rete_network(self) -> ReteNetwork:
+        if self._rete_network is None:
+            self._rete_network = ReteNetwork(self.rule_set)
+        return self._rete_network
+
+    def get_rule_scheduler(self) -> RuleScheduler:
+        if self._rule_scheduler is None:
+            self._rule_scheduler = RuleScheduler(self.rule_set, self.rules_by_variable, track_all=bool(self.generic_predicates))
+        return self._rule_scheduler
+
+    def get_backward_chainer(self) -> BackwardChainer:
+        if self._backward_chainer is None:
+            self._backward_chainer = BackwardChainer(self.rule_set)
+        return self._backward_chainer
+
+    def get_question_planner(self) -> 'QuestionPlanner':
+        if self._question_planner is None:
+            # question_planner imports this module, so it is imported on first use
+            from .question_planner import QuestionPlanner
+            self._question_planner = QuestionPlanner(self.knowledge_base)
+        return self._question_planner
+
+    def get_discrimination_tree(self, rule_indexes: Iterable[int] = None, max_nodes: int = None) -> 'DiscriminationTree':
+        """
+        Returns the cached tree of the rules, all rules when `rule_indexes` is None.
+        """
+        key = (None if rule_indexes is None else tuple(rule_indexes), max_nodes)
+        if key not in self._discrimination_trees:
+            # discrimination_tree imports this module, so it is imported on first use
+            from .discrimination_tree import DiscriminationTree
+            self._discrimination_trees[key] = DiscriminationTree(self.knowledge_base, key[0], max_nodes)
+        return self._discrimination_trees[key]
+
+    def set_values(self, variables: dict) -> List[str]:
+        """
+        Sets left terms of the predicates testing the variables, returns ids of variables whose previous value was replaced.
+        """
+        if self._rule_scheduler is not None:
+            self._rule_scheduler.mark_variables(variables.keys())
+        overwritten = []
+        for variable_id, value in variables.items():
+            predicates = self.predicates_by_variable.get(variable_id, ())
+            if predicates and CompiledKnowledgeBase.is_overwritten(predicates[0].left_term.value, value):
+                overwritten.append(variable_id)
+            for predicate in predicates:
+                predicate.left_term.value = value
+        for predicate in self.generic_predicates:
+            predicate.set_variables(variables)
+        return overwritten
+
+    @staticmethod
+    def is_reasoned(reasoned_items: List[Variable], conclusion: Variable) -> bool:
+        """
+        Tells whether a conclusion with the same id and value was already reasoned, values compare with == like hypothesis
+        testing. Rules concluding the same value are reported once, also when chaining asserts the conclusion again.
+        """
+        return any(item.id == conclusion.id and item.value == conclusion.value for item in reasoned_items)
+
+    @staticmethod
+    def is_overwritten(previous, value) -> bool:
+        """
+        Tells whether setting a fact replaces a value that results were computed with. Values of different types differ
+        even when equal, since 1 and True fail different type checks.
+        """
+        return previous is not None and (type(previous) is not type(value) or previous != value)
+
+    def get_frequency(self, variable_id: str) -> int:
+        return self.frequencies.get(variable_id, 0)
+
+    def get_variables(self) -> List[Variable]:
+        return [self.predicates_by_variable[variable_id][0].left_term for variable_id in self.variable_ids]
+
+    def get_conclusion_rule_indexes(self, conclusion_id: str, value) -> List[int]:
+        """
+        Returns indexes of the rules concluding the value, in rule set order.
+        """
+        try:
+            rule_indexes = self.rules_by_conclusion.get((conclusion_id, value), [])
+        except TypeError:
+            return [
+                rule_index for rule_index, rule in enumerate(self.rule_set)
+                if rule.conclusion.get_id() == conclusion_id and rule.conclusion.get_value() == value
+            ]
+        if not self.unhashable_conclusion_rules:
+            return rule_indexes
+        return sorted(rule_indexes + [
+            rule_index for rule_index in self.unhashable_conclusion_rules
+            if self.rule_set[rule_index].conclusion.get_id() == conclusion_id and self.rule_set[rule_index].conclusion.get_value() == value
+        ])
+
+    def get_missing_variables(self, is_rule_open: Callable[[int], bool] = None) -> List[Variable]:
+        """
+        Returns variables without a value in frequency order. With `is_rule_open`, only variables of rules it accepts are returned.
+        """
+        result = []
+        for variable_id in self.variable_ids:
+            predicate = next((predicate for predicate in self.predicates_by_variable[variable_id] if predicate.left_term.is_empty()), None)
+            if predicate is None:
+                continue
+            if is_rule_open is not None and not any(is_rule_open(rule_index) for rule_index in self.rules_by_variable[variable_id]):
+                continue
+            result.append(predicate.right_term)
+        return result
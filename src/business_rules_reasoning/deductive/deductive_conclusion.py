@@ -2,6 +2,8 @@ from ..base.conclusion import Conclusion
 from ..base.variable import Variable
 
 class DeductiveConclusion(Conclusion):
+    __slots__ = ("variable",)
+
     def __init__(self, variable: Variable):
         self.variable = variable
 
@@ -1,44 +1,118 @@
+from operator import is_
 from ..base import Predicate
 from ..base.operators import Between, GreaterOrEqual, GreaterThan, LessOrEqual, LessThan, NotBetween, NotSubset, Subset, Equal, NotEqual, IsIn, NotIn
 from ..base.operator_enums import OperatorType
 from ..base.variable import Variable
 
+# Operators are stateless, a single instance of each is shared by all predicates
+OPERATORS = {
+    OperatorType.BETWEEN: Between(),
+    OperatorType.EQUAL: Equal(),
+    OperatorType.NOT_EQUAL: NotEqual(),
+    OperatorType.GREATER_OR_EQUAL: GreaterOrEqual(),
+    OperatorType.GREATER_THAN: GreaterThan(),
+    OperatorType.LESS_OR_EQUAL: LessOrEqual(),
+    OperatorType.LESS_THAN: LessThan(),
+    OperatorType.NOT_BETWEEN: NotBetween(),
+    OperatorType.NOT_SUBSET: NotSubset(),
+    OperatorType.SUBSET: Subset(),
+    OperatorType.IS_IN: IsIn(),
+    OperatorType.NOT_IN: NotIn()
+}
+
+OPERATOR_SYMBOLS = {
+    OperatorType.BETWEEN: "BETWEEN",
+    OperatorType.EQUAL: "=",
+    OperatorType.NOT_EQUAL: "!=",
+    OperatorType.GREATER_OR_EQUAL: ">=",
+    OperatorType.GREATER_THAN: ">",
+    OperatorType.LESS_OR_EQUAL: "<=",
+    OperatorType.LESS_THAN: "<",
+    OperatorType.NOT_BETWEEN: "NOT BETWEEN",
+    OperatorType.NOT_SUBSET: "NOT SUBSET",
+    OperatorType.SUBSET: "SUBSET",
+    OperatorType.IS_IN: "IN",
+    OperatorType.NOT_IN: "NOT IN"
+}
+
+_NOT_CACHED = object()
+
 class DeductivePredicate(Predicate):
+    __slots__ = (
+        "left_term", "right_term", "_operator", "_operator_instance", "result", "evaluated",
+        "_right_value_source", "_right_value_items", "_right_value", "_right_value_type"
+    )
+
     def __init__(self, left_term: Variable = None, right_term: Variable = None, operator: OperatorType = None):
         self.left_term = left_term
         self.right_term = right_term
         self.operator = operator
         self.result = False
         self.evaluated = False
+        self._right_value_source = _NOT_CACHED
+        self._right_value_items = None
+        self._right_value = None
+        self._right_value_type = None
+
+    @property
+    def operator(self) -> OperatorType:
+        return self._operator
+
+    @operator.setter
+    def operator(self, operator: OperatorType):
+        self._operator = operator
+        self._operator_instance = OPERATORS.get(operator)
 
     def evaluate(self):
         if not self.is_ready():
             raise Exception(f"[Inference Engine]: Evaluation of predicate has failed. Missing value {self.left_term.id}.")
-        # TODO: precise type check
-        if (self.left_term.get_value_type() != self.right_term.get_value_type()) and self.right_term.get_value_type() != 'list':
-            raise Exception(f"[Inference Engine]: Variable {self.right_term.id}: Type mismatch between left term value ({self.left_term.get_value_type()}) and right term value ({self.right_term.get_value_type()}).")
-        
+        left_value = self.left_term.get_value()
+        self._check_types(left_value)
+
         if self.evaluated:
             return
 
+        self.result = self._compare(left_value)
+        self.evaluated = True
+
+    def evaluate_value(self, value) -> bool:
+        """
+        Evaluates the predicate against a provided left term value without changing the predicate state.
+        """
+        if not self.is_valid() or value is None:
+            raise Exception(f"[Inference Engine]: Evaluation of predicate has failed. Missing value {self.left_term.id}.")
+        left_value = Variable.cast_value(value, self.left_term.id, self.left_term.name)
+        self._check_types(left_value)
+        return self._compare(left_value)
+
+    def get_right_value(self):
+        """
+        Returns the right term cast to BaseType/ListType with its type name.
+        The cast is cached until another value is assigned to the right term or items of a list or set right term change.
+        """
+        value = self.right_term.value
+        items = self._right_value_items
+        if self._right_value_source is not value or (items is not None and (len(items) != len(value) or not all(map(is_, items, value)))):
+            right_value = self.right_term.get_value()
+            self._right_value_type = right_value.get_type()
+            self._right_value = right_value
+            self._right_value_source = value
+            # Lists and sets can change in place, their items are compared on the next call
+            self._right_value_items = tuple(value) if isinstance(value, (list, set)) else None
+        return self._right_value, self._right_value_type
+
+    def _check_types(self, left_value):
+        # TODO: precise type check
+        left_type = left_value.get_type()
+        right_type = self.get_right_value()[1]
+        if left_type != right_type and right_type != 'list':
+            raise Exception(f"[Inference Engine]: Variable {self.right_term.id}: Type mismatch between left term value ({left_type}) and right term value ({right_type}).")
+
+    def _compare(self, left_value) -> bool:
         try:
-            operator_class = {
-                OperatorType.BETWEEN: Between,
-                OperatorType.EQUAL: Equal,
-                OperatorType.NOT_EQUAL: NotEqual,
-                OperatorType.GREATER_OR_EQUAL: GreaterOrEqual,
-                OperatorType.GREATER_THAN: GreaterThan,
-                OperatorType.LESS_OR_EQUAL: LessOrEqual,
-                OperatorType.LESS_THAN: LessThan,
-                OperatorType.NOT_BETWEEN: NotBetween,
-                OperatorType.NOT_SUBSET: NotSubset,
-                OperatorType.SUBSET: Subset,
-                OperatorType.IS_IN: IsIn,
-                OperatorType.NOT_IN: NotIn
-            }[self.operator]
-            operator_instance = operator_class()
-            self.result = operator_instance.compare(self.left_term.get_value(), self.right_term.get_value())
-            self.evaluated = True
+            if self._operator_instance is None:
+                raise Exception(f"Unsupported operator {self.operator}")
+            return self._operator_instance.compare(left_value, self._right_value)
         except Exception as ex:
             raise Exception("Unknown operator instance of predicate") from ex
 
@@ -76,20 +150,7 @@ class DeductivePredicate(Predicate):
         self.evaluated = False
 
     def display_operator(self) -> str:
-        return {
-            OperatorType.BETWEEN: "BETWEEN",
-            OperatorType.EQUAL: "=",
-            OperatorType.NOT_EQUAL: "!=",
-            OperatorType.GREATER_OR_EQUAL: ">=",
-            OperatorType.GREATER_THAN: ">",
-            OperatorType.LESS_OR_EQUAL: "<=",
-            OperatorType.LESS_THAN: "<",
-            OperatorType.NOT_BETWEEN: "NOT BETWEEN",
-            OperatorType.NOT_SUBSET: "NOT SUBSET",
-            OperatorType.SUBSET: "SUBSET",
-            OperatorType.IS_IN: "IN",
-            OperatorType.NOT_IN: "NOT IN"
-        }[self.operator]
+        return OPERATOR_SYMBOLS[self.operator]
 
     def display(self) -> str:
         return f"{self.left_term.id} {self.display_operator()} {self.right_term.value}"
@@ -1,9 +1,19 @@
-from typing import List
+from collections import deque
+from typing import List, Optional, Set
 from ..base.reasoning_service import ReasoningService
 from ..base.reasoning_process import ReasoningProcess
 from ..base.reasoning_enums import ReasoningState, EvaluationMessage, ReasoningMethod
 from ..base import Rule, Variable
-from .deductive_predicate import DeductivePredicate
+from ..base.knowledge_base import KnowledgeBase
+from .compiled_knowledge_base import CompiledKnowledgeBase
+from .backward_chaining import create_chaining_state
+from .reasoning_session import ReasoningSession
+from .batch_evaluation import BatchEvaluationResult, iterate_fact_rows, evaluate_fact_row
+from .equality_index import IndexedEvaluator
+from .discrimination_tree import DiscriminationTreeEvaluator
+from .generated_evaluator import GeneratedEvaluator
+from .reasoning_cache import ReasoningCache
+from .hit_policy import get_hit_policy, get_hit_order, is_single_hit, select_hit
 
 class DeductiveReasoningService(ReasoningService):
     @staticmethod
@@ -15,15 +25,8 @@ class DeductiveReasoningService(ReasoningService):
 
     @staticmethod
     def continue_reasoning(reasoning_process: ReasoningProcess) -> ReasoningProcess:
-        reasoning_process.knowledge_base.validate()
-
-        # Sort rules: prioritize rules with fewer predicates and no missing left terms
-        reasoning_process.knowledge_base.rule_set.sort(
-            key=lambda rule: (
-                any(predicate.left_term.is_empty() for predicate in rule.predicates),  # Rules with missing left terms last
-                len(rule.predicates)  # Rules with fewer predicates first
-            )
-        )
+        # Validated once per compiled knowledge base, start_reasoning validates the rule set again
+        CompiledKnowledgeBase.compile(reasoning_process.knowledge_base).validate()
 
         if reasoning_process.reasoning_method == ReasoningMethod.DEDUCTION:
             return DeductiveReasoningService.deduction(reasoning_process)
@@ -34,8 +37,10 @@ class DeductiveReasoningService(ReasoningService):
 
     @staticmethod
     def set_values(reasoning_process: ReasoningProcess, variables) -> ReasoningProcess:
-        for rule in reasoning_process.knowledge_base.rule_set:
-            rule.set_variables(variables)
+        compiled = CompiledKnowledgeBase.compile(reasoning_process.knowledge_base)
+        overwritten = compiled.set_values(variables)
+        if overwritten:
+            DeductiveReasoningService._reopen_rules(reasoning_process, compiled, overwritten)
         return reasoning_process
 
     @staticmethod
@@ -50,12 +55,13 @@ class DeductiveReasoningService(ReasoningService):
     @staticmethod
     def clear_reasoning(reasoning_process: ReasoningProcess) -> ReasoningProcess:
         result = DeductiveReasoningService.reset_reasoning(reasoning_process)
-        variables = DeductiveReasoningService.analyze_variables_frequency(reasoning_process)
-        for rule in reasoning_process.knowledge_base.rule_set:
-            for predicate in rule.predicates:
-                if isinstance(predicate, DeductivePredicate):
-                    predicate.left_term.frequency = next(variable.frequency for variable in variables if variable.id == predicate.left_term.id)
-                    predicate.left_term.value = None
+        compiled = CompiledKnowledgeBase.compile(reasoning_process.knowledge_base)
+        for variable_id, predicates in compiled.predicates_by_variable.items():
+            frequency = compiled.get_frequency(variable_id)
+            for predicate in predicates:
+                predicate.left_term.frequency = frequency
+                predicate.left_term.value = None
+        compiled.get_rule_scheduler().mark_all()
         return result
 
     @staticmethod
@@ -64,36 +70,47 @@ class DeductiveReasoningService(ReasoningService):
 
     @staticmethod
     def get_all_missing_variables(reasoning_process: ReasoningProcess) -> List[Variable]:
-        result = []
-        for rule in reasoning_process.knowledge_base.rule_set:
-            for predicate in rule.predicates:
-                if isinstance(predicate, DeductivePredicate) and predicate.left_term.is_empty() and all(variable.id != predicate.left_term.id for variable in result):
-                    result.append(predicate.right_term)
-        result.sort(key=lambda var: var.frequency, reverse=True)
-        return result
+        """
+        Returns missing variables of rules that are not decided yet and are relevant to the hypothesis in hypothesis testing.
+        With the "conclusion_as_fact" option, hypothesis testing returns only the leaf facts of the cheapest open proof.
+        """
+        if reasoning_process.state == ReasoningState.FINISHED:
+            return []
+        compiled = CompiledKnowledgeBase.compile(reasoning_process.knowledge_base)
+        goal_rules = DeductiveReasoningService._get_goal_rule_indexes(reasoning_process, compiled)
+        if goal_rules is not None and DeductiveReasoningService._is_conclusion_as_fact(reasoning_process):
+            # Backward chaining asks only for the leaf facts of the cheapest proof
+            path = compiled.get_backward_chainer().get_proof_path(sorted(goal_rules), create_chaining_state(reasoning_process, compiled))
+            return [compiled.predicates_by_variable[variable_id][0].right_term for variable_id in path.variable_ids] if path is not None else []
+        return compiled.get_missing_variables(
+            lambda rule_index: not compiled.rule_set[rule_index].evaluated and (goal_rules is None or rule_index in goal_rules)
+        )
 
     @staticmethod
     def analyze_variables_frequency(reasoning_process: ReasoningProcess) -> List[Variable]:
-        result = []
-        for rule in reasoning_process.knowledge_base.rule_set:
-            for predicate in rule.predicates:
-                if isinstance(predicate, DeductivePredicate) and predicate.left_term not in result:
-                    predicate.left_term.frequency = 0
-                    result.append(predicate.left_term)
-                index = next((i for i, item in enumerate(result) if item.id == predicate.left_term.id), -1)
-                if index != -1:
-                    result[index].frequency += 1
+        compiled = CompiledKnowledgeBase.compile(reasoning_process.knowledge_base)
+        result = compiled.get_variables()
+        for variable in result:
+            variable.frequency = compiled.get_frequency(variable.id)
         return result
 
     @staticmethod
     def deduction(reasoning_process: ReasoningProcess) -> ReasoningProcess:
+        compiled = CompiledKnowledgeBase.compile(reasoning_process.knowledge_base)
+        if is_single_hit(reasoning_process.knowledge_base, reasoning_process.options):
+            return DeductiveReasoningService._select_hit(reasoning_process, compiled)
+        fired_rules = []
         try:
-            for rule in reasoning_process.knowledge_base.rule_set:
+            for rule_index in compiled.get_rule_scheduler().get_order():
+                rule = compiled.rule_set[rule_index]
                 if not rule.evaluated:
                     rule.evaluate()
                 if rule.evaluated and rule.result:
-                    if rule.conclusion.get_variable() not in reasoning_process.reasoned_items:
+                    if not CompiledKnowledgeBase.is_reasoned(reasoning_process.reasoned_items, rule.conclusion.get_variable()):
                         reasoning_process.reasoned_items.append(rule.conclusion.get_variable())
+                        fired_rules.append(rule_index)
+            if DeductiveReasoningService._is_conclusion_as_fact(reasoning_process):
+                DeductiveReasoningService._chain_conclusions(reasoning_process, compiled, fired_rules)
         except Exception as e:
             reasoning_process.evaluation_message = EvaluationMessage.ERROR
             reasoning_process.state = ReasoningState.FINISHED
@@ -112,9 +129,14 @@ class DeductiveReasoningService(ReasoningService):
     def hypothesis_testing(reasoning_process: ReasoningProcess) -> ReasoningProcess:
         if not reasoning_process.options or "hypothesis" not in reasoning_process.options or not isinstance(reasoning_process.options["hypothesis"], Variable):
             raise Exception("[Reasoning Engine]: Hypothesis not provided in reasoning process options.")
-        
+        if DeductiveReasoningService._is_conclusion_as_fact(reasoning_process):
+            return DeductiveReasoningService.backward_chaining(reasoning_process)
+
         hypothesis = reasoning_process.options["hypothesis"]
-        rules = [rule for rule in reasoning_process.knowledge_base.rule_set if rule.conclusion.get_id() == hypothesis.id and rule.conclusion.get_value() == hypothesis.value]
+        compiled = CompiledKnowledgeBase.compile(reasoning_process.knowledge_base)
+        if is_single_hit(reasoning_process.knowledge_base, reasoning_process.options):
+            return DeductiveReasoningService._select_hit(reasoning_process, compiled, hypothesis)
+        rules = DeductiveReasoningService._get_rule_order(reasoning_process, compiled.get_conclusion_rule_indexes(hypothesis.id, hypothesis.value))
         try:
             for rule in rules:
                 if not rule.evaluated:
@@ -134,3 +156,176 @@ class DeductiveReasoningService(ReasoningService):
         else:
             reasoning_process.evaluation_message = EvaluationMessage.MISSING_VALUES
         return reasoning_process
+
+    @staticmethod
+    def backward_chaining(reasoning_process: ReasoningProcess) -> ReasoningProcess:
+        """
+        Hypothesis testing for knowledge bases whose conclusions are tested by predicates of other rules, used when the
+        "conclusion_as_fact" option is set. Only rules reachable from the hypothesis are evaluated, see BackwardChainer.
+        """
+        compiled = CompiledKnowledgeBase.compile(reasoning_process.knowledge_base)
+        hypothesis = reasoning_process.options["hypothesis"]
+        try:
+            result = compiled.get_backward_chainer().prove(compiled.get_conclusion_rule_indexes(hypothesis.id, hypothesis.value), create_chaining_state(reasoning_process, compiled))
+        except Exception as e:
+            reasoning_process.evaluation_message = EvaluationMessage.ERROR
+            reasoning_process.state = ReasoningState.FINISHED
+            reasoning_process.reasoning_error_message = str(e)
+            return reasoning_process
+
+        if result:
+            reasoning_process.reasoned_items = [hypothesis]
+        reasoning_process.state = ReasoningState.FINISHED if result is not None else ReasoningState.STOPPED
+        if result is not None:
+            reasoning_process.evaluation_message = EvaluationMessage.PASSED if result else EvaluationMessage.FAILED
+        else:
+            reasoning_process.evaluation_message = EvaluationMessage.MISSING_VALUES
+        return reasoning_process
+
+    @staticmethod
+    def _select_hit(reasoning_process: ReasoningProcess, compiled: CompiledKnowledgeBase, hypothesis: Variable = None) -> ReasoningProcess:
+        """
+        Reasoning with a hit policy other than COLLECT: rules are evaluated only until the policy selects one, see select_hit.
+        In hypothesis testing the hypothesis passes when the selected rule concludes it.
+        """
+        hit_policy = get_hit_policy(reasoning_process.knowledge_base)
+
+        def evaluate_rule(rule_index: int) -> Optional[bool]:
+            rule = compiled.rule_set[rule_index]
+            if not rule.evaluated:
+                rule.evaluate()
+            return rule.result if rule.evaluated else None
+
+        try:
+            rule_order = get_hit_order(reasoning_process.knowledge_base, compiled, hit_policy, compiled.get_rule_scheduler().get_order)
+            rule_index, finished = select_hit(rule_order, hit_policy, evaluate_rule)
+        except Exception as e:
+            reasoning_process.evaluation_message = EvaluationMessage.ERROR
+            reasoning_process.state = ReasoningState.FINISHED
+            reasoning_process.reasoning_error_message = str(e)
+            return reasoning_process
+
+        reasoning_process.reasoned_items = []
+        if rule_index is not None:
+            conclusion = compiled.rule_set[rule_index].conclusion
+            if hypothesis is None:
+                reasoning_process.reasoned_items = [conclusion.get_variable()]
+            elif conclusion.get_id() == hypothesis.id and conclusion.get_value() == hypothesis.value:
+                reasoning_process.reasoned_items = [hypothesis]
+        reasoning_process.state = ReasoningState.FINISHED if finished else ReasoningState.STOPPED
+        if finished:
+            reasoning_process.evaluation_message = EvaluationMessage.PASSED if reasoning_process.reasoned_items else EvaluationMessage.FAILED
+        else:
+            reasoning_process.evaluation_message = EvaluationMessage.MISSING_VALUES
+        return reasoning_process
+
+    @staticmethod
+    def evaluate(knowledge_base: KnowledgeBase, facts: dict, reasoning_method: ReasoningMethod = ReasoningMethod.DEDUCTION, options=None, cache: ReasoningCache = None) -> BatchEvaluationResult:
+        """
+        Evaluates the knowledge base against a single row of facts without modifying the knowledge base, see evaluate_batch.
+        """
+        return DeductiveReasoningService.evaluate_batch(knowledge_base, [facts], reasoning_method, options, cache=cache)[0]
+
+    @staticmethod
+    def evaluate_batch(knowledge_base: KnowledgeBase, facts, reasoning_method: ReasoningMethod = ReasoningMethod.DEDUCTION, options=None, backend: str = "python", cache: ReasoningCache = None) -> List[BatchEvaluationResult]:
+        """
+        Evaluates the knowledge base against every row of facts without modifying the knowledge base.
+
+        Args:
+            knowledge_base (KnowledgeBase): The knowledge base compiled once and shared by all rows.
+            facts: A list or iterator of dictionaries mapping variable IDs to values, or a pandas DataFrame whose headers are variable IDs.
+            reasoning_method (ReasoningMethod): DEDUCTION or HYPOTHESIS_TESTING.
+            options (dict): Reasoning options, e.g. {"hypothesis": Variable} for hypothesis testing.
+            backend (str): "python" evaluates row by row, "numpy" evaluates whole columns with VectorizedEvaluator (requires NumPy),
+                "index" resolves equality predicates by hash lookups with IndexedEvaluator, "tree" walks a DiscriminationTree compiled from the rules,
+                "codegen" runs a Python function generated from the rules with GeneratedEvaluator.
+                Knowledge bases with a hit policy other than COLLECT are always evaluated by the "python" backend.
+            cache (ReasoningCache): Optional cache of results, only rows missing from it are evaluated by the backend.
+
+        Returns:
+            List[BatchEvaluationResult]: Reasoned items, evaluation message and missing variable IDs per row.
+        """
+        if cache is not None:
+            return cache.evaluate_batch(
+                knowledge_base, facts, reasoning_method, options,
+                lambda rows: DeductiveReasoningService.evaluate_batch(knowledge_base, rows, reasoning_method, options, backend)
+            )
+        if backend != "python" and is_single_hit(knowledge_base, options):
+            backend = "python"
+        if backend == "numpy":
+            from .vectorized_evaluator import VectorizedEvaluator
+            return VectorizedEvaluator(knowledge_base).evaluate(facts, reasoning_method, options)
+        elif backend == "index":
+            return IndexedEvaluator(knowledge_base).evaluate(facts, reasoning_method, options)
+        elif backend == "tree":
+            return DiscriminationTreeEvaluator(knowledge_base).evaluate(facts, reasoning_method, options)
+        elif backend == "codegen":
+            return GeneratedEvaluator(knowledge_base).evaluate(facts, reasoning_method, options)
+        elif backend != "python":
+            raise ValueError(f"Unknown batch evaluation backend: {backend}")
+
+        CompiledKnowledgeBase.compile(knowledge_base).validate()
+        session = ReasoningSession(reasoning_method, knowledge_base, options)
+        return [evaluate_fact_row(session, row) for row in iterate_fact_rows(facts)]
+
+    @staticmethod
+    def _reopen_rules(reasoning_process: ReasoningProcess, compiled: CompiledKnowledgeBase, variable_ids: List[str]):
+        """
+        Resets rules testing facts overwritten with another value, so they are evaluated again on the next turn. Reasoned
+        items no fired rule concludes any more are withdrawn, conclusions asserted as facts by the "conclusion_as_fact"
+        option are not retracted.
+        """
+        for rule_index in dict.fromkeys(rule_index for variable_id in variable_ids for rule_index in compiled.rules_by_variable[variable_id]):
+            compiled.rule_set[rule_index].reset_evaluation()
+        reasoning_process.reasoned_items = [
+            item for item in reasoning_process.reasoned_items
+            if any(compiled.rule_set[rule_index].evaluated and compiled.rule_set[rule_index].result for rule_index in compiled.get_conclusion_rule_indexes(item.id, item.value))
+        ]
+
+    @staticmethod
+    def _is_conclusion_as_fact(reasoning_process: ReasoningProcess) -> bool:
+        return bool(reasoning_process.options and reasoning_process.options.get("conclusion_as_fact"))
+
+    @staticmethod
+    def _chain_conclusions(reasoning_process: ReasoningProcess, compiled: CompiledKnowledgeBase, fired_rules: List[int]):
+        """
+        Asserts conclusions of fired rules as facts and evaluates only the rules reading them, until no rule fires.
+        A variable that already has a value is never asserted again, so cyclic rules stop after one pass, and a conclusion
+        already reasoned is not reported again.
+        """
+        agenda = deque(fired_rules)
+        while agenda:
+            conclusion = compiled.rule_set[agenda.popleft()].conclusion
+            variable_id = conclusion.get_id()
+            if not any(predicate.left_term.is_empty() for predicate in compiled.predicates_by_variable.get(variable_id, ())):
+                continue
+            compiled.set_values({variable_id: conclusion.get_value()})
+            for rule_index in compiled.rules_by_variable[variable_id]:
+                rule = compiled.rule_set[rule_index]
+                if rule.evaluated:
+                    continue
+                rule.evaluate()
+                if rule.evaluated and rule.result and not CompiledKnowledgeBase.is_reasoned(reasoning_process.reasoned_items, rule.conclusion.get_variable()):
+                    reasoning_process.reasoned_items.append(rule.conclusion.get_variable())
+                    agenda.append(rule_index)
+
+    @staticmethod
+    def _get_goal_rule_indexes(reasoning_process: ReasoningProcess, compiled: CompiledKnowledgeBase) -> Optional[Set[int]]:
+        """
+        Returns indexes of the rules concluding the hypothesis in hypothesis testing, None when every rule is relevant.
+        A hit policy other than COLLECT needs every rule to select the conclusion, also in hypothesis testing.
+        """
+        if reasoning_process.reasoning_method != ReasoningMethod.HYPOTHESIS_TESTING or not reasoning_process.options or not isinstance(reasoning_process.options.get("hypothesis"), Variable):
+            return None
+        if is_single_hit(reasoning_process.knowledge_base, reasoning_process.options):
+            return None
+        hypothesis = reasoning_process.options["hypothesis"]
+        return set(compiled.get_conclusion_rule_indexes(hypothesis.id, hypothesis.value))
+
+    @staticmethod
+    def _get_rule_order(reasoning_process: ReasoningProcess, rule_indexes: List[int] = None) -> List[Rule]:
+        """
+        Rules without missing left terms first, then rules with fewer predicates. The knowledge base rule set is not reordered.
+        """
+        compiled = CompiledKnowledgeBase.compile(reasoning_process.knowledge_base)
+        return [compiled.rule_set[rule_index] for rule_index in compiled.get_rule_scheduler().get_order(rule_indexes)]
@@ -0,0 +1,322 @@
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from ..base import KnowledgeBase, Variable, OperatorType
+from ..base.reasoning_enums import EvaluationMessage, ReasoningMethod
+from .compiled_knowledge_base import CompiledKnowledgeBase
+from .reasoning_session import ReasoningSession
+from .batch_evaluation import BatchEvaluationResult, iterate_fact_rows, evaluate_fact_row
+
+TRUE = 1
+FALSE = 0
+MISSING = -1
+
+class DecisionLeaf:
+    def __init__(self, fired_rule_indexes: Tuple[int, ...], open_variable_ids: FrozenSet[str]):
+        self.fired_rule_indexes = fired_rule_indexes
+        # Variables tested by the rules left undecided, the missing ones are still needed
+        self.open_variable_ids = open_variable_ids
+        self.finished = not open_variable_ids
+
+class DecisionNode:
+    def __init__(self, alpha_index: int, variable_id: str):
+        self.alpha_index = alpha_index
+        self.variable_id = variable_id
+        self.children: Dict[int, object] = {}
+
+    def get_children(self) -> List[object]:
+        return list(self.children.values())
+
+class SwitchNode:
+    """
+    Tests all EQUAL predicates of a variable with right terms of one type at once. Children are keyed by the normalized
+    value, `default` is taken when none of the predicates is true and `missing` when the variable has no value.
+    """
+    def __init__(self, variable_id: str, right_type: str):
+        self.variable_id = variable_id
+        self.right_type = right_type
+        self.children: Dict[object, object] = {}
+        self.default = None
+        self.missing = None
+
+    def get_children(self) -> List[object]:
+        return [child for child in [*self.children.values(), self.default, self.missing] if child is not None]
+
+class DiscriminationTree:
+    """
+    Decision diagram over the distinct predicates (alpha nodes) of a rule set.
+
+    Every node tests one predicate and branches on its outcome: true, false or missing value. EQUAL predicates of one
+    variable are tested together by a switch node with a single hash lookup. Leaves hold the rules fired on the path and
+    the variables of rules left undecided. Rules keep their predicate order, so a rule is dead at its first false
+    predicate exactly as in Rule.evaluate, and equal paths are shared, so the walk costs the depth of the diagram
+    instead of the rule count. Children of a switch are built only from the rules alive in their branch, so equality
+    tables build in time proportional to their size. Predicates raising an evaluation error have no branch.
+    """
+    def __init__(self, knowledge_base: KnowledgeBase, rule_indexes: Iterable[int] = None, max_nodes: int = None):
+        self.compiled = CompiledKnowledgeBase.compile(knowledge_base)
+        self.compiled.validate()
+        if self.compiled.generic_predicates:
+            raise Exception("[Reasoning Engine]: Discrimination trees support only deductive predicates.")
+        self.network = self.compiled.get_rete_network()
+        self.rule_indexes = list(range(len(self.compiled.rule_set))) if rule_indexes is None else list(rule_indexes)
+        # Equality tables take a few nodes per rule, so the default limit grows with the rule count
+        self.max_nodes = max_nodes if max_nodes is not None else 100000 + 10 * len(self.rule_indexes)
+        self.node_count = 0
+        # EQUAL tests by (right term type, normalized value), a known value of the variable decides all of them
+        self.equality_keys: Dict[int, tuple] = {}
+        for alpha_node in self.network.alpha_nodes:
+            if alpha_node.predicate.operator == OperatorType.EQUAL and not isinstance(alpha_node.predicate.right_term.value, (list, tuple, set)):
+                try:
+                    right_value, right_type = alpha_node.predicate.get_right_value()
+                except Exception:
+                    continue
+                if right_value.get_normalized_value() is not None:
+                    self.equality_keys[alpha_node.index] = (right_type, right_value.get_normalized_value())
+        self.root = self._build()
+
+    def _build(self):
+        memo = {}
+        root, pending_state = self._resolve((tuple((rule_index, 0, False) for rule_index in self.rule_indexes), (), frozenset(), {}, {}, {}), memo)
+        stack = [(root, pending_state)] if pending_state is not None else []
+        while stack:
+            node, state = stack.pop()
+            for attach, child_state in self._get_child_states(node, state):
+                child, child_pending_state = self._resolve(child_state, memo)
+                attach(child)
+                if child_pending_state is not None:
+                    stack.append((child, child_pending_state))
+        return root
+
+    def _get_child_states(self, node, state) -> List[tuple]:
+        """
+        Returns pairs of a function attaching a child to the node and the state the child is resolved from.
+        """
+        rules, fired, undecided, outcomes, presence, equalities = state
+        variable_id = node.variable_id
+        if isinstance(node, DecisionNode):
+            # A variable already tested on the path cannot be missing
+            branches = [TRUE, FALSE] if presence.get(variable_id) else [TRUE, FALSE, MISSING]
+            child_states = []
+            for outcome in branches:
+                if outcome == MISSING:
+                    child_state = (rules, fired, undecided, outcomes, {**presence, variable_id: False}, equalities)
+                else:
+                    child_state = (rules, fired, undecided, {**outcomes, node.alpha_index: outcome}, {**presence, variable_id: True}, equalities)
+                child_states.append((lambda child, outcome=outcome: node.children.__setitem__(outcome, child), child_state))
+            return child_states
+
+        equality = equalities.get(variable_id)
+        if equality is not None and equality[0] != node.right_type:
+            # The value has another type, so the switch raises and walks reaching it fall back to the scalar engine
+            return []
+        # Rules waiting on one of the tested values are alive only in its branch, the other rules in every branch
+        waiting: Dict[object, List[tuple]] = {}
+        others = []
+        for rule in rules:
+            alpha_index = self.network.join_nodes[rule[0]].alpha_indexes[rule[1]]
+            equality_key = self.equality_keys.get(alpha_index)
+            if equality_key is not None and equality_key[0] == node.right_type and self.network.alpha_nodes[alpha_index].variable_id == variable_id:
+                waiting.setdefault(equality_key[1], []).append(rule)
+            else:
+                others.append(rule)
+        child_presence = {**presence, variable_id: True}
+        child_states = []
+        for value, waiting_rules in waiting.items():
+            child_rules = tuple(sorted(others + waiting_rules)) if others else tuple(waiting_rules)
+            child_equalities = {**equalities, variable_id: (node.right_type, value, None)}
+            child_states.append((lambda child, value=value: node.children.__setitem__(value, child), (child_rules, fired, undecided, outcomes, child_presence, child_equalities)))
+        false_values = frozenset(waiting) | (equality[2] if equality is not None else frozenset())
+        child_equalities = {**equalities, variable_id: (node.right_type, None, false_values)}
+        child_states.append((lambda child: setattr(node, "default", child), (tuple(others), fired, undecided, outcomes, child_presence, child_equalities)))
+        if not presence.get(variable_id):
+            child_states.append((lambda child: setattr(node, "missing", child), (rules, fired, undecided, outcomes, {**presence, variable_id: False}, equalities)))
+        return child_states
+
+    def _resolve(self, state, memo) -> Tuple[object, Optional[tuple]]:
+        """
+        Advances every rule through predicates with known outcomes and returns the shared leaf or node of the resulting state.
+        A new node is returned with its state, so its children can be built.
+        """
+        rules, fired, undecided, outcomes, presence, equalities = state
+        alive = []
+        fired = list(fired)
+        for rule_index, position, missing in rules:
+            alpha_indexes = self.network.join_nodes[rule_index].alpha_indexes
+            dead = False
+            while position < len(alpha_indexes):
+                alpha_index = alpha_indexes[position]
+                if presence.get(self.network.alpha_nodes[alpha_index].variable_id) is False:
+                    missing = True
+                else:
+                    outcome = outcomes[alpha_index] if alpha_index in outcomes else self._get_equality_outcome(alpha_index, equalities)
+                    if outcome is None:
+                        break
+                    if outcome == FALSE:
+                        dead = True
+                        break
+                position += 1
+            if dead:
+                continue
+            if position == len(alpha_indexes):
+                if missing:
+                    undecided = undecided.union(self.network.join_nodes[rule_index].variable_ids)
+                else:
+                    fired.append(rule_index)
+                continue
+            alive.append((rule_index, position, missing))
+
+        fired = tuple(sorted(fired))
+        if not alive:
+            key = ("leaf", fired, undecided)
+            if key not in memo:
+                memo[key] = DecisionLeaf(fired, undecided)
+            return memo[key], None
+
+        # Only outcomes of predicates still ahead of alive rules can change the rest of the walk
+        ahead = set()
+        for rule_index, position, _ in alive:
+            ahead.update(self.network.join_nodes[rule_index].alpha_indexes[position:])
+        ahead_variables = {self.network.alpha_nodes[alpha_index].variable_id for alpha_index in ahead}
+        alive = tuple(alive)
+        key = (
+            alive, fired, undecided,
+            tuple(sorted((alpha_index, outcome) for alpha_index, outcome in outcomes.items() if alpha_index in ahead)),
+            tuple(sorted((variable_id, present) for variable_id, present in presence.items() if variable_id in ahead_variables)),
+            tuple(sorted((variable_id, equality) for variable_id, equality in equalities.items() if variable_id in ahead_variables))
+        )
+        if key in memo:
+            return memo[key], None
+
+        self.node_count += 1
+        if self.node_count > self.max_nodes:
+            raise Exception(f"[Reasoning Engine]: Discrimination tree exceeds {self.max_nodes} nodes.")
+        # Tests the predicate, or the EQUAL predicates of one variable and type, next for the most alive rules
+        counts = {}
+        for rule_index, position, _ in alive:
+            alpha_index = self.network.join_nodes[rule_index].alpha_indexes[position]
+            equality_key = self.equality_keys.get(alpha_index)
+            test = (self.network.alpha_nodes[alpha_index].variable_id, equality_key[0]) if equality_key is not None else alpha_index
+            count, first_alpha_index = counts.get(test, (0, alpha_index))
+            counts[test] = (count + 1, min(first_alpha_index, alpha_index))
+        test = min(counts, key=lambda test: (-counts[test][0], counts[test][1]))
+        if isinstance(test, tuple):
+            node = SwitchNode(*test)
+        else:
+            node = DecisionNode(test, self.network.alpha_nodes[test].variable_id)
+        memo[key] = node
+        return node, (alive, fired, undecided, outcomes, presence, equalities)
+
+    def _get_equality_outcome(self, alpha_index: int, equalities: Dict[str, tuple]) -> Optional[int]:
+        """
+        Returns the outcome of an EQUAL predicate decided by a switch node on the path, or None when it is not known.
+        """
+        equality_key = self.equality_keys.get(alpha_index)
+        if equality_key is None:
+            return None
+        equality = equalities.get(self.network.alpha_nodes[alpha_index].variable_id)
+        if equality is None or equality[0] != equality_key[0]:
+            return None
+        _, value, false_values = equality
+        if value is not None:
+            return TRUE if value == equality_key[1] else FALSE
+        return FALSE if equality_key[1] in false_values else None
+
+    def get_depth(self) -> int:
+        """
+        Returns the largest number of tests made by a single walk.
+        """
+        depths = {}
+        stack = [(self.root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if isinstance(node, DecisionLeaf) or id(node) in depths:
+                continue
+            if expanded:
+                depths[id(node)] = 1 + max((depths.get(id(child), 0) for child in node.get_children()), default=0)
+                continue
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.get_children())
+        return depths.get(id(self.root), 0)
+
+    def walk(self, facts: dict) -> Optional[DecisionLeaf]:
+        """
+        Returns the leaf reached with the facts, or None when a predicate on the path raises an evaluation error.
+        """
+        node = self.root
+        while not isinstance(node, DecisionLeaf):
+            value = facts.get(node.variable_id)
+            if isinstance(node, SwitchNode):
+                if value is None:
+                    node = node.missing
+                    continue
+                try:
+                    left_value = Variable.cast_value(value)
+                    left_type = left_value.get_type()
+                except Exception:
+                    return None
+                # EQUAL raises on a type mismatch
+                if left_type != node.right_type:
+                    return None
+                node = node.children.get(left_value.get_normalized_value(), node.default)
+                continue
+            if value is None:
+                node = node.children[MISSING]
+                continue
+            try:
+                result = self.network.alpha_nodes[node.alpha_index].predicate.evaluate_value(value)
+            except Exception:
+                return None
+            node = node.children[TRUE if result else FALSE]
+        return node
+
+class DiscriminationTreeEvaluator:
+    """
+    Batch backend walking a DiscriminationTree per row with the same results as DeductiveReasoningService.evaluate_batch.
+    Rows reaching a predicate that raises an evaluation error are evaluated by the scalar engine to report the same error.
+    Trees are cached by the compiled knowledge base, so evaluators of the same knowledge base share them.
+    """
+    def __init__(self, knowledge_base: KnowledgeBase, max_nodes: int = None):
+        self.knowledge_base = knowledge_base
+        self.max_nodes = max_nodes
+        self.compiled = CompiledKnowledgeBase.compile(knowledge_base)
+        self.tree = self.compiled.get_discrimination_tree(max_nodes=max_nodes)
+        # Rules that fire have all facts provided, so continue_reasoning orders them by predicate count only
+        self.firing_ranks = {
+            rule_index: rank for rank, rule_index in
+            enumerate(sorted(range(len(self.compiled.rule_set)), key=lambda rule_index: len(self.compiled.rule_set[rule_index].predicates)))
+        }
+
+    def evaluate(self, facts, reasoning_method: ReasoningMethod = ReasoningMethod.DEDUCTION, options=None) -> List[BatchEvaluationResult]:
+        hypothesis = None
+        tree = self.tree
+        if reasoning_method == ReasoningMethod.HYPOTHESIS_TESTING:
+            if not options or "hypothesis" not in options or not isinstance(options["hypothesis"], Variable):
+                raise Exception("[Reasoning Engine]: Hypothesis not provided in reasoning process options.")
+            hypothesis = options["hypothesis"]
+            tree = self.compiled.get_discrimination_tree(self.compiled.get_conclusion_rule_indexes(hypothesis.id, hypothesis.value), self.max_nodes)
+        elif reasoning_method != ReasoningMethod.DEDUCTION:
+            raise Exception(f"[Reasoning Engine]: Reasoning method {reasoning_method.name} is not supported by discrimination trees.")
+
+        session = ReasoningSession(reasoning_method, self.knowledge_base, options)
+        return [self._evaluate_row(tree, row, session, hypothesis) for row in iterate_fact_rows(facts)]
+
+    def _evaluate_row(self, tree: DiscriminationTree, row: dict, session: ReasoningSession, hypothesis: Variable) -> BatchEvaluationResult:
+        leaf = tree.walk(row)
+        if leaf is None:
+            return evaluate_fact_row(session, row)
+
+        reasoned_items = []
+        if hypothesis is not None:
+            reasoned_items = [hypothesis] if leaf.fired_rule_indexes else []
+            finished = leaf.finished or bool(leaf.fired_rule_indexes)
+        else:
+            for rule_index in sorted(leaf.fired_rule_indexes, key=self.firing_ranks.__getitem__):
+                conclusion = self.compiled.rule_set[rule_index].conclusion.get_variable()
+                if not CompiledKnowledgeBase.is_reasoned(reasoned_items, conclusion):
+                    reasoned_items.append(conclusion)
+            finished = leaf.finished
+
+        if finished:
+            return BatchEvaluationResult(reasoned_items, EvaluationMessage.PASSED if reasoned_items else EvaluationMessage.FAILED, [])
+        # Only variables of undecided rules, in hypothesis testing the tree holds only the rules concluding the hypothesis
+        missing_variable_ids = [variable_id for variable_id in self.compiled.variable_ids if variable_id in leaf.open_variable_ids and row.get(variable_id) is None]
+        return BatchEvaluationResult(reasoned_items, EvaluationMessage.MISSING_VALUES, missing_variable_ids)
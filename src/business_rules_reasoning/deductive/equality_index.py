@@ -0,0 +1,170 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from ..base import KnowledgeBase, Variable, OperatorType
+from ..base.reasoning_enums import EvaluationMessage, ReasoningMethod
+from .compiled_knowledge_base import CompiledKnowledgeBase
+from .deductive_predicate import DeductivePredicate, OPERATORS
+from .reasoning_session import ReasoningSession
+from .batch_evaluation import BatchEvaluationResult, iterate_fact_rows, evaluate_fact_row, get_missing_variable_ids
+
+VALUE_KINDS = frozenset(["number", "boolean", "string", "list"])
+
+class EqualityIndex:
+    """
+    Hash-dispatch index over the equality predicates of a rule set.
+
+    Rules are grouped by the variables they test with EQUAL, and every group maps the tuple of normalized
+    expected values to its rules. For a row of facts each group is resolved by one dictionary lookup, so only
+    the matching rules have their remaining predicates checked. All other rules of the group have a false equality.
+    """
+    def __init__(self, rule_set: Tuple, rule_indexes: Iterable[int] = None):
+        self.rule_set = rule_set
+        rule_indexes = list(range(len(rule_set))) if rule_indexes is None else list(rule_indexes)
+        self.groups: Dict[Tuple[str, ...], Dict[tuple, List[int]]] = {}
+        self.remaining_predicates: Dict[int, List[DeductivePredicate]] = {}
+
+        for rule_index in rule_indexes:
+            expected_values = {}
+            remaining = []
+            for predicate in rule_set[rule_index].predicates:
+                normalized_value = EqualityIndex._get_expected_value(predicate)
+                if normalized_value is None or predicate.left_term.id in expected_values:
+                    remaining.append(predicate)
+                else:
+                    expected_values[predicate.left_term.id] = normalized_value
+            signature = tuple(sorted(expected_values))
+            key = tuple(expected_values[variable_id] for variable_id in signature)
+            self.groups.setdefault(signature, {}).setdefault(key, []).append(rule_index)
+            self.remaining_predicates[rule_index] = remaining
+
+    @staticmethod
+    def _get_expected_value(predicate: DeductivePredicate):
+        if predicate.operator != OperatorType.EQUAL or isinstance(predicate.right_term.value, (list, tuple, set)):
+            return None
+        try:
+            right_value = predicate.get_right_value()[0]
+        except Exception:
+            return None
+        return right_value.get_normalized_value()
+
+    def match(self, facts: dict) -> Tuple[List[int], List[int]]:
+        """
+        Returns indexes of the rules satisfied by the facts and of the indexed rules that could not be decided.
+        Facts must not make any predicate raise, see IndexedEvaluator.is_safe.
+        """
+        fired = []
+        undecided = []
+        for signature, buckets in self.groups.items():
+            if all(variable_id in facts for variable_id in signature):
+                key = tuple(Variable.cast_value(facts[variable_id]).get_normalized_value() for variable_id in signature)
+                # Rules of the other buckets have a false equality
+                candidates = [(rule_index, self.remaining_predicates[rule_index]) for rule_index in buckets.get(key, ())]
+            else:
+                candidates = [(rule_index, self.rule_set[rule_index].predicates) for rules in buckets.values() for rule_index in rules]
+            for rule_index, predicates in candidates:
+                result = EqualityIndex._check(predicates, facts)
+                if result is None:
+                    undecided.append(rule_index)
+                elif result:
+                    fired.append(rule_index)
+        return fired, undecided
+
+    @staticmethod
+    def _check(predicates: List[DeductivePredicate], facts: dict) -> Optional[bool]:
+        all_present = True
+        for predicate in predicates:
+            value = facts.get(predicate.left_term.id)
+            if value is None:
+                all_present = False
+            elif not predicate.evaluate_value(value):
+                return False
+        return True if all_present else None
+
+class IndexedEvaluator:
+    """
+    Batch backend for equality-heavy decision tables with the same results as DeductiveReasoningService.evaluate_batch.
+    Rows with values that could make any predicate raise an evaluation error are evaluated by the scalar engine.
+    """
+    def __init__(self, knowledge_base: KnowledgeBase):
+        self.knowledge_base = knowledge_base
+        self.compiled = CompiledKnowledgeBase.compile(knowledge_base)
+        self.compiled.validate()
+        if self.compiled.generic_predicates:
+            raise Exception("[Reasoning Engine]: Indexed evaluation supports only deductive predicates.")
+        self.index = EqualityIndex(self.compiled.rule_set)
+        # Rules that fire have all facts provided, so continue_reasoning orders them by predicate count only
+        self.firing_ranks = {
+            rule_index: rank for rank, rule_index in
+            enumerate(sorted(range(len(self.compiled.rule_set)), key=lambda rule_index: len(self.compiled.rule_set[rule_index].predicates)))
+        }
+        self.raising_kinds: Dict[str, Set[str]] = {}
+        for variable_id, predicates in self.compiled.predicates_by_variable.items():
+            self.raising_kinds[variable_id] = set().union(*(IndexedEvaluator._get_raising_kinds(predicate) for predicate in predicates))
+
+    @staticmethod
+    def _get_raising_kinds(predicate: DeductivePredicate) -> Set[str]:
+        """
+        Returns kinds of left term values for which evaluation of the predicate raises.
+        """
+        if predicate.operator not in OPERATORS:
+            return set(VALUE_KINDS)
+        try:
+            right_value, right_type = predicate.get_right_value()
+        except Exception:
+            return set(VALUE_KINDS)
+        ranged = predicate.operator in (OperatorType.BETWEEN, OperatorType.NOT_BETWEEN)
+        if right_type == "list":
+            if ranged:
+                return set(VALUE_KINDS) if len(right_value.values) != 2 else {"list"}
+            return set()
+        return set(VALUE_KINDS) if ranged else set(VALUE_KINDS - {right_type})
+
+    def is_safe(self, facts: dict) -> bool:
+        for variable_id, value in facts.items():
+            raising_kinds = self.raising_kinds.get(variable_id)
+            if raising_kinds is None:
+                continue
+            try:
+                kind = Variable.cast_value(value).get_type()
+            except Exception:
+                return False
+            if kind in raising_kinds:
+                return False
+        return True
+
+    def evaluate(self, facts, reasoning_method: ReasoningMethod = ReasoningMethod.DEDUCTION, options=None) -> List[BatchEvaluationResult]:
+        hypothesis = None
+        index = self.index
+        if reasoning_method == ReasoningMethod.HYPOTHESIS_TESTING:
+            if not options or "hypothesis" not in options or not isinstance(options["hypothesis"], Variable):
+                raise Exception("[Reasoning Engine]: Hypothesis not provided in reasoning process options.")
+            hypothesis = options["hypothesis"]
+            index = EqualityIndex(self.compiled.rule_set, [
+                rule_index for rule_index, rule in enumerate(self.compiled.rule_set)
+                if rule.conclusion.get_id() == hypothesis.id and rule.conclusion.get_value() == hypothesis.value
+            ])
+        elif reasoning_method != ReasoningMethod.DEDUCTION:
+            raise Exception(f"[Reasoning Engine]: Reasoning method {reasoning_method.name} is not supported by indexed evaluation.")
+
+        session = ReasoningSession(reasoning_method, self.knowledge_base, options)
+        return [self._evaluate_row(index, row, session, hypothesis) for row in iterate_fact_rows(facts)]
+
+    def _evaluate_row(self, index: EqualityIndex, row: dict, session: ReasoningSession, hypothesis: Variable) -> BatchEvaluationResult:
+        if not self.is_safe(row):
+            return evaluate_fact_row(session, row)
+
+        fired, undecided = index.match(row)
+        reasoned_items = []
+        if hypothesis is not None:
+            reasoned_items = [hypothesis] if fired else []
+            finished = not undecided or bool(fired)
+        else:
+            for rule_index in sorted(fired, key=self.firing_ranks.__getitem__):
+                conclusion = self.compiled.rule_set[rule_index].conclusion.get_variable()
+                if not CompiledKnowledgeBase.is_reasoned(reasoned_items, conclusion):
+                    reasoned_items.append(conclusion)
+            finished = not undecided
+
+        if finished:
+            return BatchEvaluationResult(reasoned_items, EvaluationMessage.PASSED if reasoned_items else EvaluationMessage.FAILED, [])
+        # Only variables of undecided rules, in hypothesis testing the index holds only the rules concluding the hypothesis
+        return BatchEvaluationResult(reasoned_items, EvaluationMessage.MISSING_VALUES, get_missing_variable_ids(self.compiled, row, undecided))
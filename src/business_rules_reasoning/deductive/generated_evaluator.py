@@ -0,0 +1,274 @@
+import marshal
+import math
+import os
+import sys
+import tempfile
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from weakref import WeakKeyDictionary
+from ..base import KnowledgeBase, Variable, OperatorType
+from ..base.reasoning_enums import EvaluationMessage, ReasoningMethod
+from .compiled_knowledge_base import CompiledKnowledgeBase
+from .deductive_predicate import DeductivePredicate, OPERATORS
+from .reasoning_session import ReasoningSession
+from .batch_evaluation import BatchEvaluationResult, iterate_fact_rows, evaluate_fact_row, get_missing_variable_ids
+from .reasoning_cache import get_knowledge_base_hash
+
+# Part of the cache file name, bump it whenever the generated code changes
+GENERATOR_VERSION = 1
+
+FUNCTION_NAME = "evaluate_facts"
+
+# Python classes of fact values per type name, subclasses are never inlined
+_CLASSES_BY_TYPE = {
+    "boolean": ("bool",),
+    "number": ("int", "float"),
+    "string": ("str",),
+}
+_ALL_TYPES = frozenset(_CLASSES_BY_TYPE)
+
+# Generated code of evaluators built in this process, rebuilt with the compiled knowledge base
+_CODE_BY_KNOWLEDGE_BASE = WeakKeyDictionary()
+
+def _literal(value) -> str:
+    if isinstance(value, float) and not math.isfinite(value):
+        return f"float('{value}')"
+    if isinstance(value, frozenset):
+        return "frozenset((" + "".join(f"{_literal(item)}, " for item in sorted(value, key=repr)) + "))"
+    return repr(value)
+
+def _compile_predicate(predicate: DeductivePredicate, name: str) -> Tuple[Set[str], str]:
+    """
+    Returns the type names of fact values the predicate evaluates without raising and the inlined test of the
+    normalized value `name`, which is float(value) for numbers and booleans and value.lower() for strings.
+    """
+    if predicate.operator not in OPERATORS:
+        return set(), "False"
+    try:
+        right_value, right_type = predicate.get_right_value()
+    except Exception:
+        return set(), "False"
+    operator = predicate.operator
+
+    if right_type == "list":
+        if operator in (OperatorType.BETWEEN, OperatorType.NOT_BETWEEN):
+            if len(right_value.values) != 2:
+                return set(), "False"
+            low, high = right_value.values
+            if not low.is_number() or not high.is_number():
+                between = "False"
+            else:
+                try:
+                    between = f"({name}.__class__ is float and not {_literal(float(low.value))} > {name} and not {name} > {_literal(float(high.value))})"
+                except OverflowError:
+                    return set(), "False"
+            return set(_ALL_TYPES), between if operator == OperatorType.BETWEEN else f"not {between}"
+        if operator in (OperatorType.IS_IN, OperatorType.SUBSET, OperatorType.NOT_IN, OperatorType.NOT_SUBSET):
+            members = _literal(frozenset(right_value.normalized_values))
+            return set(_ALL_TYPES), f"{name} in {members}" if operator in (OperatorType.IS_IN, OperatorType.SUBSET) else f"{name} not in {members}"
+        # A list never equals a single value and is not ordered
+        return set(_ALL_TYPES), "True" if operator == OperatorType.NOT_EQUAL else "False"
+
+    if right_type not in _CLASSES_BY_TYPE or operator in (OperatorType.BETWEEN, OperatorType.NOT_BETWEEN):
+        return set(), "False"
+    if right_type == "string":
+        constant = _literal(right_value.value.lower())
+        if operator in (OperatorType.IS_IN, OperatorType.NOT_IN):
+            # BaseType containment of strings is a case-insensitive substring test
+            return {right_type}, f"{name} in {constant}" if operator == OperatorType.IS_IN else f"{name} not in {constant}"
+        if operator in (OperatorType.EQUAL, OperatorType.SUBSET):
+            return {right_type}, f"{name} == {constant}"
+        if operator in (OperatorType.NOT_EQUAL, OperatorType.NOT_SUBSET):
+            return {right_type}, f"{name} != {constant}"
+        return {right_type}, "False"
+
+    try:
+        constant = _literal(float(right_value.value))
+    except OverflowError:
+        return set(), "False"
+    return {right_type}, {
+        OperatorType.EQUAL: f"{name} == {constant}",
+        OperatorType.SUBSET: f"{name} == {constant}",
+        OperatorType.IS_IN: f"{name} == {constant}",
+        OperatorType.NOT_EQUAL: f"{name} != {constant}",
+        OperatorType.NOT_SUBSET: f"{name} != {constant}",
+        OperatorType.NOT_IN: f"{name} != {constant}",
+        OperatorType.GREATER_THAN: f"{name} > {constant}",
+        OperatorType.LESS_THAN: f"{name} < {constant}",
+        OperatorType.GREATER_OR_EQUAL: f"not {name} < {constant}",
+        OperatorType.LESS_OR_EQUAL: f"not {name} > {constant}",
+    }[operator]
+
+def generate_source(knowledge_base: KnowledgeBase) -> str:
+    """
+    Generates the source of a Python function specialized to the rule set of the knowledge base.
+
+    The function takes a dictionary of normalized facts (see iterate_fact_rows) and returns a tuple of the indexes of
+    fired rules and the indexes of rules that cannot be decided with the facts. Every predicate is inlined as a single
+    comparison against a constant normalized when the code is generated, and rules are evaluated in predicate order,
+    so a rule is dead at its first false predicate exactly as in ReteNetwork.evaluate_join. The function returns None
+    for rows with a value that could make any predicate raise an evaluation error, they are left to the scalar engine.
+    """
+    compiled = CompiledKnowledgeBase.compile(knowledge_base)
+    compiled.validate()
+    if compiled.generic_predicates:
+        raise Exception("[Reasoning Engine]: Code generation supports only deductive predicates.")
+
+    names: Dict[str, str] = {}
+    tests: Dict[int, str] = {}
+    allowed_types: Dict[str, Set[str]] = {}
+    for rule in compiled.rule_set:
+        for predicate in rule.predicates:
+            variable_id = predicate.left_term.id
+            name = names.setdefault(variable_id, f"v{len(names)}")
+            types, tests[id(predicate)] = _compile_predicate(predicate, name)
+            allowed_types[variable_id] = allowed_types.get(variable_id, set(_ALL_TYPES)) & types
+
+    lines = [f"def {FUNCTION_NAME}(facts):", "    get = facts.get"]
+    for variable_id, name in names.items():
+        lines.append(f"    {name} = get({variable_id!r})")
+        lines.append(f"    if {name} is None:")
+        lines.append("        pass")
+        types = allowed_types[variable_id]
+        numeric_classes = [class_name for type_name in ("boolean", "number") if type_name in types for class_name in _CLASSES_BY_TYPE[type_name]]
+        if numeric_classes:
+            lines.append(f"    elif {' or '.join(f'{name}.__class__ is {class_name}' for class_name in numeric_classes)}:")
+            lines.append(f"        {name} = float({name})")
+        if "string" in types:
+            # Strings starting with the function escape are not cast to a value
+            lines.append(f"    elif {name}.__class__ is str and not {name}.startswith({Variable._function_escape!r}):")
+            lines.append(f"        {name} = {name}.lower()")
+        lines.append("    else:")
+        lines.append("        return None")
+
+    lines.extend(["    fired = []", "    undecided = []"])
+    for rule_index, rule in enumerate(compiled.rule_set):
+        lines.append(f"    # Rule {rule_index}")
+        if not rule.predicates:
+            lines.append(f"    fired.append({rule_index})")
+            continue
+        dead = " or ".join(f"{names[predicate.left_term.id]} is not None and not ({tests[id(predicate)]})" for predicate in rule.predicates)
+        present = " and ".join(f"{names[variable_id]} is not None" for variable_id in dict.fromkeys(predicate.left_term.id for predicate in rule.predicates))
+        lines.append(f"    if not ({dead}):")
+        lines.append(f"        if {present}:")
+        lines.append(f"            fired.append({rule_index})")
+        lines.append("        else:")
+        lines.append(f"            undecided.append({rule_index})")
+    lines.append("    return fired, undecided")
+    return "\n".join(lines) + "\n"
+
+class GeneratedEvaluator:
+    """
+    Batch backend running a Python function generated from the rule set, with the same results as DeductiveReasoningService.evaluate_batch.
+
+    The function is compiled once per knowledge base and reused while its rule set does not change. With `cache_dir`
+    the compiled code is also stored on disk under the hash of the rule set and the Python version, so another process
+    loading the same knowledge base skips the generation. Code in the directory is executed, it must not be writable by
+    untrusted users. Rows the function leaves to the scalar engine are evaluated with evaluate_fact_row.
+    """
+    def __init__(self, knowledge_base: KnowledgeBase, cache_dir: str = None):
+        self.knowledge_base = knowledge_base
+        self.cache_dir = cache_dir
+        self.compiled = CompiledKnowledgeBase.compile(knowledge_base)
+        self.compiled.validate()
+        if self.compiled.generic_predicates:
+            raise Exception("[Reasoning Engine]: Code generation supports only deductive predicates.")
+        self.function = self._load_function()
+        # Rules that fire have all facts provided, so continue_reasoning orders them by predicate count only
+        self.firing_ranks = {
+            rule_index: rank for rank, rule_index in
+            enumerate(sorted(range(len(self.compiled.rule_set)), key=lambda rule_index: len(self.compiled.rule_set[rule_index].predicates)))
+        }
+
+    def _load_function(self) -> Callable[[dict], Optional[Tuple[List[int], List[int]]]]:
+        code = _CODE_BY_KNOWLEDGE_BASE.get(self.compiled)
+        if code is None:
+            path = self.get_cache_path()
+            code = GeneratedEvaluator._read_code(path) if path is not None else None
+            if code is None:
+                code = compile(generate_source(self.knowledge_base), f"<generated {self.knowledge_base.id}>", "exec")
+                if path is not None:
+                    GeneratedEvaluator._write_code(path, code)
+            _CODE_BY_KNOWLEDGE_BASE[self.compiled] = code
+        namespace = {}
+        exec(code, namespace)
+        return namespace[FUNCTION_NAME]
+
+    def get_cache_path(self) -> Optional[str]:
+        """
+        Returns the file of the compiled code in the cache directory, or None without a directory or for rule sets that cannot be hashed.
+        """
+        if self.cache_dir is None:
+            return None
+        try:
+            knowledge_base_hash = get_knowledge_base_hash(self.compiled)
+        except TypeError:
+            return None
+        return os.path.join(self.cache_dir, f"{knowledge_base_hash}.v{GENERATOR_VERSION}.{sys.implementation.cache_tag}.bin")
+
+    @staticmethod
+    def _read_code(path: str):
+        try:
+            with open(path, "rb") as file:
+                return marshal.load(file)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def _write_code(path: str, code):
+        # Written under a temporary name and renamed, so concurrent processes never read a partial file
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                marshal.dump(code, file)
+            os.replace(temporary_path, path)
+        except OSError:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    def get_fired_rule_indexes(self, facts: dict) -> Optional[Tuple[List[int], List[int]]]:
+        """
+        Returns indexes of the fired and undecided rules, or None when the facts have to be evaluated by the scalar engine.
+        """
+        try:
+            return self.function(facts)
+        except Exception:
+            return None
+
+    def evaluate(self, facts, reasoning_method: ReasoningMethod = ReasoningMethod.DEDUCTION, options=None) -> List[BatchEvaluationResult]:
+        hypothesis_rules = None
+        if reasoning_method == ReasoningMethod.HYPOTHESIS_TESTING:
+            if not options or "hypothesis" not in options or not isinstance(options["hypothesis"], Variable):
+                raise Exception("[Reasoning Engine]: Hypothesis not provided in reasoning process options.")
+            hypothesis_rules = set(self.compiled.get_conclusion_rule_indexes(options["hypothesis"].id, options["hypothesis"].value))
+        elif reasoning_method != ReasoningMethod.DEDUCTION:
+            raise Exception(f"[Reasoning Engine]: Reasoning method {reasoning_method.name} is not supported by generated evaluation.")
+
+        session = ReasoningSession(reasoning_method, self.knowledge_base, options)
+        if options and options.get("conclusion_as_fact"):
+            # Chained conclusions change the facts during reasoning, only the scalar engine follows them
+            return [evaluate_fact_row(session, row) for row in iterate_fact_rows(facts)]
+        return [self._evaluate_row(row, session, hypothesis_rules) for row in iterate_fact_rows(facts)]
+
+    def _evaluate_row(self, row: dict, session: ReasoningSession, hypothesis_rules: Optional[Set[int]]) -> BatchEvaluationResult:
+        rule_indexes = self.get_fired_rule_indexes(row)
+        if rule_indexes is None:
+            return evaluate_fact_row(session, row)
+
+        fired, undecided = rule_indexes
+        reasoned_items = []
+        if hypothesis_rules is not None:
+            undecided = [rule_index for rule_index in undecided if rule_index in hypothesis_rules]
+            if any(rule_index in hypothesis_rules for rule_index in fired):
+                reasoned_items = [session.options["hypothesis"]]
+                undecided = []
+        else:
+            for rule_index in sorted(fired, key=self.firing_ranks.__getitem__):
+                conclusion = self.compiled.rule_set[rule_index].conclusion.get_variable()
+                if not CompiledKnowledgeBase.is_reasoned(reasoned_items, conclusion):
+                    reasoned_items.append(conclusion)
+
+        if not undecided:
+            return BatchEvaluationResult(reasoned_items, EvaluationMessage.PASSED if reasoned_items else EvaluationMessage.FAILED, [])
+        # Only variables of undecided rules are still needed, as in SessionReasoningService.get_all_missing_variable_ids
+        return BatchEvaluationResult(reasoned_items, EvaluationMessage.MISSING_VALUES, get_missing_variable_ids(self.compiled, row, undecided))
@@ -0,0 +1,83 @@
+from typing import Callable, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+from ..base import KnowledgeBase, HitPolicy
+from .compiled_knowledge_base import CompiledKnowledgeBase
+
+HIT_POLICY_PROPERTY = "hit_policy"
+# Conclusion values of the PRIORITY hit policy, the highest priority first
+OUTPUT_PRIORITY_PROPERTY = "output_priority"
+
+# Rule order of the PRIORITY hit policy per compiled knowledge base with the priorities it was built for
+_PRIORITY_ORDERS = WeakKeyDictionary()
+
+def get_hit_policy(knowledge_base: KnowledgeBase) -> HitPolicy:
+    """
+    Returns the hit policy stored in the knowledge base properties, COLLECT when none is set.
+    """
+    value = knowledge_base.properties.get(HIT_POLICY_PROPERTY) if knowledge_base.properties else None
+    if value is None:
+        return HitPolicy.COLLECT
+    if isinstance(value, HitPolicy):
+        return value
+    try:
+        return HitPolicy(str(value).upper())
+    except ValueError:
+        raise Exception(f"[Reasoning Engine]: Unknown hit policy {value}.")
+
+def is_single_hit(knowledge_base: KnowledgeBase, options: dict = None) -> bool:
+    """
+    Tells whether reasoning selects the conclusion of a single rule. Chaining conclusions as facts needs every fired
+    rule, so the hit policy applies only without the "conclusion_as_fact" option.
+    """
+    return get_hit_policy(knowledge_base) != HitPolicy.COLLECT and not (options and options.get("conclusion_as_fact"))
+
+def get_hit_order(knowledge_base: KnowledgeBase, compiled: CompiledKnowledgeBase, hit_policy: HitPolicy, get_default_order: Callable[[], List[int]]) -> List[int]:
+    """
+    Returns rule indexes in the order the hit policy checks them: rule set order for FIRST, descending output priority
+    for PRIORITY and the order of the reasoning service, cheapest rules first, when the order does not matter.
+    """
+    if hit_policy == HitPolicy.FIRST:
+        return list(range(len(compiled.rule_set)))
+    if hit_policy != HitPolicy.PRIORITY:
+        return get_default_order()
+
+    priorities = list(knowledge_base.properties.get(OUTPUT_PRIORITY_PROPERTY) or [])
+    cached = _PRIORITY_ORDERS.get(compiled)
+    if cached is not None and cached[0] == priorities:
+        return cached[1]
+    ranks = []
+    for rule in compiled.rule_set:
+        value = rule.conclusion.get_value()
+        # Conclusions missing from the priorities come last, in rule set order
+        ranks.append(next((rank for rank, priority in enumerate(priorities) if priority == value), len(priorities)))
+    order = sorted(range(len(compiled.rule_set)), key=lambda rule_index: (ranks[rule_index], rule_index))
+    _PRIORITY_ORDERS[compiled] = (priorities, order)
+    return order
+
+def select_hit(rule_indexes: List[int], hit_policy: HitPolicy, evaluate_rule: Callable[[int], Optional[bool]]) -> Tuple[Optional[int], bool]:
+    """
+    Evaluates the rules in the given order until the hit policy is decided.
+
+    FIRST and PRIORITY select the first rule that fires and stop at the first undecided rule, since a later hit cannot
+    be selected before it is decided. UNIQUE and ANY tables have a single possible output, so any rule that fires is
+    selected and the remaining rules are never evaluated. Overlapping rules of a UNIQUE table are not reported.
+
+    Args:
+        rule_indexes (List[int]): Rule indexes in the order of get_hit_order.
+        hit_policy (HitPolicy): Hit policy of the knowledge base, other than COLLECT.
+        evaluate_rule (Callable[[int], Optional[bool]]): Returns the result of a rule, None when it cannot be decided.
+
+    Returns:
+        Tuple[Optional[int], bool]: Index of the selected rule or None, and whether the selection is final.
+    """
+    ordered = hit_policy in (HitPolicy.FIRST, HitPolicy.PRIORITY)
+    decided = True
+    for rule_index in rule_indexes:
+        result = evaluate_rule(rule_index)
+        if result:
+            return rule_index, True
+        if result is None:
+            if ordered:
+                return None, False
+            decided = False
+    return None, decided
@@ -0,0 +1,98 @@
+from bisect import bisect_left
+from math import isfinite
+from typing import FrozenSet, Iterable, List
+from ..base import OperatorType
+from .deductive_predicate import DeductivePredicate
+
+RANGE_OPERATORS = {
+    OperatorType.GREATER_THAN,
+    OperatorType.GREATER_OR_EQUAL,
+    OperatorType.LESS_THAN,
+    OperatorType.LESS_OR_EQUAL,
+    OperatorType.BETWEEN,
+    OperatorType.NOT_BETWEEN
+}
+
+def is_indexable_value(value) -> bool:
+    """
+    Numbers compared by the index, booleans and NaN keep the scalar evaluation.
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value == value
+
+def _is_bound(value) -> bool:
+    return is_indexable_value(value) and isfinite(value)
+
+class IntervalIndex:
+    """
+    Sorted breakpoint index over numeric range predicates of a single variable.
+
+    The bounds of all predicates split the number line into segments, and every predicate has the same
+    result for all values of a segment. The satisfied predicates of each segment are computed once,
+    so a lookup is a binary search over the bounds instead of evaluating every predicate.
+    """
+    def __init__(self, predicates: Iterable[DeductivePredicate]):
+        self.predicates: List[DeductivePredicate] = [predicate for predicate in predicates if IntervalIndex.supports(predicate)]
+        bounds = set()
+        for predicate in self.predicates:
+            bounds.update(IntervalIndex._get_bounds(predicate))
+        self.breakpoints: List[float] = sorted(bounds)
+
+        # Segment 2 * i + 1 is the breakpoint i, even segments are open intervals around breakpoints
+        representatives = []
+        for index, breakpoint in enumerate(self.breakpoints):
+            previous = self.breakpoints[index - 1] if index > 0 else breakpoint - 1.0
+            representatives.append((previous + breakpoint) / 2 if index > 0 else previous)
+            representatives.append(breakpoint)
+        representatives.append(self.breakpoints[-1] + 1.0 if self.breakpoints else 0.0)
+        self.segments: List[FrozenSet[int]] = [
+            frozenset(position for position, predicate in enumerate(self.predicates) if IntervalIndex._satisfies(predicate, value))
+            for value in representatives
+        ]
+
+    @staticmethod
+    def supports(predicate: DeductivePredicate) -> bool:
+        if not isinstance(predicate, DeductivePredicate) or predicate.operator not in RANGE_OPERATORS or not predicate.is_valid():
+            return False
+        value = predicate.right_term.value
+        if predicate.operator in (OperatorType.BETWEEN, OperatorType.NOT_BETWEEN):
+            return isinstance(value, (list, tuple)) and len(value) == 2 and all(_is_bound(bound) for bound in value)
+        return _is_bound(value)
+
+    @staticmethod
+    def _get_bounds(predicate: DeductivePredicate) -> List[float]:
+        value = predicate.right_term.value
+        if isinstance(value, (list, tuple)):
+            return [float(bound) for bound in value]
+        return [float(value)]
+
+    @staticmethod
+    def _satisfies(predicate: DeductivePredicate, value: float) -> bool:
+        operator = predicate.operator
+        if operator in (OperatorType.BETWEEN, OperatorType.NOT_BETWEEN):
+            lower, upper = (float(bound) for bound in predicate.right_term.value)
+            return (lower <= value <= upper) == (operator == OperatorType.BETWEEN)
+        bound = float(predicate.right_term.value)
+        if operator == OperatorType.GREATER_THAN:
+            return value > bound
+        if operator == OperatorType.GREATER_OR_EQUAL:
+            return value >= bound
+        if operator == OperatorType.LESS_THAN:
+            return value < bound
+        return value <= bound
+
+    def locate(self, value) -> int:
+        value = float(value)
+        index = bisect_left(self.breakpoints, value)
+        if index < len(self.breakpoints) and self.breakpoints[index] == value:
+            return 2 * index + 1
+        return 2 * index
+
+    def query(self, value) -> FrozenSet[int]:
+        """
+        Returns positions in `predicates` of the predicates satisfied by a value accepted by is_indexable_value.
+        """
+        return self.segments[self.locate(value)]
+
+    def get_satisfied_predicates(self, value) -> List[DeductivePredicate]:
+        satisfied = self.query(value)
+        return [predicate for position, predicate in enumerate(self.predicates) if position in satisfied]
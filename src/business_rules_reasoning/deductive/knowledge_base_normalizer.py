@@ -0,0 +1,51 @@
+from typing import Dict, List
+from ..base import KnowledgeBase, Rule, Variable
+from .deductive_predicate import DeductivePredicate
+from .compiled_knowledge_base import CompiledKnowledgeBase
+from .rete_network import ReteNetwork
+
+def normalize_rules(rules: List[Rule]) -> List[Rule]:
+    """
+    Interns identical predicates and their variables across the given rules in place.
+
+    Predicates testing the same variable with the same operator and right term value are replaced
+    by a single DeductivePredicate instance, all predicates of a variable share one left term and
+    equal right terms share one Variable. A shared predicate is evaluated once per reasoning process
+    and its result is reused by every rule containing it.
+
+    Args:
+        rules (List[Rule]): Rules to normalize, e.g. the output of pandas_to_rules or c45_ruleset.
+
+    Returns:
+        List[Rule]: The same rules with deduplicated predicates.
+    """
+    predicates: Dict[tuple, DeductivePredicate] = {}
+    left_terms: Dict[str, Variable] = {}
+    right_terms: Dict[tuple, Variable] = {}
+
+    for rule in rules:
+        for index, predicate in enumerate(rule.predicates):
+            if not isinstance(predicate, DeductivePredicate):
+                continue
+            key = ReteNetwork.get_predicate_key(predicate)
+            try:
+                hash(key)
+            except TypeError:
+                continue
+
+            interned = predicates.get(key)
+            if interned is None:
+                predicate.left_term = left_terms.setdefault(predicate.left_term.id, predicate.left_term)
+                predicate.right_term = right_terms.setdefault(key[0:1] + key[2:], predicate.right_term)
+                predicates[key] = interned = predicate
+            rule.predicates[index] = interned
+    return rules
+
+def normalize_knowledge_base(knowledge_base: KnowledgeBase) -> KnowledgeBase:
+    """
+    Interns identical predicates and variables of the knowledge base in place and drops its cached index.
+    Evaluation state of the knowledge base should be reset before reasoning, e.g. by DeductiveReasoningService.start_reasoning.
+    """
+    normalize_rules(knowledge_base.rule_set)
+    CompiledKnowledgeBase.invalidate(knowledge_base)
+    return knowledge_base
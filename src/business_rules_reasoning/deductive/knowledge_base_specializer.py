@@ -0,0 +1,80 @@
+from typing import Dict
+from ..base import KnowledgeBase, Rule, Variable
+from .deductive_predicate import DeductivePredicate
+from .compiled_knowledge_base import CompiledKnowledgeBase
+from .batch_evaluation import normalize_fact_value
+from .rete_network import ReteNetwork
+
+def specialize(knowledge_base: KnowledgeBase, fixed_facts: dict) -> KnowledgeBase:
+    """
+    Partially evaluates the knowledge base on facts that are constant for a whole batch or tenant.
+
+    Predicates satisfied by the fixed facts are removed and rules with a contradicted predicate are dropped,
+    so rows evaluated against the result do not need the fixed facts and pay for them only once. Identical
+    predicates shared by several rules are evaluated once. The knowledge base is not modified: remaining
+    predicates are copied with fresh left terms, conclusions and right terms are shared.
+
+    Args:
+        knowledge_base (KnowledgeBase): The knowledge base to specialize.
+        fixed_facts (dict): A dictionary mapping variable IDs to values shared by every row.
+
+    Returns:
+        KnowledgeBase: A new knowledge base with its compiled index built.
+    """
+    facts = {variable_id: value for variable_id, value in ((variable_id, normalize_fact_value(value)) for variable_id, value in fixed_facts.items()) if value is not None}
+    results: Dict[tuple, bool] = {}
+    copies: Dict[int, DeductivePredicate] = {}
+    left_terms: Dict[str, Variable] = {}
+    rule_set = []
+
+    for rule in knowledge_base.rule_set:
+        predicates = []
+        contradicted = False
+        for predicate in rule.predicates:
+            if not isinstance(predicate, DeductivePredicate):
+                predicates.append(predicate)
+                continue
+            value = facts.get(predicate.left_term.id)
+            if value is None:
+                predicates.append(_copy_predicate(predicate, copies, left_terms))
+                continue
+            key = ReteNetwork.get_predicate_key(predicate)
+            try:
+                hash(key)
+            except TypeError:
+                key = ("unshared", id(predicate))
+            result = results.get(key)
+            if result is None:
+                try:
+                    result = predicate.evaluate_value(value)
+                except Exception as e:
+                    raise Exception(f"[Reasoning Engine]: Cannot specialize predicate {predicate.display()} on fixed fact {predicate.left_term.id}: {e}")
+                results[key] = result
+            if not result:
+                contradicted = True
+                break
+        if not contradicted:
+            rule_set.append(Rule(conclusion=rule.conclusion, predicates=predicates))
+
+    result = KnowledgeBase(
+        id=knowledge_base.id,
+        name=knowledge_base.name,
+        description=knowledge_base.description,
+        rule_set=rule_set,
+        properties=dict(knowledge_base.properties),
+        reasoning_type=knowledge_base.reasoning_type
+    )
+    CompiledKnowledgeBase.compile(result)
+    return result
+
+def _copy_predicate(predicate: DeductivePredicate, copies: Dict[int, DeductivePredicate], left_terms: Dict[str, Variable]) -> DeductivePredicate:
+    # Predicates shared by several rules, e.g. after normalize_knowledge_base, stay shared in the copy
+    copy = copies.get(id(predicate))
+    if copy is None:
+        left_term = left_terms.get(predicate.left_term.id)
+        if left_term is None:
+            left_term = Variable(id=predicate.left_term.id, name=predicate.left_term.name)
+            left_terms[left_term.id] = left_term
+        copy = DeductivePredicate(left_term=left_term, right_term=predicate.right_term, operator=predicate.operator)
+        copies[id(predicate)] = copy
+    return copy
@@ -1,6 +1,7 @@
-from ..base import KnowledgeBase, Rule, Predicate, Variable, OperatorType, ReasoningType
+from ..base import KnowledgeBase, Rule, Predicate, Variable, OperatorType, ReasoningType, HitPolicy
 from .deductive_predicate import DeductivePredicate
 from .deductive_conclusion import DeductiveConclusion
+from .hit_policy import HIT_POLICY_PROPERTY, OUTPUT_PRIORITY_PROPERTY
 
 class KnowledgeBaseBuilder:
     def __init__(self):
@@ -33,6 +34,13 @@ class KnowledgeBaseBuilder:
         self.knowledge_base.properties[key] = value
         return self
 
+    def set_hit_policy(self, hit_policy: HitPolicy, output_priority: list = None):
+        # Stored by name, so the knowledge base stays JSON serializable
+        self.knowledge_base.properties[HIT_POLICY_PROPERTY] = hit_policy.value
+        if output_priority is not None:
+            self.knowledge_base.properties[OUTPUT_PRIORITY_PROPERTY] = list(output_priority)
+        return self
+
     def unwrap(self):
         self.knowledge_base.validate()
         return self.knowledge_base
@@ -0,0 +1,137 @@
+from typing import Dict, List
+from ..base import KnowledgeBase, Rule, OperatorType
+from .deductive_predicate import DeductivePredicate
+from .compiled_knowledge_base import CompiledKnowledgeBase
+from .rete_network import ReteNetwork
+from .batch_evaluation import iterate_fact_rows
+
+# Relative cost of a single comparison, list operators scan the right term on top of it
+OPERATOR_COSTS = {
+    OperatorType.EQUAL: 1.0,
+    OperatorType.NOT_EQUAL: 1.0,
+    OperatorType.GREATER_OR_EQUAL: 1.0,
+    OperatorType.GREATER_THAN: 1.0,
+    OperatorType.LESS_OR_EQUAL: 1.0,
+    OperatorType.LESS_THAN: 1.0,
+    OperatorType.BETWEEN: 2.0,
+    OperatorType.NOT_BETWEEN: 2.0,
+    OperatorType.IS_IN: 2.0,
+    OperatorType.NOT_IN: 2.0,
+    OperatorType.SUBSET: 3.0,
+    OperatorType.NOT_SUBSET: 3.0
+}
+
+LIST_SCAN_OPERATORS = {OperatorType.IS_IN, OperatorType.NOT_IN, OperatorType.SUBSET, OperatorType.NOT_SUBSET}
+
+class PredicateStatistics:
+    """
+    Observed outcomes of predicates, keyed the same way as alpha nodes of the Rete network.
+    Failure rates use Laplace smoothing, so predicates that were never observed get 0.5.
+    """
+    def __init__(self):
+        self.evaluations: Dict[tuple, int] = {}
+        self.failures: Dict[tuple, int] = {}
+
+    def record(self, predicate: DeductivePredicate, result: bool):
+        key = PredicateStatistics._get_key(predicate)
+        if key is None:
+            return
+        self.evaluations[key] = self.evaluations.get(key, 0) + 1
+        if not result:
+            self.failures[key] = self.failures.get(key, 0) + 1
+
+    def record_session(self, session):
+        """
+        Records predicate results cached by a ReasoningSession evaluated with SessionReasoningService.
+        """
+        network = (session.compiled or CompiledKnowledgeBase.compile(session.knowledge_base)).get_rete_network()
+        for alpha_index, result in session.node_results.items():
+            self.record(network.alpha_nodes[alpha_index].predicate, result)
+
+    def observe(self, knowledge_base: KnowledgeBase, facts):
+        """
+        Evaluates every distinct predicate of the knowledge base against sample rows of facts.
+
+        Args:
+            knowledge_base (KnowledgeBase): The knowledge base to profile.
+            facts: A list or iterator of dictionaries mapping variable IDs to values, or a pandas DataFrame.
+        """
+        network = CompiledKnowledgeBase.compile(knowledge_base).get_rete_network()
+        for row in iterate_fact_rows(facts):
+            for variable_id, value in row.items():
+                for alpha_index in network.alpha_indexes_by_variable.get(variable_id, ()):
+                    predicate = network.alpha_nodes[alpha_index].predicate
+                    try:
+                        result = predicate.evaluate_value(value)
+                    except Exception:
+                        continue
+                    self.record(predicate, result)
+
+    def is_observed(self, predicate: DeductivePredicate) -> bool:
+        key = PredicateStatistics._get_key(predicate)
+        return key is not None and key in self.evaluations
+
+    def get_failure_rate(self, predicate: DeductivePredicate) -> float:
+        key = PredicateStatistics._get_key(predicate)
+        evaluations = self.evaluations.get(key, 0) if key is not None else 0
+        failures = self.failures.get(key, 0) if key is not None else 0
+        return (failures + 1) / (evaluations + 2)
+
+    @staticmethod
+    def _get_key(predicate: DeductivePredicate):
+        key = ReteNetwork.get_predicate_key(predicate)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+def estimate_cost(predicate: DeductivePredicate) -> float:
+    cost = OPERATOR_COSTS.get(predicate.operator, 1.0)
+    if predicate.operator in LIST_SCAN_OPERATORS and isinstance(predicate.right_term.value, (list, tuple, set)):
+        cost += len(predicate.right_term.value)
+    return cost
+
+def order_rule_predicates(rule: Rule, statistics: PredicateStatistics = None, frequencies: Dict[str, int] = None) -> Rule:
+    """
+    Reorders predicates of the rule in place by expected cost of proving the rule false.
+
+    Predicates with the lowest cost per failure chance go first, so Rule.evaluate stops at a false predicate
+    as early and as cheaply as possible. Ties keep variables with higher frequency first, then the original order.
+    """
+    statistics = statistics if statistics is not None else PredicateStatistics()
+    frequencies = frequencies if frequencies is not None else {}
+    ranked: List[tuple] = []
+    for index, predicate in enumerate(rule.predicates):
+        if not isinstance(predicate, DeductivePredicate):
+            # Generic predicates have no cost estimate and stay in front in their original order
+            ranked.append((0.0, 0, index, predicate))
+            continue
+        ranked.append((
+            estimate_cost(predicate) / statistics.get_failure_rate(predicate),
+            -frequencies.get(predicate.left_term.id, 0),
+            index,
+            predicate
+        ))
+    rule.predicates[:] = [item[3] for item in sorted(ranked, key=lambda item: item[:3])]
+    return rule
+
+def order_predicates_by_cost(knowledge_base: KnowledgeBase, statistics: PredicateStatistics = None) -> KnowledgeBase:
+    """
+    Reorders predicates of every rule by estimated cost and selectivity and drops the cached index of the knowledge base.
+
+    Conjunctions are commutative, so reasoning results only differ for rules that would raise an evaluation error:
+    a false predicate moved in front of the failing one now decides the rule first.
+
+    Args:
+        knowledge_base (KnowledgeBase): The knowledge base to optimize in place.
+        statistics (PredicateStatistics): Observed failure rates, e.g. collected with PredicateStatistics.observe on sample facts.
+
+    Returns:
+        KnowledgeBase: The same knowledge base with reordered predicates.
+    """
+    compiled = CompiledKnowledgeBase.compile(knowledge_base)
+    for rule in knowledge_base.rule_set:
+        order_rule_predicates(rule, statistics, compiled.frequencies)
+    CompiledKnowledgeBase.invalidate(knowledge_base)
+    return knowledge_base
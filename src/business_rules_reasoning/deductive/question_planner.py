@@ -0,0 +1,139 @@
+from typing import Dict, Iterable, List, Optional, Set
+from ..base import KnowledgeBase, ReasoningProcess, Variable, OperatorType
+from ..base.reasoning_enums import ReasoningMethod
+from .compiled_knowledge_base import CompiledKnowledgeBase
+from .deductive_predicate import DeductivePredicate
+from .reasoning_session import ReasoningSession
+from .backward_chaining import create_chaining_state
+from .hit_policy import is_single_hit
+
+class QuestionPlanner:
+    """
+    Picks the missing variable to ask for next, so reasoning is decided with as few questions as possible.
+
+    Only rules that are undecided, relevant to the reasoning goal and not already failed on a known fact are considered.
+    A variable is scored by the expected number of these rules its answer decides: a rule is decided when a predicate
+    of the variable turns out false, or when the variable is the last value the rule is missing. Ties keep the frequency
+    order of DeductiveReasoningService.get_all_missing_variables.
+    """
+    def __init__(self, knowledge_base: KnowledgeBase, statistics=None):
+        self.compiled = CompiledKnowledgeBase.compile(knowledge_base)
+        # Optional PredicateStatistics, observed failure rates replace the estimates below
+        self.statistics = statistics
+        self.variable_ranks = {variable_id: rank for rank, variable_id in enumerate(self.compiled.variable_ids)}
+
+    def rank_missing_variables(self, reasoning_process: ReasoningProcess, exclude: Iterable[str] = ()) -> List[Variable]:
+        """
+        Returns missing variables of the rules still alive, best question first.
+        """
+        if self.compiled.generic_predicates:
+            # Values of generic predicates cannot be planned, the frequency order is kept
+            return [variable for variable in self.compiled.get_missing_variables() if variable.id not in exclude]
+
+        facts = self._get_facts(reasoning_process)
+        excluded = set(exclude)
+        goal_rules = self._get_goal_rule_indexes(reasoning_process)
+        leaf_ids = None
+        if goal_rules is not None and reasoning_process.options.get("conclusion_as_fact"):
+            # Backward chaining asks only for leaf facts of the cheapest proof, its rules are scored
+            path = self.compiled.get_backward_chainer().get_proof_path(goal_rules, create_chaining_state(reasoning_process, self.compiled))
+            if path is None:
+                return []
+            leaf_ids = set(path.variable_ids)
+            alive_rules = [rule_index for rule_index in path.rule_indexes if not QuestionPlanner._is_failed(self.compiled.rule_set[rule_index].predicates, facts)]
+        else:
+            alive_rules = self._get_alive_rules(reasoning_process, facts, goal_rules)
+
+        equality_values: Dict[str, Set] = {}
+        for rule_index in alive_rules:
+            for predicate in self.compiled.rule_set[rule_index].predicates:
+                equality_key = QuestionPlanner._get_equality_key(predicate)
+                if equality_key is not None and facts.get(predicate.left_term.id) is None:
+                    equality_values.setdefault(predicate.left_term.id, set()).add(equality_key)
+
+        scores: Dict[str, float] = {}
+        for rule_index in alive_rules:
+            predicates = self.compiled.rule_set[rule_index].predicates
+            missing = {predicate.left_term.id for predicate in predicates if facts.get(predicate.left_term.id) is None}
+            for variable_id in missing:
+                true_probability = 1.0
+                for predicate in predicates:
+                    if predicate.left_term.id == variable_id:
+                        true_probability *= self._get_true_probability(predicate, len(equality_values.get(variable_id, ())))
+                decided = (1.0 - true_probability) + (true_probability if len(missing) == 1 else 0.0)
+                scores[variable_id] = scores.get(variable_id, 0.0) + decided
+
+        variable_ids = sorted(
+            (variable_id for variable_id in scores if variable_id not in excluded and (leaf_ids is None or variable_id in leaf_ids)),
+            key=lambda variable_id: (-scores[variable_id], self.variable_ranks[variable_id])
+        )
+        return [self.compiled.predicates_by_variable[variable_id][0].right_term for variable_id in variable_ids]
+
+    def get_next_variable(self, reasoning_process: ReasoningProcess, exclude: Iterable[str] = ()) -> Optional[Variable]:
+        """
+        Returns the variable to ask for next, or None when no rule alive is missing a value.
+        """
+        ranked = self.rank_missing_variables(reasoning_process, exclude)
+        return ranked[0] if ranked else None
+
+    def _get_facts(self, reasoning_process: ReasoningProcess) -> dict:
+        if isinstance(reasoning_process, ReasoningSession):
+            return reasoning_process.facts
+        facts = {}
+        for variable_id, predicates in self.compiled.predicates_by_variable.items():
+            value = next((predicate.left_term.value for predicate in predicates if not predicate.left_term.is_empty()), None)
+            if value is not None:
+                facts[variable_id] = value
+        return facts
+
+    def _get_goal_rule_indexes(self, reasoning_process: ReasoningProcess) -> Optional[List[int]]:
+        if is_single_hit(reasoning_process.knowledge_base, reasoning_process.options):
+            # The hit policy selects the conclusion among every rule
+            return None
+        if reasoning_process.reasoning_method == ReasoningMethod.HYPOTHESIS_TESTING and reasoning_process.options and isinstance(reasoning_process.options.get("hypothesis"), Variable):
+            hypothesis = reasoning_process.options["hypothesis"]
+            return self.compiled.get_conclusion_rule_indexes(hypothesis.id, hypothesis.value)
+        return None
+
+    def _get_alive_rules(self, reasoning_process: ReasoningProcess, facts: dict, goal_rules: Optional[List[int]]) -> List[int]:
+        rule_set = self.compiled.rule_set
+        rule_indexes = goal_rules if goal_rules is not None else range(len(rule_set))
+
+        if isinstance(reasoning_process, ReasoningSession):
+            decided = lambda rule_index: rule_index in reasoning_process.rule_results
+        else:
+            decided = lambda rule_index: rule_set[rule_index].evaluated
+
+        return [rule_index for rule_index in rule_indexes if not decided(rule_index) and not QuestionPlanner._is_failed(rule_set[rule_index].predicates, facts)]
+
+    @staticmethod
+    def _is_failed(predicates: List[DeductivePredicate], facts: dict) -> bool:
+        # Facts may be set without reasoning being continued yet
+        for predicate in predicates:
+            value = facts.get(predicate.left_term.id)
+            if value is None:
+                continue
+            try:
+                if not predicate.evaluate_value(value):
+                    return True
+            except Exception:
+                # Continuing reasoning reports the error
+                return True
+        return False
+
+    def _get_true_probability(self, predicate: DeductivePredicate, equality_value_count: int) -> float:
+        if self.statistics is not None and self.statistics.is_observed(predicate):
+            return 1.0 - self.statistics.get_failure_rate(predicate)
+        if equality_value_count and QuestionPlanner._get_equality_key(predicate) is not None:
+            # One of the tested values or any other value
+            return 1.0 / (equality_value_count + 1)
+        return 0.5
+
+    @staticmethod
+    def _get_equality_key(predicate: DeductivePredicate):
+        if predicate.operator != OperatorType.EQUAL or isinstance(predicate.right_term.value, (list, tuple, set)):
+            return None
+        try:
+            return predicate.get_right_value()[0].get_normalized_value()
+        except Exception:
+            return None
@@ -0,0 +1,175 @@
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, List, Optional
+from weakref import WeakKeyDictionary
+from ..base import KnowledgeBase, Variable
+from ..base.reasoning_enums import EvaluationMessage, ReasoningMethod
+from .batch_evaluation import BatchEvaluationResult, iterate_fact_rows
+from .compiled_knowledge_base import CompiledKnowledgeBase
+from .hit_policy import OUTPUT_PRIORITY_PROPERTY, get_hit_policy
+
+def get_canonical_value(value):
+    """
+    Returns a hashable form of a fact or rule value. Type names keep 1, 1.0 and True apart, they differ in type checks.
+    """
+    if isinstance(value, Variable):
+        return ("Variable", value.id, get_canonical_value(value.value))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(get_canonical_value(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return (type(value).__name__, tuple(sorted((get_canonical_value(item) for item in value), key=repr)))
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted(((key, get_canonical_value(item)) for key, item in value.items()), key=repr)))
+    hash(value)
+    return (type(value).__name__, value)
+
+def get_knowledge_base_hash(compiled: CompiledKnowledgeBase) -> str:
+    """
+    Hashes conclusions and predicates of the rule set, facts held in the left terms are not included.
+    """
+    content = tuple(
+        (
+            rule.conclusion.get_id(),
+            get_canonical_value(rule.conclusion.get_value()),
+            tuple((predicate.left_term.id, predicate.operator.name, get_canonical_value(predicate.right_term.value)) for predicate in rule.predicates)
+        )
+        for rule in compiled.rule_set
+    )
+    return hashlib.sha256(repr(content).encode("utf-8")).hexdigest()
+
+class ReasoningCache:
+    """
+    LRU cache of reasoning results keyed by the knowledge base content, reasoning method, options and the facts of the row.
+
+    Only facts of variables tested by the knowledge base count toward the key, so rows differing in other columns share
+    a result. The knowledge base hash is computed once per CompiledKnowledgeBase, so a hit never walks the rule set. Adding
+    or removing rules or replacing the rule set rebuilds the compiled index and its hash; after changing rules, predicates
+    or right term values in place call `CompiledKnowledgeBase.invalidate`, or results of the old rules are returned.
+    Rows whose facts cannot be hashed and rows ending with an error are evaluated every time.
+    """
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        if max_size <= 0:
+            raise ValueError("Cache size must be positive")
+        self.max_size = max_size
+        # Seconds a result is kept, None keeps it until evicted
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._hashes = WeakKeyDictionary()
+        self._lock = Lock()
+
+    def evaluate_batch(self, knowledge_base: KnowledgeBase, facts, reasoning_method: ReasoningMethod, options, evaluate_rows: Callable[[List[dict]], List[BatchEvaluationResult]]) -> List[BatchEvaluationResult]:
+        """
+        Returns cached results of the rows and evaluates the others once with `evaluate_rows`, identical rows included.
+        """
+        compiled = CompiledKnowledgeBase.compile(knowledge_base)
+        prefix = self._get_prefix(knowledge_base, compiled, reasoning_method, options)
+        rows = list(iterate_fact_rows(facts))
+        results: List[Optional[BatchEvaluationResult]] = [None] * len(rows)
+        pending: Dict[tuple, List[int]] = {}
+        uncached: List[int] = []
+
+        for position, row in enumerate(rows):
+            key = self._get_key(prefix, compiled, row)
+            if key is None:
+                uncached.append(position)
+                with self._lock:
+                    self.misses += 1
+                continue
+            if key in pending:
+                pending[key].append(position)
+                with self._lock:
+                    self.hits += 1
+                continue
+            cached = self._get(key)
+            if cached is not None:
+                results[position] = ReasoningCache._copy(cached)
+            else:
+                pending[key] = [position]
+
+        keys = list(pending)
+        positions = [pending[key][0] for key in keys] + uncached
+        evaluated = evaluate_rows([rows[position] for position in positions]) if positions else []
+        for key, result in zip(keys, evaluated):
+            if result.evaluation_message != EvaluationMessage.ERROR:
+                self._put(key, result)
+            for position in pending[key]:
+                results[position] = ReasoningCache._copy(result)
+        for position, result in zip(uncached, evaluated[len(keys):]):
+            results[position] = result
+        return results
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries)
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _get_prefix(self, knowledge_base: KnowledgeBase, compiled: CompiledKnowledgeBase, reasoning_method: ReasoningMethod, options) -> Optional[tuple]:
+        with self._lock:
+            knowledge_base_hash = self._hashes.get(compiled)
+            if knowledge_base_hash is None:
+                knowledge_base_hash = get_knowledge_base_hash(compiled)
+                self._hashes[compiled] = knowledge_base_hash
+        try:
+            canonical_options = get_canonical_value(options or {})
+            # The hit policy is a property of the knowledge base, it can change without changing the rule set
+            hit_policy = (get_hit_policy(knowledge_base).name, get_canonical_value(knowledge_base.properties.get(OUTPUT_PRIORITY_PROPERTY)))
+        except TypeError:
+            return None
+        return (knowledge_base_hash, reasoning_method.name, canonical_options, hit_policy)
+
+    def _get_key(self, prefix: Optional[tuple], compiled: CompiledKnowledgeBase, row: dict) -> Optional[tuple]:
+        if prefix is None:
+            return None
+        try:
+            facts = tuple(sorted(
+                (variable_id, get_canonical_value(value)) for variable_id, value in row.items()
+                if variable_id in compiled.predicates_by_variable
+            ))
+        except TypeError:
+            return None
+        return prefix + (facts,)
+
+    def _get(self, key: tuple) -> Optional[BatchEvaluationResult]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def _put(self, key: tuple, result: BatchEvaluationResult):
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, ReasoningCache._copy(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    @staticmethod
+    def _copy(result: BatchEvaluationResult) -> BatchEvaluationResult:
+        # Callers get their own lists, the reasoned variables are shared with the knowledge base anyway
+        return BatchEvaluationResult(list(result.reasoned_items), result.evaluation_message, list(result.missing_variable_ids), result.reasoning_error_message)
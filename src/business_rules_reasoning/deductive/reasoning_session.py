@@ -0,0 +1,59 @@
+from typing import Dict, Set
+from ..base.reasoning_process import ReasoningProcess
+from ..base.reasoning_enums import ReasoningMethod
+from ..base.knowledge_base import KnowledgeBase
+from .bitset_state import BitsetResults
+
+class ReasoningSession(ReasoningProcess):
+    """
+    Reasoning process that keeps facts and evaluation results outside of the knowledge base.
+
+    The knowledge base is only read during reasoning, so a single instance can be shared
+    by many sessions and threads without copying it.
+    """
+    def __init__(self, reasoning_method: ReasoningMethod, knowledge_base: KnowledgeBase, options=None, state_backend: str = "dict"):
+        super().__init__(reasoning_method, knowledge_base, options)
+        if state_backend not in ("dict", "bitset"):
+            raise ValueError(f"Unknown session state backend: {state_backend}")
+        # "bitset" packs node and rule results into Python integers, see BitsetResults
+        self.state_backend = state_backend
+        self.facts: Dict[str, object] = {}
+        self.node_results: Dict[int, bool] = self.create_results()
+        self.rule_results: Dict[int, bool] = self.create_results()
+        # Rules to re-examine on the next evaluation, None means every rule
+        self.agenda: Set[int] = None
+        # Number of undecided rules relevant to the goal per variable, None until missing variables are requested
+        self.open_rule_counts: Dict[str, int] = None
+        # Compiled knowledge base the node and rule indexes refer to, compiled again by start_reasoning
+        self.compiled = None
+
+    def display_state(self) -> str:
+        facts_display = "Facts: " + ", ".join([f"{variable_id} = {value}" for variable_id, value in self.facts.items()])
+        rules_display = "\n".join([
+            f"{rule.display()}\nRule Status: {'Evaluated' if index in self.rule_results else 'Not Evaluated'}, Rule Result: {'True' if self.rule_results.get(index) else 'False'}"
+            for index, rule in enumerate(self.knowledge_base.rule_set)
+        ])
+        state_display = f"State: {self.state.name}"
+        evaluation_message_display = f"Evaluation Message: {self.evaluation_message.name}"
+        reasoned_items_display = "Reasoned Items: " + ", ".join([f"{item.id} = {item.value}" for item in self.reasoned_items])
+        return f"{rules_display}\n\n{facts_display}\n{state_display}\n{evaluation_message_display}\n{reasoned_items_display}"
+
+    def create_results(self) -> Dict[int, bool]:
+        return BitsetResults() if self.state_backend == "bitset" else {}
+
+    def get_state_snapshot(self) -> bytes:
+        """
+        Returns node and rule results packed as bits, facts and the agenda are not included.
+        """
+        return BitsetResults.from_dict(self.node_results).to_bytes() + BitsetResults.from_dict(self.rule_results).to_bytes()
+
+    def restore_state_snapshot(self, snapshot: bytes):
+        node_results, offset = BitsetResults.read_bytes(snapshot)
+        rule_results, _ = BitsetResults.read_bytes(snapshot, offset)
+        if self.state_backend == "bitset":
+            self.node_results, self.rule_results = node_results, rule_results
+        else:
+            self.node_results, self.rule_results = dict(node_results.items()), dict(rule_results.items())
+        # Rules are re-examined on the next evaluation
+        self.agenda = None
+        self.open_rule_counts = None
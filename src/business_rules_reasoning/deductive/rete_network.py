@@ -0,0 +1,117 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..base import Rule
+from .deductive_predicate import DeductivePredicate
+from .interval_index import IntervalIndex, is_indexable_value
+from .bitset_state import BitsetResults
+
+class AlphaNode:
+    def __init__(self, index: int, predicate: DeductivePredicate):
+        self.index = index
+        self.predicate = predicate
+        self.variable_id = predicate.left_term.id
+        self.rule_indexes: List[int] = []
+
+class JoinNode:
+    def __init__(self, rule_index: int, rule: Rule, alpha_indexes: Tuple[int, ...]):
+        self.rule_index = rule_index
+        self.rule = rule
+        self.alpha_indexes = alpha_indexes
+        self.alpha_mask = sum(1 << alpha_index for alpha_index in set(alpha_indexes))
+        self.variable_ids: Tuple[str, ...] = tuple(dict.fromkeys(predicate.left_term.id for predicate in rule.predicates))
+
+class ReteNetwork:
+    """
+    Alpha/beta matching network built from a CompiledKnowledgeBase.
+
+    Predicates testing the same variable with the same operator and right term share one alpha node,
+    so each distinct test is evaluated once per session. Every rule is a join node over its alpha nodes.
+    Setting a fact only activates the join nodes reachable from the alpha nodes of that variable.
+    """
+    def __init__(self, rule_set: Iterable[Rule]):
+        self.alpha_nodes: List[AlphaNode] = []
+        self.join_nodes: List[JoinNode] = []
+        self.alpha_indexes_by_variable: Dict[str, List[int]] = {}
+        alpha_indexes_by_key = {}
+
+        for rule_index, rule in enumerate(rule_set):
+            alpha_indexes = []
+            for predicate in rule.predicates:
+                key = ReteNetwork.get_predicate_key(predicate)
+                try:
+                    hash(key)
+                except TypeError:
+                    key = ("unshared", id(predicate))
+                alpha_index = alpha_indexes_by_key.get(key)
+                if alpha_index is None:
+                    alpha_index = len(self.alpha_nodes)
+                    alpha_indexes_by_key[key] = alpha_index
+                    self.alpha_nodes.append(AlphaNode(alpha_index, predicate))
+                    self.alpha_indexes_by_variable.setdefault(predicate.left_term.id, []).append(alpha_index)
+                alpha_node = self.alpha_nodes[alpha_index]
+                if not alpha_node.rule_indexes or alpha_node.rule_indexes[-1] != rule_index:
+                    alpha_node.rule_indexes.append(rule_index)
+                alpha_indexes.append(alpha_index)
+            self.join_nodes.append(JoinNode(rule_index, rule, tuple(alpha_indexes)))
+
+        # Numeric range tests of a variable are resolved together by one interval index lookup
+        self.interval_indexes: Dict[str, Tuple[IntervalIndex, List[int]]] = {}
+        for variable_id, variable_alpha_indexes in self.alpha_indexes_by_variable.items():
+            range_alpha_indexes = [alpha_index for alpha_index in variable_alpha_indexes if IntervalIndex.supports(self.alpha_nodes[alpha_index].predicate)]
+            if len(range_alpha_indexes) > 1:
+                interval_index = IntervalIndex(self.alpha_nodes[alpha_index].predicate for alpha_index in range_alpha_indexes)
+                self.interval_indexes[variable_id] = (interval_index, range_alpha_indexes)
+        self.indexed_alpha_indexes = {alpha_index for _, range_alpha_indexes in self.interval_indexes.values() for alpha_index in range_alpha_indexes}
+
+    @staticmethod
+    def get_predicate_key(predicate: DeductivePredicate):
+        return (predicate.left_term.id, predicate.operator, ReteNetwork.get_value_key(predicate.right_term.value))
+
+    @staticmethod
+    def get_value_key(value):
+        # Type names keep 1, 1.0 and True apart, they differ in type checks
+        if isinstance(value, (list, tuple, set)):
+            return (type(value).__name__, tuple(ReteNetwork.get_value_key(item) for item in value))
+        return (type(value).__name__, value)
+
+    def get_rule_indexes(self, variable_ids: Iterable[str]) -> List[int]:
+        result = []
+        for variable_id in variable_ids:
+            for alpha_index in self.alpha_indexes_by_variable.get(variable_id, ()):
+                result.extend(self.alpha_nodes[alpha_index].rule_indexes)
+        return result
+
+    def evaluate_join(self, facts: dict, node_results: Dict[int, bool], rule_index: int) -> Optional[bool]:
+        """
+        Evaluates the join node of a rule in predicate order, reusing results of alpha nodes already evaluated in the session.
+        Returns None when the rule cannot be decided with the provided facts.
+        """
+        join_node = self.join_nodes[rule_index]
+        if isinstance(node_results, BitsetResults) and node_results.all_true(join_node.alpha_mask):
+            return True
+
+        all_evaluated = True
+        for alpha_index in join_node.alpha_indexes:
+            result = node_results.get(alpha_index)
+            if result is None:
+                alpha_node = self.alpha_nodes[alpha_index]
+                value = facts.get(alpha_node.variable_id)
+                if value is None:
+                    all_evaluated = False
+                    continue
+                if alpha_index in self.indexed_alpha_indexes and is_indexable_value(value):
+                    self.evaluate_ranges(alpha_node.variable_id, value, node_results)
+                    result = node_results[alpha_index]
+                else:
+                    result = alpha_node.predicate.evaluate_value(value)
+                    node_results[alpha_index] = result
+
+            if not result:
+                return False
+
+        return True if all_evaluated else None
+
+    def evaluate_ranges(self, variable_id: str, value, node_results: Dict[int, bool]):
+        interval_index, range_alpha_indexes = self.interval_indexes[variable_id]
+        satisfied = interval_index.query(value)
+        for position, alpha_index in enumerate(range_alpha_indexes):
+            node_results[alpha_index] = position in satisfied
@@ -0,0 +1,108 @@
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Set, Tuple
+from ..base import Rule
+
+class RuleScheduler:
+    """
+    Keeps rules of a compiled knowledge base in priority buckets keyed by (missing left terms, predicate count).
+
+    Iterating the buckets gives the order of a stable sort of the rule set by that key repeated on every
+    reasoning turn, without sorting: rules that become ready are appended to their bucket and rules that lose
+    a value are moved to the front of theirs. Only rules referencing variables set since the last turn are re-checked.
+    """
+    READY = "ready"
+    PARTIALLY_READY = "partially_ready"
+    BLOCKED = "blocked"
+
+    def __init__(self, rule_set: Tuple[Rule, ...], rules_by_variable: Dict[str, List[int]], track_all: bool = False):
+        self.rule_set = rule_set
+        self.rules_by_variable = rules_by_variable
+        # Values of generic predicates are not tracked by variable, every rule is re-checked then
+        self.track_all = track_all
+        self.keys: List[Tuple[bool, int]] = []
+        self.sequences: List[int] = []
+        self.buckets: Dict[Tuple[bool, int], Deque[Tuple[int, int]]] = {}
+        self.changed: Set[int] = set()
+        self._lowest_sequence = 0
+        self._highest_sequence = len(rule_set) - 1
+
+        for rule_index, rule in enumerate(rule_set):
+            key = self._get_key(rule)
+            self.keys.append(key)
+            self.sequences.append(rule_index)
+            self.buckets.setdefault(key, deque()).append((self.sequences[rule_index], rule_index))
+        self._bucket_keys = sorted(self.buckets)
+
+    @staticmethod
+    def _get_key(rule: Rule) -> Tuple[bool, int]:
+        return (any(predicate.left_term.is_empty() for predicate in rule.predicates), len(rule.predicates))
+
+    def mark_variables(self, variable_ids: Iterable[str]):
+        for variable_id in variable_ids:
+            self.changed.update(self.rules_by_variable.get(variable_id, ()))
+
+    def mark_all(self):
+        self.changed.update(range(len(self.rule_set)))
+
+    def get_state(self, rule_index: int) -> str:
+        self._apply_changes()
+        predicates = self.rule_set[rule_index].predicates
+        missing = sum(1 for predicate in predicates if predicate.left_term.is_empty())
+        if missing == 0:
+            return RuleScheduler.READY
+        return RuleScheduler.BLOCKED if missing == len(predicates) else RuleScheduler.PARTIALLY_READY
+
+    def get_order(self, rule_indexes: Iterable[int] = None) -> List[int]:
+        """
+        Returns rule indexes of the compiled rule set, ready rules first, then by predicate count.
+        With `rule_indexes`, only these rules are ordered, in the same relative order.
+        """
+        self._apply_changes()
+        if rule_indexes is not None:
+            # Buckets hold their entries in sequence order
+            return sorted(rule_indexes, key=lambda rule_index: (self.keys[rule_index], self.sequences[rule_index]))
+        result = []
+        for key in self._bucket_keys:
+            bucket = self.buckets[key]
+            # Drops entries of rules that moved to another bucket
+            current = deque(entry for entry in bucket if self.sequences[entry[1]] == entry[0])
+            self.buckets[key] = current
+            result.extend(rule_index for _, rule_index in current)
+        return result
+
+    def _apply_changes(self):
+        if self.track_all:
+            self.mark_all()
+        if not self.changed:
+            return
+
+        moved_to_ready = []
+        moved_to_missing = []
+        for rule_index in self.changed:
+            key = self._get_key(self.rule_set[rule_index])
+            previous_key = self.keys[rule_index]
+            if key == previous_key:
+                continue
+            moved = (previous_key, self.sequences[rule_index], rule_index, key)
+            (moved_to_missing if key[0] else moved_to_ready).append(moved)
+        self.changed = set()
+
+        # Movers keep their previous relative order: ready rules go after the rules already ready,
+        # rules that lost a value go before the rules that were already missing values
+        for _, _, rule_index, key in sorted(moved_to_ready):
+            self._highest_sequence += 1
+            self._move(rule_index, key, self._highest_sequence, at_front=False)
+        for _, _, rule_index, key in sorted(moved_to_missing, reverse=True):
+            self._lowest_sequence -= 1
+            self._move(rule_index, key, self._lowest_sequence, at_front=True)
+
+    def _move(self, rule_index: int, key: Tuple[bool, int], sequence: int, at_front: bool):
+        self.keys[rule_index] = key
+        self.sequences[rule_index] = sequence
+        if key not in self.buckets:
+            self.buckets[key] = deque()
+            self._bucket_keys = sorted(self.buckets)
+        if at_front:
+            self.buckets[key].appendleft((sequence, rule_index))
+        else:
+            self.buckets[key].append((sequence, rule_index))
@@ -0,0 +1,293 @@
+from math import inf
+from typing import Dict, List, Optional, Tuple
+from ..base import KnowledgeBase, Rule, OperatorType, HitPolicy
+from .deductive_predicate import DeductivePredicate
+from .compiled_knowledge_base import CompiledKnowledgeBase
+from .interval_index import IntervalIndex
+from .rete_network import ReteNetwork
+from .hit_policy import get_hit_policy
+
+LOWER_BOUND_OPERATORS = {OperatorType.GREATER_THAN: False, OperatorType.GREATER_OR_EQUAL: True}
+UPPER_BOUND_OPERATORS = {OperatorType.LESS_THAN: False, OperatorType.LESS_OR_EQUAL: True}
+
+class OptimizationReport:
+    def __init__(self, rule_set: List[Rule]):
+        self.rule_set = rule_set
+        self.initial_rule_count = len(rule_set)
+        self.dead_rules = 0
+        self.duplicate_rules = 0
+        self.subsumed_rules = 0
+        self.merged_rules = 0
+        self.redundant_predicates = 0
+        self.changes: List[str] = []
+
+    def record(self, counter: str, count: int, message: str):
+        setattr(self, counter, getattr(self, counter) + count)
+        self.changes.append(message)
+
+    def display(self) -> str:
+        summary = (
+            f"Rules: {self.initial_rule_count} -> {len(self.rule_set)} (dead: {self.dead_rules}, duplicate: {self.duplicate_rules}, "
+            f"subsumed: {self.subsumed_rules}, merged: {self.merged_rules}), redundant predicates: {self.redundant_predicates}"
+        )
+        return "\n".join([summary] + self.changes)
+
+class _Bound:
+    """
+    Lower or upper bound of a numeric range with the predicate it comes from, None for an unbounded side.
+    """
+    def __init__(self, value: float, inclusive: bool, predicate: Optional[DeductivePredicate]):
+        self.value = value
+        self.inclusive = inclusive
+        self.predicate = predicate
+
+    def get_key(self) -> Tuple[float, bool]:
+        return (self.value, self.inclusive)
+
+def _is_tighter_lower(bound: _Bound, other: _Bound) -> bool:
+    return bound.value > other.value or (bound.value == other.value and not bound.inclusive and other.inclusive)
+
+def _is_tighter_upper(bound: _Bound, other: _Bound) -> bool:
+    return bound.value < other.value or (bound.value == other.value and not bound.inclusive and other.inclusive)
+
+def _is_empty(lower: _Bound, upper: _Bound) -> bool:
+    return lower.value > upper.value or (lower.value == upper.value and not (lower.inclusive and upper.inclusive))
+
+def _is_scalar_range(predicate) -> bool:
+    # BETWEEN skips the type check of scalar comparisons, so it is never mixed with them
+    return IntervalIndex.supports(predicate) and (predicate.operator in LOWER_BOUND_OPERATORS or predicate.operator in UPPER_BOUND_OPERATORS)
+
+def _is_never_true(predicate) -> bool:
+    if not isinstance(predicate, DeductivePredicate):
+        return False
+    # IS_IN with an empty list is not dead, a fact holding an empty list is in it
+    value = predicate.right_term.value
+    return predicate.operator == OperatorType.BETWEEN and IntervalIndex.supports(predicate) and value[0] > value[1]
+
+class _RuleShape:
+    """
+    Rule split into predicates compared by key and one numeric range per variable, as compared by subsumption and merging.
+    """
+    def __init__(self, rule: Rule):
+        self.rule = rule
+        conclusion = rule.conclusion
+        try:
+            self.conclusion_key = (conclusion.get_id(), conclusion.get_variable().name, ReteNetwork.get_value_key(conclusion.get_value()))
+            hash(self.conclusion_key)
+        except (TypeError, AttributeError):
+            self.conclusion_key = ("unshared", id(rule))
+        self.opaque = False
+        self.keys = set()
+        self.ranges: Dict[str, Tuple[_Bound, _Bound]] = {}
+        for predicate in rule.predicates:
+            if not isinstance(predicate, DeductivePredicate):
+                self.opaque = True
+                continue
+            if _is_scalar_range(predicate):
+                lower, upper = self.ranges.get(predicate.left_term.id, (_Bound(-inf, False, None), _Bound(inf, False, None)))
+                value = float(predicate.right_term.value)
+                if predicate.operator in LOWER_BOUND_OPERATORS:
+                    lower = _Bound(value, LOWER_BOUND_OPERATORS[predicate.operator], predicate)
+                else:
+                    upper = _Bound(value, UPPER_BOUND_OPERATORS[predicate.operator], predicate)
+                self.ranges[predicate.left_term.id] = (lower, upper)
+                continue
+            key = ReteNetwork.get_predicate_key(predicate)
+            try:
+                hash(key)
+            except TypeError:
+                self.opaque = True
+                continue
+            self.keys.add(key)
+        # Entries another rule must share to subsume this one
+        self.items = frozenset(self.keys) | frozenset(("range", variable_id) for variable_id in self.ranges)
+
+    def get_range_keys(self, exclude: str = None) -> frozenset:
+        return frozenset((variable_id, lower.get_key(), upper.get_key()) for variable_id, (lower, upper) in self.ranges.items() if variable_id != exclude)
+
+    def subsumes(self, other: '_RuleShape') -> bool:
+        """
+        True when every fact row firing the other rule fires this one: its predicates are a subset and its ranges are wider.
+        """
+        if not self.keys <= other.keys:
+            return False
+        for variable_id, (lower, upper) in self.ranges.items():
+            if variable_id not in other.ranges:
+                return False
+            other_lower, other_upper = other.ranges[variable_id]
+            if _is_tighter_lower(lower, other_lower) or _is_tighter_upper(upper, other_upper):
+                return False
+        return True
+
+def _simplify_rule(rule: Rule, report: OptimizationReport) -> bool:
+    """
+    Removes duplicate and looser range predicates of the rule in place. Returns False when the rule can never fire.
+    """
+    predicates = []
+    seen_keys = set()
+    bounds: Dict[Tuple[str, bool], DeductivePredicate] = {}
+    for predicate in rule.predicates:
+        if _is_never_true(predicate):
+            report.record("dead_rules", 1, f"Removed dead rule {rule.display()}: {predicate.display()} is never true")
+            return False
+        if not isinstance(predicate, DeductivePredicate):
+            predicates.append(predicate)
+            continue
+        key = ReteNetwork.get_predicate_key(predicate)
+        try:
+            hash(key)
+        except TypeError:
+            key = ("unshared", id(predicate))
+        if key in seen_keys:
+            continue
+        seen_keys.add(key)
+        if _is_scalar_range(predicate):
+            is_lower = predicate.operator in LOWER_BOUND_OPERATORS
+            bound_key = (predicate.left_term.id, is_lower)
+            current = bounds.get(bound_key)
+            candidate = _Bound(float(predicate.right_term.value), (LOWER_BOUND_OPERATORS if is_lower else UPPER_BOUND_OPERATORS)[predicate.operator], predicate)
+            if current is None:
+                bounds[bound_key] = predicate
+            else:
+                current_bound = _Bound(float(current.right_term.value), (LOWER_BOUND_OPERATORS if is_lower else UPPER_BOUND_OPERATORS)[current.operator], current)
+                if (_is_tighter_lower if is_lower else _is_tighter_upper)(candidate, current_bound):
+                    bounds[bound_key] = predicate
+        predicates.append(predicate)
+
+    kept_bounds = {id(predicate) for predicate in bounds.values()}
+    simplified = [predicate for predicate in predicates if not _is_scalar_range(predicate) or id(predicate) in kept_bounds]
+    removed = len(rule.predicates) - len(simplified)
+    if removed:
+        report.record("redundant_predicates", removed, f"Removed {removed} redundant predicate(s) from {rule.display()}")
+        rule.predicates = simplified
+
+    shape = _RuleShape(rule)
+    for variable_id, (lower, upper) in shape.ranges.items():
+        if _is_empty(lower, upper):
+            report.record("dead_rules", 1, f"Removed dead rule {rule.display()}: range of {variable_id} is empty")
+            return False
+    return True
+
+def _remove_subsumed(rule_set: List[Rule], report: OptimizationReport) -> List[Rule]:
+    shapes = [_RuleShape(rule) for rule in rule_set]
+    postings: Dict[tuple, Dict[object, List[int]]] = {}
+    unconditional: Dict[tuple, List[int]] = {}
+    for index, shape in enumerate(shapes):
+        if shape.opaque:
+            continue
+        if not shape.items:
+            unconditional.setdefault(shape.conclusion_key, []).append(index)
+        for item in shape.items:
+            postings.setdefault(shape.conclusion_key, {}).setdefault(item, []).append(index)
+
+    result = []
+    for index, shape in enumerate(shapes):
+        subsumer = None
+        if not shape.opaque:
+            counts: Dict[int, int] = {candidate: 0 for candidate in unconditional.get(shape.conclusion_key, ())}
+            conclusion_postings = postings.get(shape.conclusion_key, {})
+            for item in shape.items:
+                for candidate in conclusion_postings.get(item, ()):
+                    counts[candidate] = counts.get(candidate, 0) + 1
+            for candidate, count in counts.items():
+                if candidate == index or count != len(shapes[candidate].items) or not shapes[candidate].subsumes(shape):
+                    continue
+                # Of equivalent rules the first one is kept
+                if shape.subsumes(shapes[candidate]) and candidate > index:
+                    continue
+                subsumer = candidate
+                break
+        if subsumer is None:
+            result.append(shape.rule)
+        elif shape.subsumes(shapes[subsumer]):
+            report.record("duplicate_rules", 1, f"Removed duplicate rule {shape.rule.display()}")
+        else:
+            report.record("subsumed_rules", 1, f"Removed rule {shape.rule.display()} subsumed by {shapes[subsumer].rule.display()}")
+    return result
+
+def _merge_ranges(rule_set: List[Rule], report: OptimizationReport) -> List[Rule]:
+    """
+    Merges rules that differ only in overlapping or adjacent ranges of one variable into a rule with the union of the ranges.
+    """
+    shapes = [_RuleShape(rule) for rule in rule_set]
+    merged_into: Dict[int, Optional[Rule]] = {}
+    for variable_id in dict.fromkeys(variable_id for shape in shapes for variable_id in shape.ranges):
+        groups: Dict[tuple, List[int]] = {}
+        for index, shape in enumerate(shapes):
+            if shape.opaque or variable_id not in shape.ranges or index in merged_into:
+                continue
+            groups.setdefault((shape.conclusion_key, frozenset(shape.keys), shape.get_range_keys(variable_id)), []).append(index)
+
+        for indexes in groups.values():
+            if len(indexes) < 2:
+                continue
+            indexes.sort(key=lambda index: (shapes[index].ranges[variable_id][0].value, not shapes[index].ranges[variable_id][0].inclusive))
+            run = [indexes[0]]
+            lower, upper = shapes[indexes[0]].ranges[variable_id]
+            for index in indexes[1:] + [None]:
+                if index is not None:
+                    next_lower, next_upper = shapes[index].ranges[variable_id]
+                    if upper.value > next_lower.value or (upper.value == next_lower.value and (upper.inclusive or next_lower.inclusive)):
+                        run.append(index)
+                        if _is_tighter_upper(upper, next_upper):
+                            upper = next_upper
+                        continue
+                if len(run) > 1:
+                    first = min(run)
+                    rule = shapes[first].rule
+                    predicates = [predicate for predicate in rule.predicates if not (_is_scalar_range(predicate) and predicate.left_term.id == variable_id)]
+                    predicates.extend(bound.predicate for bound in (lower, upper) if bound.predicate is not None)
+                    merged = Rule(conclusion=rule.conclusion, predicates=predicates)
+                    for member in run:
+                        merged_into[member] = merged if member == first else None
+                    report.record("merged_rules", len(run) - 1, f"Merged {len(run)} rules on ranges of {variable_id} into {merged.display()}")
+                if index is not None:
+                    run = [index]
+                    lower, upper = shapes[index].ranges[variable_id]
+
+    result = []
+    for index, shape in enumerate(shapes):
+        if index not in merged_into:
+            result.append(shape.rule)
+        elif merged_into[index] is not None:
+            result.append(merged_into[index])
+    return result
+
+def optimize_rules(rules: List[Rule]) -> OptimizationReport:
+    """
+    Removes dead, duplicate and subsumed rules and redundant predicates, and merges rules over adjacent numeric ranges.
+
+    Deduction over the optimized rules concludes the same (id, value) pairs as over the given rules for every complete row
+    of facts whose variables have the types their predicates test, numbers for range predicates. Rules decided with fewer
+    facts may ask for fewer missing variables, and type errors of removed predicates are no longer raised, so the
+    optimizer is only applied on request, see "Optimizing rule sets" in the README. Predicates of the given rules are
+    updated in place.
+
+    Args:
+        rules (List[Rule]): Rules to optimize, e.g. the output of pandas_to_rules.
+
+    Returns:
+        OptimizationReport: The optimized rules in `rule_set` and the list of changes.
+    """
+    report = OptimizationReport(list(rules))
+    rule_set = [rule for rule in rules if _simplify_rule(rule, report)]
+    while True:
+        rule_count = len(rule_set)
+        rule_set = _merge_ranges(_remove_subsumed(rule_set, report), report)
+        if len(rule_set) == rule_count:
+            break
+    report.rule_set = rule_set
+    return report
+
+def optimize_knowledge_base(knowledge_base: KnowledgeBase) -> OptimizationReport:
+    """
+    Optimizes the rule set of the knowledge base in place with optimize_rules and drops its cached index.
+    Rules of FIRST and PRIORITY hit policy tables are not optimized, removing or merging them changes which rule is selected.
+    """
+    hit_policy = get_hit_policy(knowledge_base)
+    if hit_policy in (HitPolicy.FIRST, HitPolicy.PRIORITY):
+        raise Exception(f"[Reasoning Engine]: Rules of a knowledge base with the {hit_policy.name} hit policy cannot be optimized.")
+    report = optimize_rules(knowledge_base.rule_set)
+    knowledge_base.rule_set = report.rule_set
+    CompiledKnowledgeBase.invalidate(knowledge_base)
+    return report
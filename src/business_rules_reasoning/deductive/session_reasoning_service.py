@@ -0,0 +1,353 @@
+from collections import deque
+from typing import Dict, List, Optional, Set
+from ..base.reasoning_service import ReasoningService
+from ..base.reasoning_enums import ReasoningState, EvaluationMessage, ReasoningMethod
+from ..base import Variable
+from .compiled_knowledge_base import CompiledKnowledgeBase
+from .backward_chaining import create_chaining_state
+from .reasoning_session import ReasoningSession
+from .hit_policy import get_hit_policy, get_hit_order, is_single_hit, select_hit
+
+class SessionReasoningService(ReasoningService):
+    """
+    Stateless counterpart of DeductiveReasoningService working on ReasoningSession objects.
+    All facts and evaluation results are stored in the session, the knowledge base is never modified.
+    """
+    @staticmethod
+    def start_reasoning(reasoning_process: ReasoningSession) -> ReasoningSession:
+        reasoning_process.compiled = None
+        compiled = SessionReasoningService._compile(reasoning_process)
+        compiled.validate()
+        result = SessionReasoningService.clear_reasoning(reasoning_process)
+        result.state = ReasoningState.STARTED
+        return SessionReasoningService.continue_reasoning(result)
+
+    @staticmethod
+    def continue_reasoning(reasoning_process: ReasoningSession) -> ReasoningSession:
+        SessionReasoningService._compile(reasoning_process).validate()
+
+        if reasoning_process.reasoning_method == ReasoningMethod.DEDUCTION:
+            return SessionReasoningService.deduction(reasoning_process)
+        elif reasoning_process.reasoning_method == ReasoningMethod.HYPOTHESIS_TESTING:
+            return SessionReasoningService.hypothesis_testing(reasoning_process)
+        else:
+            return None
+
+    @staticmethod
+    def set_values(reasoning_process: ReasoningSession, variables) -> ReasoningSession:
+        compiled = SessionReasoningService._compile(reasoning_process)
+        overwritten = [variable_id for variable_id, value in variables.items() if CompiledKnowledgeBase.is_overwritten(reasoning_process.facts.get(variable_id), value)]
+        reasoning_process.facts.update(variables)
+        if overwritten:
+            SessionReasoningService._reopen_rules(reasoning_process, compiled, overwritten)
+        if reasoning_process.agenda is not None:
+            reasoning_process.agenda.update(compiled.get_rete_network().get_rule_indexes(variables.keys()))
+        return reasoning_process
+
+    @staticmethod
+    def reset_reasoning(reasoning_process: ReasoningSession) -> ReasoningSession:
+        reasoning_process.state = ReasoningState.INITIALIZED
+        reasoning_process.reasoned_items = []
+        reasoning_process.evaluation_message = EvaluationMessage.NONE
+        reasoning_process.node_results = reasoning_process.create_results()
+        reasoning_process.rule_results = reasoning_process.create_results()
+        reasoning_process.agenda = None
+        reasoning_process.open_rule_counts = None
+        return reasoning_process
+
+    @staticmethod
+    def clear_reasoning(reasoning_process: ReasoningSession) -> ReasoningSession:
+        result = SessionReasoningService.reset_reasoning(reasoning_process)
+        result.facts = {}
+        return result
+
+    @staticmethod
+    def get_all_missing_variable_ids(reasoning_process: ReasoningSession) -> List[str]:
+        return [variable.id for variable in SessionReasoningService.get_all_missing_variables(reasoning_process)]
+
+    @staticmethod
+    def get_all_missing_variables(reasoning_process: ReasoningSession) -> List[Variable]:
+        """
+        Returns missing variables of rules that are not decided yet and are relevant to the hypothesis in hypothesis testing.
+        With the "conclusion_as_fact" option, hypothesis testing returns only the leaf facts of the cheapest open proof.
+        """
+        if reasoning_process.state == ReasoningState.FINISHED:
+            return []
+        compiled = SessionReasoningService._compile(reasoning_process)
+        if reasoning_process.reasoning_method == ReasoningMethod.HYPOTHESIS_TESTING and SessionReasoningService._is_conclusion_as_fact(reasoning_process):
+            path = compiled.get_backward_chainer().get_proof_path(SessionReasoningService._get_goal_rule_indexes(reasoning_process, compiled), create_chaining_state(reasoning_process, compiled))
+            return [compiled.predicates_by_variable[variable_id][0].right_term for variable_id in path.variable_ids] if path is not None else []
+        open_rule_counts = SessionReasoningService._get_open_rule_counts(reasoning_process, compiled)
+        return [
+            compiled.predicates_by_variable[variable_id][0].right_term
+            for variable_id in compiled.variable_ids
+            if reasoning_process.facts.get(variable_id) is None and open_rule_counts.get(variable_id)
+        ]
+
+    @staticmethod
+    def analyze_variables_frequency(reasoning_process: ReasoningSession) -> List[Variable]:
+        compiled = SessionReasoningService._compile(reasoning_process)
+        result = []
+        for variable in compiled.get_variables():
+            # Copies keep the shared knowledge base untouched
+            frequency_variable = Variable(id=variable.id, name=variable.name)
+            frequency_variable.frequency = compiled.get_frequency(variable.id)
+            result.append(frequency_variable)
+        return result
+
+    @staticmethod
+    def deduction(reasoning_process: ReasoningSession) -> ReasoningSession:
+        compiled = SessionReasoningService._compile(reasoning_process)
+        if is_single_hit(reasoning_process.knowledge_base, reasoning_process.options):
+            return SessionReasoningService._select_hit(reasoning_process, compiled)
+        fired_rules = []
+        try:
+            for rule_index in SessionReasoningService._get_agenda(reasoning_process, compiled):
+                if SessionReasoningService._evaluate_rule(reasoning_process, compiled, rule_index):
+                    conclusion = compiled.rule_set[rule_index].conclusion.get_variable()
+                    if not CompiledKnowledgeBase.is_reasoned(reasoning_process.reasoned_items, conclusion):
+                        reasoning_process.reasoned_items.append(conclusion)
+                        fired_rules.append(rule_index)
+            if SessionReasoningService._is_conclusion_as_fact(reasoning_process):
+                SessionReasoningService._chain_conclusions(reasoning_process, compiled, fired_rules)
+        except Exception as e:
+            reasoning_process.evaluation_message = EvaluationMessage.ERROR
+            reasoning_process.state = ReasoningState.FINISHED
+            reasoning_process.reasoning_error_message = str(e)
+            return reasoning_process
+
+        finished = len(reasoning_process.rule_results) == len(compiled.rule_set)
+        reasoning_process.state = ReasoningState.FINISHED if finished else ReasoningState.STOPPED
+        if finished:
+            reasoning_process.evaluation_message = EvaluationMessage.PASSED if reasoning_process.reasoned_items else EvaluationMessage.FAILED
+        else:
+            reasoning_process.evaluation_message = EvaluationMessage.MISSING_VALUES
+        return reasoning_process
+
+    @staticmethod
+    def hypothesis_testing(reasoning_process: ReasoningSession) -> ReasoningSession:
+        if not reasoning_process.options or "hypothesis" not in reasoning_process.options or not isinstance(reasoning_process.options["hypothesis"], Variable):
+            raise Exception("[Reasoning Engine]: Hypothesis not provided in reasoning process options.")
+        if SessionReasoningService._is_conclusion_as_fact(reasoning_process):
+            return SessionReasoningService.backward_chaining(reasoning_process)
+
+        compiled = SessionReasoningService._compile(reasoning_process)
+        hypothesis = reasoning_process.options["hypothesis"]
+        if is_single_hit(reasoning_process.knowledge_base, reasoning_process.options):
+            return SessionReasoningService._select_hit(reasoning_process, compiled, hypothesis)
+        rule_indexes = SessionReasoningService._get_goal_rule_indexes(reasoning_process, compiled)
+        hypothesis_rules = set(rule_indexes)
+        try:
+            for rule_index in SessionReasoningService._get_agenda(reasoning_process, compiled, hypothesis_rules):
+                if SessionReasoningService._evaluate_rule(reasoning_process, compiled, rule_index):
+                    reasoning_process.reasoned_items = [hypothesis]
+        except Exception as e:
+            reasoning_process.evaluation_message = EvaluationMessage.ERROR
+            reasoning_process.state = ReasoningState.FINISHED
+            reasoning_process.reasoning_error_message = str(e)
+            return reasoning_process
+
+        results = [reasoning_process.rule_results.get(rule_index) for rule_index in rule_indexes]
+        finished = all(result is not None for result in results) or any(result for result in results)
+        reasoning_process.state = ReasoningState.FINISHED if finished else ReasoningState.STOPPED
+        if finished:
+            reasoning_process.evaluation_message = EvaluationMessage.PASSED if reasoning_process.reasoned_items else EvaluationMessage.FAILED
+        else:
+            reasoning_process.evaluation_message = EvaluationMessage.MISSING_VALUES
+        return reasoning_process
+
+    @staticmethod
+    def backward_chaining(reasoning_process: ReasoningSession) -> ReasoningSession:
+        """
+        Hypothesis testing for knowledge bases whose conclusions are tested by predicates of other rules, used when the
+        "conclusion_as_fact" option is set. Only rules reachable from the hypothesis are evaluated, see BackwardChainer.
+        """
+        compiled = SessionReasoningService._compile(reasoning_process)
+        hypothesis = reasoning_process.options["hypothesis"]
+        try:
+            result = compiled.get_backward_chainer().prove(compiled.get_conclusion_rule_indexes(hypothesis.id, hypothesis.value), create_chaining_state(reasoning_process, compiled))
+        except Exception as e:
+            reasoning_process.evaluation_message = EvaluationMessage.ERROR
+            reasoning_process.state = ReasoningState.FINISHED
+            reasoning_process.reasoning_error_message = str(e)
+            return reasoning_process
+
+        if result:
+            reasoning_process.reasoned_items = [hypothesis]
+        reasoning_process.state = ReasoningState.FINISHED if result is not None else ReasoningState.STOPPED
+        if result is not None:
+            reasoning_process.evaluation_message = EvaluationMessage.PASSED if result else EvaluationMessage.FAILED
+        else:
+            reasoning_process.evaluation_message = EvaluationMessage.MISSING_VALUES
+        return reasoning_process
+
+    @staticmethod
+    def _compile(reasoning_process: ReasoningSession) -> CompiledKnowledgeBase:
+        """
+        Returns the compiled knowledge base kept by the session. Checking the whole rule set for changes on every call would
+        cost each row of a batch a pass over all predicates, and the session results are only valid for the index they
+        were computed with anyway.
+        """
+        compiled = reasoning_process.compiled
+        if compiled is None or compiled.knowledge_base is not reasoning_process.knowledge_base:
+            compiled = CompiledKnowledgeBase.compile(reasoning_process.knowledge_base)
+            if compiled.generic_predicates:
+                raise Exception("[Reasoning Engine]: Reasoning sessions support only deductive predicates.")
+            reasoning_process.compiled = compiled
+        return compiled
+
+    @staticmethod
+    def _select_hit(reasoning_process: ReasoningSession, compiled: CompiledKnowledgeBase, hypothesis: Variable = None) -> ReasoningSession:
+        """
+        Session counterpart of DeductiveReasoningService._select_hit, rules whose facts did not change are not evaluated again.
+        """
+        hit_policy = get_hit_policy(reasoning_process.knowledge_base)
+        rule_results = reasoning_process.rule_results
+        agenda = SessionReasoningService._get_agenda(reasoning_process, compiled)
+
+        def evaluate_rule(rule_index: int) -> Optional[bool]:
+            result = rule_results.get(rule_index)
+            if result is None and rule_index in reasoning_process.agenda:
+                result = SessionReasoningService._evaluate_rule(reasoning_process, compiled, rule_index)
+            return result
+
+        def get_default_order() -> List[int]:
+            # A rule fired before new facts were set is still selected, and a rule left undecided by earlier facts
+            # keeps the selection open even though it is no longer on the agenda
+            on_agenda = set(agenda)
+            fired = [rule_index for rule_index in rule_results if rule_results.get(rule_index)]
+            undecided = [rule_index for rule_index in range(len(compiled.rule_set)) if rule_index not in rule_results and rule_index not in on_agenda]
+            return fired + agenda + undecided
+
+        try:
+            rule_order = get_hit_order(reasoning_process.knowledge_base, compiled, hit_policy, get_default_order)
+            rule_index, finished = select_hit(rule_order, hit_policy, evaluate_rule)
+        except Exception as e:
+            reasoning_process.evaluation_message = EvaluationMessage.ERROR
+            reasoning_process.state = ReasoningState.FINISHED
+            reasoning_process.reasoning_error_message = str(e)
+            return reasoning_process
+
+        reasoning_process.reasoned_items = []
+        if rule_index is not None:
+            conclusion = compiled.rule_set[rule_index].conclusion
+            if hypothesis is None:
+                reasoning_process.reasoned_items = [conclusion.get_variable()]
+            elif conclusion.get_id() == hypothesis.id and conclusion.get_value() == hypothesis.value:
+                reasoning_process.reasoned_items = [hypothesis]
+        reasoning_process.state = ReasoningState.FINISHED if finished else ReasoningState.STOPPED
+        if finished:
+            reasoning_process.evaluation_message = EvaluationMessage.PASSED if reasoning_process.reasoned_items else EvaluationMessage.FAILED
+        else:
+            reasoning_process.evaluation_message = EvaluationMessage.MISSING_VALUES
+        return reasoning_process
+
+    @staticmethod
+    def _reopen_rules(reasoning_process: ReasoningSession, compiled: CompiledKnowledgeBase, variable_ids: List[str]):
+        """
+        Session counterpart of DeductiveReasoningService._reopen_rules, results of the alpha nodes testing the facts and of
+        the rules joining them are dropped.
+        """
+        network = compiled.get_rete_network()
+        for variable_id in variable_ids:
+            for alpha_index in network.alpha_indexes_by_variable.get(variable_id, ()):
+                reasoning_process.node_results.pop(alpha_index, None)
+        for rule_index in network.get_rule_indexes(variable_ids):
+            reasoning_process.rule_results.pop(rule_index, None)
+        # Re-opened rules are counted again when missing variables are requested
+        reasoning_process.open_rule_counts = None
+        rule_results = reasoning_process.rule_results
+        reasoning_process.reasoned_items = [
+            item for item in reasoning_process.reasoned_items
+            if any(rule_results.get(rule_index) for rule_index in compiled.get_conclusion_rule_indexes(item.id, item.value))
+        ]
+
+    @staticmethod
+    def _is_conclusion_as_fact(reasoning_process: ReasoningSession) -> bool:
+        return bool(reasoning_process.options and reasoning_process.options.get("conclusion_as_fact"))
+
+    @staticmethod
+    def _chain_conclusions(reasoning_process: ReasoningSession, compiled: CompiledKnowledgeBase, fired_rules: List[int]):
+        """
+        Session counterpart of DeductiveReasoningService._chain_conclusions, conclusions are asserted into the session facts.
+        """
+        network = compiled.get_rete_network()
+        agenda = deque(fired_rules)
+        while agenda:
+            conclusion = compiled.rule_set[agenda.popleft()].conclusion
+            variable_id = conclusion.get_id()
+            if reasoning_process.facts.get(variable_id) is not None:
+                continue
+            reasoning_process.facts[variable_id] = conclusion.get_value()
+            for rule_index in dict.fromkeys(network.get_rule_indexes((variable_id,))):
+                if rule_index in reasoning_process.rule_results:
+                    continue
+                if SessionReasoningService._evaluate_rule(reasoning_process, compiled, rule_index):
+                    variable = compiled.rule_set[rule_index].conclusion.get_variable()
+                    if not CompiledKnowledgeBase.is_reasoned(reasoning_process.reasoned_items, variable):
+                        reasoning_process.reasoned_items.append(variable)
+                        agenda.append(rule_index)
+
+    @staticmethod
+    def _get_goal_rule_indexes(reasoning_process: ReasoningSession, compiled: CompiledKnowledgeBase) -> List[int]:
+        """
+        Returns indexes of the rules concluding the hypothesis in hypothesis testing, every rule index otherwise.
+        A hit policy other than COLLECT needs every rule to select the conclusion, also in hypothesis testing.
+        """
+        if reasoning_process.reasoning_method != ReasoningMethod.HYPOTHESIS_TESTING or not reasoning_process.options or not isinstance(reasoning_process.options.get("hypothesis"), Variable):
+            return list(range(len(compiled.rule_set)))
+        if is_single_hit(reasoning_process.knowledge_base, reasoning_process.options):
+            return list(range(len(compiled.rule_set)))
+        hypothesis = reasoning_process.options["hypothesis"]
+        return compiled.get_conclusion_rule_indexes(hypothesis.id, hypothesis.value)
+
+    @staticmethod
+    def _get_open_rule_counts(reasoning_process: ReasoningSession, compiled: CompiledKnowledgeBase) -> Dict[str, int]:
+        """
+        Counts undecided goal rules per variable once, _evaluate_rule keeps the counts up to date as rules are decided.
+        """
+        if reasoning_process.open_rule_counts is None:
+            open_rule_counts = {}
+            for rule_index in SessionReasoningService._get_goal_rule_indexes(reasoning_process, compiled):
+                if rule_index in reasoning_process.rule_results:
+                    continue
+                for variable_id in compiled.get_rete_network().join_nodes[rule_index].variable_ids:
+                    open_rule_counts[variable_id] = open_rule_counts.get(variable_id, 0) + 1
+            reasoning_process.open_rule_counts = open_rule_counts
+        return reasoning_process.open_rule_counts
+
+    @staticmethod
+    def _get_agenda(reasoning_process: ReasoningSession, compiled: CompiledKnowledgeBase, rule_filter: Set[int] = None) -> List[int]:
+        """
+        Returns undecided rules activated by facts set since the last evaluation, rules missing facts last and then by
+        predicate count like DeductiveReasoningService.continue_reasoning. Ties keep rule set order rather than the order
+        rules became ready in. Rules whose facts did not change cannot change their state.
+        """
+        if reasoning_process.agenda is None:
+            reasoning_process.agenda = set(rule_filter) if rule_filter is not None else set(range(len(compiled.rule_set)))
+        facts = reasoning_process.facts
+        rule_results = reasoning_process.rule_results
+        reasoning_process.agenda = {
+            rule_index for rule_index in reasoning_process.agenda
+            if rule_index not in rule_results and (rule_filter is None or rule_index in rule_filter)
+        }
+        return sorted(
+            reasoning_process.agenda,
+            key=lambda rule_index: (
+                any(facts.get(predicate.left_term.id) is None for predicate in compiled.rule_set[rule_index].predicates),
+                len(compiled.rule_set[rule_index].predicates),
+                rule_index
+            )
+        )
+
+    @staticmethod
+    def _evaluate_rule(reasoning_process: ReasoningSession, compiled: CompiledKnowledgeBase, rule_index: int) -> Optional[bool]:
+        result = compiled.get_rete_network().evaluate_join(reasoning_process.facts, reasoning_process.node_results, rule_index)
+        if result is not None:
+            reasoning_process.rule_results[rule_index] = result
+            # Only goal rules are evaluated, so a decided rule is always counted
+            if reasoning_process.open_rule_counts is not None:
+                for variable_id in compiled.get_rete_network().join_nodes[rule_index].variable_ids:
+                    reasoning_process.open_rule_counts[variable_id] -= 1
+        reasoning_process.agenda.discard(rule_index)
+        return result
@@ -0,0 +1,270 @@
+import numpy as np
+from itertools import islice
+from typing import Any, Dict, List, Tuple
+from ..base import KnowledgeBase, Variable, OperatorType
+from ..base.reasoning_enums import EvaluationMessage, ReasoningMethod
+from .compiled_knowledge_base import CompiledKnowledgeBase
+from .deductive_predicate import DeductivePredicate
+from .reasoning_session import ReasoningSession
+from .batch_evaluation import BatchEvaluationResult, iterate_fact_rows, evaluate_fact_row, normalize_fact_value
+
+MISSING = 0
+NUMBER = 1
+BOOLEAN = 2
+STRING = 3
+OTHER = 4
+
+_KIND_BY_TYPE = {"number": NUMBER, "boolean": BOOLEAN, "string": STRING}
+
+class VectorizedColumn:
+    """
+    Columnar view of one variable over a chunk of fact rows.
+
+    `kinds` holds the value kind of every row, `numbers` the float value of numbers and booleans
+    (the way BaseType compares them) and `strings` the lower-cased value of strings.
+    """
+    def __init__(self, kinds: np.ndarray, numbers: np.ndarray, strings: np.ndarray):
+        self.kinds = kinds
+        self.numbers = numbers
+        self.strings = strings
+
+    @staticmethod
+    def from_values(values: List[Any]) -> 'VectorizedColumn':
+        kinds = np.empty(len(values), dtype=np.int8)
+        numbers = np.zeros(len(values), dtype=np.float64)
+        strings = []
+        for index, value in enumerate(values):
+            if value is None:
+                kinds[index] = MISSING
+                strings.append("")
+            elif isinstance(value, bool):
+                kinds[index] = BOOLEAN
+                numbers[index] = float(value)
+                strings.append("")
+            elif isinstance(value, (int, float)):
+                kinds[index] = NUMBER
+                numbers[index] = float(value)
+                strings.append("")
+            elif isinstance(value, str) and not value.startswith(Variable._function_escape):
+                kinds[index] = STRING
+                strings.append(value.lower())
+            else:
+                kinds[index] = OTHER
+                strings.append("")
+        return VectorizedColumn(kinds, numbers, np.array(strings, dtype=str))
+
+    @staticmethod
+    def from_series(series) -> 'VectorizedColumn':
+        values = series.to_numpy()
+        if values.dtype == np.bool_:
+            return VectorizedColumn(np.full(len(values), BOOLEAN, dtype=np.int8), values.astype(np.float64), np.full(len(values), "", dtype=str))
+        if np.issubdtype(values.dtype, np.integer) or np.issubdtype(values.dtype, np.floating):
+            numbers = values.astype(np.float64)
+            kinds = np.where(np.isnan(numbers), MISSING, NUMBER).astype(np.int8)
+            return VectorizedColumn(kinds, np.nan_to_num(numbers), np.full(len(values), "", dtype=str))
+        return VectorizedColumn.from_values([normalize_fact_value(value) for value in values])
+
+class VectorizedEvaluator:
+    """
+    NumPy backend for batch scoring with the same results as DeductiveReasoningService.evaluate_batch.
+
+    Every predicate is evaluated for a whole chunk of rows at once and the truth masks are combined
+    per rule with logical AND. Rows that would raise an evaluation error or hold values the columnar
+    representation does not cover (lists, functions, unknown types) are evaluated by the scalar engine.
+    """
+    def __init__(self, knowledge_base: KnowledgeBase):
+        self.knowledge_base = knowledge_base
+        self.compiled = CompiledKnowledgeBase.compile(knowledge_base)
+        self.compiled.validate()
+        if self.compiled.generic_predicates:
+            raise Exception("[Reasoning Engine]: Vectorized evaluation supports only deductive predicates.")
+        # Rules that fire have all facts provided, so continue_reasoning orders them by predicate count only
+        self.firing_order = sorted(range(len(self.compiled.rule_set)), key=lambda rule_index: len(self.compiled.rule_set[rule_index].predicates))
+        self._right_terms = {}
+
+    def evaluate(self, facts, reasoning_method: ReasoningMethod = ReasoningMethod.DEDUCTION, options=None, chunk_size: int = 4096) -> List[BatchEvaluationResult]:
+        if reasoning_method == ReasoningMethod.HYPOTHESIS_TESTING:
+            if not options or "hypothesis" not in options or not isinstance(options["hypothesis"], Variable):
+                raise Exception("[Reasoning Engine]: Hypothesis not provided in reasoning process options.")
+        elif reasoning_method != ReasoningMethod.DEDUCTION:
+            raise Exception(f"[Reasoning Engine]: Reasoning method {reasoning_method.name} is not supported by vectorized evaluation.")
+
+        session = ReasoningSession(reasoning_method, self.knowledge_base, options)
+        results = []
+        if hasattr(facts, "itertuples") and hasattr(facts, "columns"):
+            for start in range(0, len(facts), chunk_size):
+                chunk = facts.iloc[start:start + chunk_size]
+                columns = {variable_id: VectorizedColumn.from_series(chunk[variable_id]) for variable_id in self.compiled.variable_ids if variable_id in chunk.columns}
+                results.extend(self._evaluate_chunk(columns, len(chunk), lambda index: next(iterate_fact_rows(chunk.iloc[index:index + 1])), session))
+            return results
+
+        rows_iterator = iterate_fact_rows(facts)
+        while True:
+            rows = list(islice(rows_iterator, chunk_size))
+            if not rows:
+                return results
+            columns = {variable_id: VectorizedColumn.from_values([row.get(variable_id) for row in rows]) for variable_id in self.compiled.variable_ids}
+            results.extend(self._evaluate_chunk(columns, len(rows), lambda index: rows[index], session))
+
+    def predicate_mask(self, predicate: DeductivePredicate, column: VectorizedColumn) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the truth mask and the error mask of a predicate over a column. Rows with a missing value are False in both.
+        """
+        present = column.kinds != MISSING
+        right_type, right_value = self._get_right_term(predicate)
+        operator = predicate.operator
+
+        if right_type is None:
+            return np.zeros(len(present), dtype=bool), present
+
+        if right_type != "list":
+            matching = column.kinds == _KIND_BY_TYPE[right_type]
+            error = present & ~matching
+            if operator in (OperatorType.BETWEEN, OperatorType.NOT_BETWEEN):
+                return np.zeros(len(present), dtype=bool), present
+            if right_type == "string":
+                equal = column.strings == right_value
+                if operator in (OperatorType.EQUAL, OperatorType.SUBSET):
+                    truth = equal
+                elif operator in (OperatorType.NOT_EQUAL, OperatorType.NOT_SUBSET):
+                    truth = ~equal
+                elif operator in (OperatorType.IS_IN, OperatorType.NOT_IN):
+                    # BaseType containment of strings is a case-insensitive substring test
+                    contained = np.array([value in right_value for value in column.strings.tolist()], dtype=bool)
+                    truth = contained if operator == OperatorType.IS_IN else ~contained
+                else:
+                    truth = np.zeros(len(present), dtype=bool)
+            else:
+                numbers = column.numbers
+                truth = {
+                    OperatorType.EQUAL: lambda: numbers == right_value,
+                    OperatorType.SUBSET: lambda: numbers == right_value,
+                    OperatorType.IS_IN: lambda: numbers == right_value,
+                    OperatorType.NOT_EQUAL: lambda: numbers != right_value,
+                    OperatorType.NOT_SUBSET: lambda: numbers != right_value,
+                    OperatorType.NOT_IN: lambda: numbers != right_value,
+                    OperatorType.GREATER_THAN: lambda: numbers > right_value,
+                    OperatorType.LESS_THAN: lambda: numbers < right_value,
+                    OperatorType.GREATER_OR_EQUAL: lambda: ~(numbers < right_value),
+                    OperatorType.LESS_OR_EQUAL: lambda: ~(numbers > right_value),
+                }[operator]()
+            return truth & matching & present, error
+
+        numeric = (column.kinds == NUMBER) | (column.kinds == BOOLEAN)
+        numbers, strings, range_bounds = right_value
+        if operator in (OperatorType.BETWEEN, OperatorType.NOT_BETWEEN):
+            if range_bounds is None:
+                return np.zeros(len(present), dtype=bool), present
+            if range_bounds is False:
+                between = np.zeros(len(present), dtype=bool)
+            else:
+                between = numeric & ~(column.numbers < range_bounds[0]) & ~(column.numbers > range_bounds[1])
+            truth = between if operator == OperatorType.BETWEEN else ~between
+        elif operator in (OperatorType.IS_IN, OperatorType.NOT_IN, OperatorType.SUBSET, OperatorType.NOT_SUBSET):
+            member = (numeric & np.isin(column.numbers, numbers)) | ((column.kinds == STRING) & np.isin(column.strings, strings))
+            truth = member if operator in (OperatorType.IS_IN, OperatorType.SUBSET) else ~member
+        elif operator == OperatorType.NOT_EQUAL:
+            truth = np.ones(len(present), dtype=bool)
+        else:
+            truth = np.zeros(len(present), dtype=bool)
+        return truth & present, np.zeros(len(present), dtype=bool)
+
+    def _get_right_term(self, predicate: DeductivePredicate):
+        key = id(predicate)
+        if key not in self._right_terms:
+            self._right_terms[key] = self._compile_right_term(predicate)
+        return self._right_terms[key]
+
+    @staticmethod
+    def _compile_right_term(predicate: DeductivePredicate):
+        try:
+            right_value = predicate.right_term.get_value()
+            right_type = right_value.get_type()
+        except Exception:
+            return None, None
+        if right_type == "unknown":
+            return None, None
+        if right_type == "list":
+            numbers = np.array([float(item.value) for item in right_value.values if item.is_number_or_boolean()], dtype=np.float64)
+            strings = np.array([item.value.lower() for item in right_value.values if item.is_string()], dtype=str)
+            if len(right_value.values) != 2:
+                range_bounds = None
+            elif all(item.is_number() for item in right_value.values):
+                range_bounds = (float(right_value.values[0].value), float(right_value.values[1].value))
+            else:
+                range_bounds = False
+            return right_type, (numbers, strings, range_bounds)
+        if right_type == "string":
+            return right_type, right_value.value.lower()
+        return right_type, float(right_value.value)
+
+    def _evaluate_chunk(self, columns: Dict[str, VectorizedColumn], size: int, get_row, session: ReasoningSession) -> List[BatchEvaluationResult]:
+        empty = VectorizedColumn(np.zeros(size, dtype=np.int8), np.zeros(size, dtype=np.float64), np.full(size, "", dtype=str))
+        fallback = np.zeros(size, dtype=bool)
+        missing = {}
+        for variable_id in self.compiled.variable_ids:
+            column = columns.get(variable_id, empty)
+            fallback |= column.kinds == OTHER
+            missing[variable_id] = column.kinds == MISSING
+
+        hypothesis = session.options["hypothesis"] if session.reasoning_method == ReasoningMethod.HYPOTHESIS_TESTING else None
+        rule_indexes = [
+            rule_index for rule_index in self.firing_order
+            if hypothesis is None or (self.compiled.rule_set[rule_index].conclusion.get_id() == hypothesis.id and self.compiled.rule_set[rule_index].conclusion.get_value() == hypothesis.value)
+        ]
+
+        network = self.compiled.get_rete_network()
+        # Masks of shared alpha nodes are computed once per chunk
+        masks = {}
+        evaluated_count = np.zeros(size, dtype=np.int64)
+        any_fired = np.zeros(size, dtype=bool)
+        # Rows in which a rule testing the variable is undecided
+        open_variables = {variable_id: np.zeros(size, dtype=bool) for variable_id in self.compiled.variable_ids}
+        fired_rules = []
+        for rule_index in rule_indexes:
+            rule = self.compiled.rule_set[rule_index]
+            fired = np.ones(size, dtype=bool)
+            dead = np.zeros(size, dtype=bool)
+            error_free_prefix = np.ones(size, dtype=bool)
+            for predicate, alpha_index in zip(rule.predicates, network.join_nodes[rule_index].alpha_indexes):
+                column = columns.get(predicate.left_term.id, empty)
+                present = column.kinds != MISSING
+                if alpha_index not in masks:
+                    masks[alpha_index] = self.predicate_mask(predicate, column)
+                truth, error = masks[alpha_index]
+                # Errors raise only when every earlier predicate of the rule was missing or true
+                fallback |= error_free_prefix & error
+                error_free_prefix &= ~present | (truth & ~error)
+                fired &= truth
+                dead |= present & ~truth & ~error
+            evaluated_count += fired | dead
+            for variable_id in network.join_nodes[rule_index].variable_ids:
+                open_variables[variable_id] |= ~(fired | dead)
+            any_fired |= fired
+            fired_rules.append((rule, fired))
+
+        if hypothesis is None:
+            finished = evaluated_count == len(rule_indexes)
+        else:
+            finished = (evaluated_count == len(rule_indexes)) | any_fired
+
+        reasoned_items = [[] for _ in range(size)]
+        for rule, fired in fired_rules:
+            variable = hypothesis if hypothesis is not None else rule.conclusion.get_variable()
+            for row_index in np.flatnonzero(fired & ~fallback):
+                items = reasoned_items[row_index]
+                if not CompiledKnowledgeBase.is_reasoned(items, variable):
+                    items.append(variable)
+
+        results = []
+        for row_index in range(size):
+            if fallback[row_index]:
+                results.append(evaluate_fact_row(session, get_row(row_index)))
+            elif finished[row_index]:
+                items = reasoned_items[row_index]
+                results.append(BatchEvaluationResult(items, EvaluationMessage.PASSED if items else EvaluationMessage.FAILED, []))
+            else:
+                # Only variables of undecided rules, in hypothesis testing only rules concluding the hypothesis are evaluated
+                missing_variable_ids = [variable_id for variable_id in self.compiled.variable_ids if missing[variable_id][row_index] and open_variables[variable_id][row_index]]
+                results.append(BatchEvaluationResult(reasoned_items[row_index], EvaluationMessage.MISSING_VALUES, missing_variable_ids))
+        return results
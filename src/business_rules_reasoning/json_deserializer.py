@@ -2,7 +2,7 @@ import json
 from .base.reasoning_process import ReasoningProcess
 from .base.knowledge_base import KnowledgeBase
 from .base.rule import Rule
-from .deductive import DeductivePredicate, DeductiveConclusion
+from .deductive import DeductivePredicate, DeductiveConclusion, ReasoningSession
 from .base.variable import Variable
 from .base.reasoning_enums import ReasoningState, EvaluationMessage, ReasoningMethod, ReasoningType
 from .base import OperatorType
@@ -10,9 +10,13 @@ from .base import OperatorType
 def deserialize_reasoning_process(data: str) -> ReasoningProcess:
     data_dict = json.loads(data)
     knowledge_base = deserialize_knowledge_base(json.dumps(data_dict["knowledge_base"]))
-    reasoning_process = ReasoningProcess(reasoning_method=ReasoningMethod[data_dict["reasoning_method"]], knowledge_base=knowledge_base)
+    if "facts" in data_dict:
+        reasoning_process = ReasoningSession(reasoning_method=ReasoningMethod[data_dict["reasoning_method"]], knowledge_base=knowledge_base)
+        reasoning_process.facts = data_dict["facts"]
+    else:
+        reasoning_process = ReasoningProcess(reasoning_method=ReasoningMethod[data_dict["reasoning_method"]], knowledge_base=knowledge_base)
     reasoning_process.state = ReasoningState[data_dict["state"]]
-    reasoning_process.reasoned_items = data_dict["reasoned_items"]
+    reasoning_process.reasoned_items = [deserialize_variable(json.dumps(item)) for item in data_dict["reasoned_items"]]
     reasoning_process.evaluation_message = EvaluationMessage[data_dict["evaluation_message"]]
     reasoning_process.options = data_dict["options"]
     reasoning_process.reasoning_error_message = data_dict["reasoning_error_message"]
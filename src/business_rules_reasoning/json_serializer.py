@@ -3,14 +3,25 @@ import json
 from .base.reasoning_process import ReasoningProcess
 from .base.knowledge_base import KnowledgeBase
 from .base.rule import Rule
-from .deductive import DeductivePredicate, DeductiveConclusion
+from .deductive import DeductivePredicate, DeductiveConclusion, ReasoningSession
 from .base.variable import Variable
 from .base.reasoning_enums import ReasoningState, EvaluationMessage, ReasoningMethod
 from .base import OperatorType
 
 class ReasoningProcessEncoder(json.JSONEncoder):
     def default(self, obj):
-        if isinstance(obj, ReasoningProcess):
+        if isinstance(obj, ReasoningSession):
+            return {
+                "reasoning_method": obj.reasoning_method.name,
+                "knowledge_base": obj.knowledge_base,
+                "state": obj.state.name,
+                "reasoned_items": obj.reasoned_items,
+                "evaluation_message": obj.evaluation_message.name,
+                "options": obj.options,
+                "reasoning_error_message": obj.reasoning_error_message,
+                "facts": obj.facts
+            }
+        elif isinstance(obj, ReasoningProcess):
             return {
                 "reasoning_method": obj.reasoning_method.name,
                 "knowledge_base": obj.knowledge_base,
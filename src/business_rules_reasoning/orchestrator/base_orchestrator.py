@@ -8,7 +8,7 @@ from .reasoning_action import ReasoningAction
 from ..base import KnowledgeBase, ReasoningState, ReasoningProcess, ReasoningService, ReasoningType, EvaluationMessage, Variable
 from ..json_deserializer import deserialize_knowledge_base, deserialize_reasoning_process
 from ..json_serializer import serialize_reasoning_process
-from ..deductive import DeductiveReasoningService
+from ..deductive import DeductiveReasoningService, ReasoningSession, SessionReasoningService, CompiledKnowledgeBase
 from .inference_logger import InferenceLogger
 
 class OrchestratorStatus(Enum):
@@ -25,11 +25,12 @@ class VariablesFetchingMode(Enum):
     ALL_POSSIBLE = 'ALL_POSSIBLE'
 
 class OrchestratorOptions:
-    def __init__(self, variables_fetching: VariablesFetchingMode = VariablesFetchingMode.ALL_POSSIBLE, conclusion_as_fact: bool = False, pass_conclusions_as_arguments: bool = True, pass_facts_as_arguments: bool = True):
+    def __init__(self, variables_fetching: VariablesFetchingMode = VariablesFetchingMode.ALL_POSSIBLE, conclusion_as_fact: bool = False, pass_conclusions_as_arguments: bool = True, pass_facts_as_arguments: bool = True, use_reasoning_sessions: bool = False):
         self.variables_fetching = variables_fetching
         self.conclusion_as_fact = conclusion_as_fact
         self.pass_conclusions_as_arguments = pass_conclusions_as_arguments
         self.pass_facts_as_arguments = pass_facts_as_arguments
+        self.use_reasoning_sessions = use_reasoning_sessions
 
 class BaseOrchestrator(ABC):
     def __init__(self, knowledge_base_retriever: Callable, inference_state_retriever: Callable, options: OrchestratorOptions, inference_session_id: str = None, actions: List[ReasoningAction] = None, variable_sources: List[VariableSource] = None):
@@ -111,6 +112,8 @@ class BaseOrchestrator(ABC):
 
     def get_reasoning_service(self) -> ReasoningService:
         if self.reasoning_process.knowledge_base.reasoning_type == ReasoningType.CRISP:
+            if isinstance(self.reasoning_process, ReasoningSession):
+                return SessionReasoningService
             return DeductiveReasoningService
         elif self.reasoning_process.knowledge_base.reasoning_type == ReasoningType.FUZZY:
             raise NotImplementedError("Fuzzy reasoning is not implemented yet")
@@ -128,6 +131,11 @@ class BaseOrchestrator(ABC):
         reasoning_service = self.get_reasoning_service()
         self._log_inference(f"[Engine]: Status: {self.reasoning_process.state} Retrieving missing variables.")
         return reasoning_service.get_all_missing_variables(self.reasoning_process).copy()
+
+    def _get_next_reasoning_variable(self, exclude: List[str] = ()) -> Variable:
+        next_variable = CompiledKnowledgeBase.compile(self.reasoning_process.knowledge_base).get_question_planner().get_next_variable(self.reasoning_process, exclude)
+        self._log_inference(f"[Engine]: Status: {self.reasoning_process.state} Planned next variable: {next_variable.id if next_variable is not None else None}.")
+        return next_variable
     
      # TODO: Update the values from further queries
     def _continue_reasoning(self):
@@ -162,6 +170,7 @@ class BaseOrchestrator(ABC):
                 "variables_fetching": self.options.variables_fetching.name,
                 "conclusion_as_fact": self.options.conclusion_as_fact,
                 "pass_conclusions_as_arguments": self.options.pass_conclusions_as_arguments,
-                "pass_facts_as_arguments": self.options.pass_facts_as_arguments
+                "pass_facts_as_arguments": self.options.pass_facts_as_arguments,
+                "use_reasoning_sessions": self.options.use_reasoning_sessions
             }
         } if return_full_context else response
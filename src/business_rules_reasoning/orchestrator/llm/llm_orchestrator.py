@@ -3,6 +3,7 @@ import json
 
 from ...utils import retry, parse_variable_value, extract_json_from_response
 from ...base import ReasoningProcess, ReasoningMethod, Variable
+from ...deductive import ReasoningSession, CompiledKnowledgeBase
 from ..reasoning_action import ReasoningAction
 from ..variable_source import VariableSource
 from ..base_orchestrator import BaseOrchestrator, OrchestratorStatus, OrchestratorOptions, VariablesFetchingMode
@@ -24,6 +25,8 @@ class LLMOrchestrator(BaseOrchestrator):
             
             knowledge_base_id, reasoning_method = retry(lambda: self._fetch_inference_instructions(text), retries=self.retry_policy, validation_func=validate_output)
             reasoning_options = {}
+            if self.options.conclusion_as_fact:
+                reasoning_options["conclusion_as_fact"] = True
             if reasoning_method == ReasoningMethod.HYPOTHESIS_TESTING:
                 self._log_inference(f"[Orchestrator]: Hypothesis testing method was selected. Prompting for hypothesis parameters...")
                 try:
@@ -45,11 +48,23 @@ class LLMOrchestrator(BaseOrchestrator):
             self._start_reasoning_process()
         
         if self.status == OrchestratorStatus.ENGINE_WAITING_FOR_VARIABLES:
+            step_by_step = self.options.variables_fetching == VariablesFetchingMode.STEP_BY_STEP
             missing_variables = self._get_missing_reasoning_variables()
-            iterations = len(missing_variables) if self.options.variables_fetching == VariablesFetchingMode.STEP_BY_STEP else 1
+            iterations = len(missing_variables) if step_by_step else 1
+            asked_variable_ids = []
 
             for i in range(iterations):
-                missing_variables_subset = [missing_variables[i]] if iterations > 1 else missing_variables
+                if step_by_step:
+                    # Every answer can decide other rules, the next question is planned again
+                    if self.status not in [OrchestratorStatus.ENGINE_WAITING_FOR_VARIABLES, OrchestratorStatus.FACT_QUESTIONING_MODE]:
+                        break
+                    next_variable = self._get_next_reasoning_variable(asked_variable_ids)
+                    if next_variable is None:
+                        break
+                    asked_variable_ids.append(next_variable.id)
+                    missing_variables_subset = [next_variable]
+                else:
+                    missing_variables_subset = missing_variables
                 missing_variable_ids = [var.id for var in missing_variables_subset]
 
                 variables_dict = retry(
@@ -66,25 +81,25 @@ class LLMOrchestrator(BaseOrchestrator):
                     self._set_orchestrator_status(OrchestratorStatus.FACT_QUESTIONING_MODE)
 
         if self.status == OrchestratorStatus.FACT_QUESTIONING_MODE:
-            response = self._get_missing_reasoning_variables()
-            if len(response) == 0:
+            next_variable = self._get_next_reasoning_variable()
+            if next_variable is None:
                 self._continue_reasoning()
-            
-            missing_variables = [response[0]]
-            missing_variable_ids = [var.id for var in missing_variables]
+            else:
+                missing_variables = [next_variable]
+                missing_variable_ids = [var.id for var in missing_variables]
 
-            variables_dict = retry(
-                lambda: self._fetch_variables(text, missing_variables),
-                retries=self.retry_policy,
-                validation_func=lambda x: all(var in missing_variable_ids for var in x.keys())
-            )
-            variables_dict = {key: value for key, value in variables_dict.items() if value is not None}
+                variables_dict = retry(
+                    lambda: self._fetch_variables(text, missing_variables),
+                    retries=self.retry_policy,
+                    validation_func=lambda x: all(var in missing_variable_ids for var in x.keys())
+                )
+                variables_dict = {key: value for key, value in variables_dict.items() if value is not None}
 
-            self._set_variables(variables_dict)
+                self._set_variables(variables_dict)
 
-            check_variables = self._get_missing_reasoning_variables()
-            if len(check_variables) == 0:
-                self._continue_reasoning()
+                # Rules left are decided once no rule alive is missing a value
+                if self._get_next_reasoning_variable() is None:
+                    self._continue_reasoning()
 
         if self.status == OrchestratorStatus.INFERENCE_FINISHED:
             # TODO: find and fire the actions accordingly to the conclusions
@@ -115,7 +130,8 @@ class LLMOrchestrator(BaseOrchestrator):
             
         if self.status in [OrchestratorStatus.ENGINE_WAITING_FOR_VARIABLES, OrchestratorStatus.FACT_QUESTIONING_MODE]:
             if self.options.variables_fetching == VariablesFetchingMode.STEP_BY_STEP:
-                missing_variables = [self._get_missing_reasoning_variables()[0]]
+                next_variable = self._get_next_reasoning_variable()
+                missing_variables = [next_variable] if next_variable is not None else self._get_missing_reasoning_variables()[:1]
             else:
                 missing_variables = self._get_missing_reasoning_variables()
             question = self._ask_for_more_information(missing_variables)
@@ -198,7 +214,8 @@ class LLMOrchestrator(BaseOrchestrator):
         if reasoning_method is not None and knowledge_base_id is not None:
             knowledge_base = next((kb for kb in self.knowledge_bases if kb.id == knowledge_base_id), None)
             if knowledge_base:
-                self.reasoning_process = ReasoningProcess(reasoning_method=reasoning_method, knowledge_base=knowledge_base, options=reasoning_options)
+                process_class = ReasoningSession if self.options.use_reasoning_sessions else ReasoningProcess
+                self.reasoning_process = process_class(reasoning_method=reasoning_method, knowledge_base=knowledge_base, options=reasoning_options)
                 self._log_inference(f"[Orchestrator]: Reasoning process was set with method: {reasoning_method.name} and knowledge base: {knowledge_base_id}")
                 self._reset_engine()
                 return True
@@ -224,18 +241,11 @@ class LLMOrchestrator(BaseOrchestrator):
         return response
 
     def _fetch_hypothesis_conclusion(self, text: str, knowledge_base_id: str) -> Variable:
-        knowledge_base_rules = next((kb.rule_set for kb in self.knowledge_bases if kb.id == knowledge_base_id), None)
-        
-        seen_ids = set()
-        rules = []
-        for rule in knowledge_base_rules:
-            rule_id = rule.conclusion.get_id()
-            if rule_id not in seen_ids:
-                seen_ids.add(rule_id)
-                rules.append(rule)
+        knowledge_base = next((kb for kb in self.knowledge_bases if kb.id == knowledge_base_id), None)
+        # Distinct conclusions are kept by the compiled knowledge base
+        conclusions = CompiledKnowledgeBase.compile(knowledge_base).conclusions
 
-        conclusions_info = "\n".join([f"{rule.conclusion.get_variable().id} - {rule.conclusion.get_variable().name}" for rule in rules])
-        conclusions = [rule.conclusion.get_variable() for rule in rules]
+        conclusions_info = "\n".join([f"{conclusion.id} - {conclusion.name}" for conclusion in conclusions])
 
         prompt = self.llm.templates.FetchHypothesisTestingTemplate.format(conclusions=conclusions_info, text=text)
         self._log_inference(f"[Orchestrator]: Prompting for hypothesis from available conclusions...")
@@ -257,7 +267,8 @@ class LLMOrchestrator(BaseOrchestrator):
         if not value:
             raise ValueError("[Orchestrator]: No matching hypothesis_value found in the response.")
         value = parse_variable_value(value, hypothesis)
-        hypothesis.value = value
+        # A copy keeps the conclusion shared by the knowledge base rules untouched
+        hypothesis = Variable(id=hypothesis.id, name=hypothesis.name, value=value)
         self._log_inference(f"[Orchestrator]: Hypothesis retrieved: {hypothesis.display()}.")
 
         return hypothesis
@@ -1,4 +1,5 @@
 import unittest
+import random
 from src.business_rules_reasoning.base.value_types.list_type import ListType
 from src.business_rules_reasoning.base.value_types.base_type import BaseType
 
@@ -32,5 +33,41 @@ class TestListType(unittest.TestCase):
         self.assertTrue(BaseType(2) in list_type)
         self.assertFalse(BaseType(4) in list_type)
 
+    def test_contains_folds_case_and_numbers(self):
+        list_type = ListType(["North", 1, True, 2.5])
+        self.assertTrue(BaseType("north") in list_type)
+        self.assertTrue(BaseType(1.0) in list_type)
+        self.assertTrue(BaseType(False) not in list_type)
+        self.assertFalse(BaseType("1") in list_type)
+        self.assertTrue(ListType(["NORTH", 2.5]) in list_type)
+        self.assertFalse(ListType(["NORTH", 3]) in list_type)
+
+    def test_eq_compares_as_multiset(self):
+        self.assertTrue(ListType(["a", "B", 1]) == ListType([True, "b", "A"]))
+        self.assertFalse(ListType(["a", "a", "b"]) == ListType(["a", "b", "b"]))
+        self.assertFalse(ListType([None]) == ListType([None]))
+
+    def test_matches_linear_scan(self):
+        def linear_eq(left, right):
+            if len(left.values) != len(right.values):
+                return False
+            remaining = list(right.values)
+            for value in left.values:
+                match = next((index for index, item in enumerate(remaining) if value == item), None)
+                if match is None:
+                    return False
+                remaining.pop(match)
+            return True
+
+        generator = random.Random(0)
+        items = [0, 1, 1.0, 2, True, False, "a", "A", "b", "1", 2.5]
+        for _ in range(500):
+            left = ListType(generator.choices(items, k=generator.randint(0, 4)))
+            right = ListType(generator.choices(items, k=generator.randint(0, 4)))
+            value = BaseType(generator.choice(items))
+            self.assertEqual(left == right, linear_eq(left, right))
+            self.assertEqual(value in left, any(value == item for item in left.values))
+            self.assertEqual(right in left, all(any(value == item for item in left.values) for value in right.values))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,72 @@
+import random
+from src.business_rules_reasoning.base import OperatorType
+from src.business_rules_reasoning.deductive import KnowledgeBaseBuilder, RuleBuilder, PredicateBuilder, VariableBuilder
+
+def build_rule(conclusion_value, predicates):
+    builder = RuleBuilder().set_conclusion(VariableBuilder().set_id("decision").set_value(conclusion_value).unwrap())
+    for variable_id, operator, value in predicates:
+        builder.add_predicate(PredicateBuilder().configure_predicate(variable_id, operator, value).unwrap())
+    return builder.unwrap()
+
+def build_decision_knowledge_base():
+    return KnowledgeBaseBuilder().set_id("kb1") \
+        .add_rule(build_rule("reject", [("fraud_flag", OperatorType.EQUAL, True)])) \
+        .add_rule(build_rule("review", [("fraud_flag", OperatorType.EQUAL, False), ("income", OperatorType.LESS_THAN, 2000)])) \
+        .add_rule(build_rule("accept", [("fraud_flag", OperatorType.EQUAL, False), ("income", OperatorType.GREATER_OR_EQUAL, 2000), ("debt", OperatorType.LESS_THAN, 500)])) \
+        .add_rule(build_rule("escalate", [("debt", OperatorType.GREATER_OR_EQUAL, 500), ("region", OperatorType.IS_IN, ["north", "south"])])) \
+        .unwrap()
+
+def build_loan_knowledge_base():
+    rejected = RuleBuilder() \
+        .set_conclusion(VariableBuilder().set_id("loan_accepted").set_value(False).unwrap()) \
+        .add_predicate(PredicateBuilder().configure_predicate("monthly_net_salary", OperatorType.LESS_THAN, 2000).unwrap()) \
+        .unwrap()
+    accepted = RuleBuilder() \
+        .set_conclusion(VariableBuilder().set_id("loan_accepted").set_value(True).unwrap()) \
+        .add_predicate(PredicateBuilder().configure_predicate("monthly_net_salary", OperatorType.GREATER_OR_EQUAL, 2000).unwrap()) \
+        .add_predicate(PredicateBuilder().configure_predicate("fraud_flag", OperatorType.EQUAL, False).unwrap()) \
+        .unwrap()
+    return KnowledgeBaseBuilder().set_id("kb1").add_rule(accepted).add_rule(rejected).unwrap()
+
+PREDICATES = [
+    ("age", OperatorType.GREATER_OR_EQUAL, 18),
+    ("age", OperatorType.LESS_THAN, 65),
+    ("age", OperatorType.BETWEEN, [30, 40]),
+    ("age", OperatorType.NOT_BETWEEN, [20, 25]),
+    ("age", OperatorType.IS_IN, [1, True, "x"]),
+    ("income", OperatorType.GREATER_THAN, 1000.5),
+    ("income", OperatorType.LESS_OR_EQUAL, 5000),
+    ("income", OperatorType.NOT_EQUAL, 3000),
+    ("country", OperatorType.EQUAL, "PL"),
+    ("country", OperatorType.NOT_IN, ["de", "FR"]),
+    ("country", OperatorType.IS_IN, "Poland"),
+    ("country", OperatorType.SUBSET, ["pl", "nl"]),
+    ("student", OperatorType.EQUAL, True),
+    ("student", OperatorType.NOT_SUBSET, [0]),
+    ("product", OperatorType.IS_IN, ["lease", "LOAN"]),
+]
+
+def build_random_knowledge_base(seed):
+    generator = random.Random(seed)
+    kb_builder = KnowledgeBaseBuilder().set_id("kb")
+    for rule_index in range(12):
+        rule_builder = RuleBuilder().set_conclusion(VariableBuilder().set_id(f"decision_{rule_index % 3}").set_value(rule_index % 2 == 0).unwrap())
+        for variable_id, operator, value in generator.sample(PREDICATES, generator.randint(1, 3)):
+            rule_builder.add_predicate(PredicateBuilder().configure_predicate(variable_id, operator, value).unwrap())
+        kb_builder.add_rule(rule_builder.unwrap())
+    return kb_builder.unwrap()
+
+def build_random_rows(seed, count):
+    generator = random.Random(seed)
+    # About one cell in eight is empty, so rows often leave rules undecided
+    values = {
+        "age": [10, 18, 30, 35.5, 64, 70, 1] * 8 + [None] * 8 + [True],
+        "income": [500, 1000.5, 3000, 4999.99, 8000] * 8 + [None] * 6 + ["high"],
+        "country": ["PL", "pl", "Pol", "de", "NL", "USA"] * 4 + [None] * 3,
+        "student": [True, False] * 8 + [None] * 2,
+        "product": ["lease", "loan", "mortgage"] * 10 + [None] * 4 + [2],
+    }
+    return [{variable_id: generator.choice(options) for variable_id, options in values.items()} for _ in range(count)]
+
+def describe(results):
+    return [(result.evaluation_message, [(item.id, item.value) for item in result.reasoned_items], result.missing_variable_ids, result.reasoning_error_message) for result in results]
@@ -0,0 +1,59 @@
+import unittest
+from src.business_rules_reasoning.base import ReasoningProcess, Variable, OperatorType
+from src.business_rules_reasoning.base.reasoning_enums import ReasoningState, EvaluationMessage, ReasoningMethod
+from src.business_rules_reasoning.deductive import KnowledgeBaseBuilder, RuleBuilder, PredicateBuilder, VariableBuilder, ReasoningSession, SessionReasoningService, DeductiveReasoningService, QuestionPlanner
+
+def build_rule(conclusion_id, conclusion_value, *predicates):
+    builder = RuleBuilder().set_conclusion(VariableBuilder().set_id(conclusion_id).set_value(conclusion_value).unwrap())
+    for variable_id, operator, value in predicates:
+        builder.add_predicate(PredicateBuilder().configure_predicate(variable_id, operator, value).unwrap())
+    return builder.unwrap()
+
+def build_layered_knowledge_base():
+    return KnowledgeBaseBuilder().set_id("kb1") \
+        .add_rule(build_rule("loan_accepted", True, ("eligible", OperatorType.EQUAL, True), ("fraud_flag", OperatorType.EQUAL, False))) \
+        .add_rule(build_rule("loan_accepted", True, ("vip", OperatorType.EQUAL, True))) \
+        .add_rule(build_rule("eligible", True, ("monthly_net_salary", OperatorType.GREATER_OR_EQUAL, 2000), ("employment_type", OperatorType.EQUAL, "permanent"))) \
+        .add_rule(build_rule("eligible", True, ("guarantor", OperatorType.EQUAL, True))) \
+        .add_rule(build_rule("eligible", True, ("loan_accepted", OperatorType.EQUAL, True))) \
+        .add_rule(build_rule("bonus", True, ("age", OperatorType.GREATER_THAN, 30))) \
+        .unwrap()
+
+class TestBackwardChaining(unittest.TestCase):
+    def test_asks_leaf_facts_of_cheapest_proof(self):
+        for service, process_class in [(DeductiveReasoningService, ReasoningProcess), (SessionReasoningService, ReasoningSession)]:
+            with self.subTest(service=service.__name__):
+                hypothesis = Variable(id="loan_accepted", value=True)
+                process = process_class(ReasoningMethod.HYPOTHESIS_TESTING, build_layered_knowledge_base(), {"hypothesis": hypothesis, "conclusion_as_fact": True})
+                process = service.start_reasoning(process)
+                self.assertEqual(process.evaluation_message, EvaluationMessage.MISSING_VALUES)
+                self.assertEqual(service.get_all_missing_variable_ids(process), ["vip"])
+
+                process = service.continue_reasoning(service.set_values(process, {"vip": False}))
+                self.assertEqual(process.state, ReasoningState.STOPPED)
+                # Proving eligible through the guarantor needs one leaf fact instead of two
+                self.assertEqual(service.get_all_missing_variable_ids(process), ["guarantor", "fraud_flag"])
+                self.assertEqual(QuestionPlanner(process.knowledge_base).get_next_variable(process).id, "guarantor")
+
+                process = service.continue_reasoning(service.set_values(process, {"guarantor": True, "fraud_flag": False}))
+                self.assertEqual(process.state, ReasoningState.FINISHED)
+                self.assertEqual(process.evaluation_message, EvaluationMessage.PASSED)
+                self.assertEqual(process.reasoned_items, [hypothesis])
+
+    def test_memoizes_subgoals_and_skips_unrelated_rules(self):
+        hypothesis = Variable(id="loan_accepted", value=True)
+        session = ReasoningSession(ReasoningMethod.HYPOTHESIS_TESTING, build_layered_knowledge_base(), {"hypothesis": hypothesis, "conclusion_as_fact": True})
+        session = SessionReasoningService.start_reasoning(session)
+        session = SessionReasoningService.continue_reasoning(SessionReasoningService.set_values(session, {"vip": False, "guarantor": True, "age": 40}))
+        self.assertEqual(session.state, ReasoningState.STOPPED)
+        # The proved subgoal is kept as a fact, the rule of the unrelated conclusion is never evaluated
+        self.assertEqual(session.facts["eligible"], True)
+        self.assertEqual(dict(session.rule_results.items()), {1: False, 3: True})
+        self.assertEqual(SessionReasoningService.get_all_missing_variable_ids(session), ["fraud_flag"])
+
+        session = SessionReasoningService.continue_reasoning(SessionReasoningService.set_values(session, {"fraud_flag": True}))
+        self.assertEqual(session.state, ReasoningState.FINISHED)
+        self.assertEqual(session.evaluation_message, EvaluationMessage.FAILED)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import pandas as pd
+from src.business_rules_reasoning.base import ReasoningProcess, Variable, OperatorType
+from src.business_rules_reasoning.base.reasoning_enums import EvaluationMessage, ReasoningMethod
+from src.business_rules_reasoning.deductive import DeductiveReasoningService, KnowledgeBaseBuilder, RuleBuilder, PredicateBuilder, VariableBuilder
+from src.business_rules_reasoning.deductive.batch_evaluation import normalize_fact_value
+
+def build_knowledge_base():
+    rejected = RuleBuilder() \
+        .set_conclusion(VariableBuilder().set_id("loan_accepted").set_value(False).unwrap()) \
+        .add_predicate(PredicateBuilder().configure_predicate("monthly_net_salary", OperatorType.LESS_THAN, 2000).unwrap()) \
+        .unwrap()
+    accepted = RuleBuilder() \
+        .set_conclusion(VariableBuilder().set_id("loan_accepted").set_value(True).unwrap()) \
+        .add_predicate(PredicateBuilder().configure_predicate("monthly_net_salary", OperatorType.GREATER_OR_EQUAL, 2000).unwrap()) \
+        .add_predicate(PredicateBuilder().configure_predicate("employment_type", OperatorType.IS_IN, ["freelancer", "employee"]).unwrap()) \
+        .unwrap()
+    return KnowledgeBaseBuilder().set_id("kb1").add_rule(accepted).add_rule(rejected).unwrap()
+
+ROWS = [
+    {"monthly_net_salary": 3000, "employment_type": "Employee"},
+    {"monthly_net_salary": 1500},
+    {"monthly_net_salary": 3000},
+    {"monthly_net_salary": 3000, "employment_type": "unemployed"},
+    {"monthly_net_salary": "high", "employment_type": "freelancer"},
+]
+
+class TestEvaluateBatch(unittest.TestCase):
+    def assert_rows(self, results):
+        self.assertEqual(len(results), 5)
+        self.assertEqual([result.evaluation_message for result in results], [
+            EvaluationMessage.PASSED, EvaluationMessage.PASSED, EvaluationMessage.MISSING_VALUES, EvaluationMessage.FAILED, EvaluationMessage.ERROR
+        ])
+        self.assertEqual([item.value for item in results[0].reasoned_items], [True])
+        self.assertEqual([item.value for item in results[1].reasoned_items], [False])
+        self.assertEqual(results[2].missing_variable_ids, ["employment_type"])
+        self.assertEqual(results[0].missing_variable_ids, [])
+        self.assertIn("Type mismatch", results[4].reasoning_error_message)
+
+    def test_list_of_dicts(self):
+        self.assert_rows(DeductiveReasoningService.evaluate_batch(build_knowledge_base(), ROWS))
+
+    def test_iterator(self):
+        self.assert_rows(DeductiveReasoningService.evaluate_batch(build_knowledge_base(), iter(ROWS)))
+
+    def test_dataframe(self):
+        dataframe = pd.DataFrame(ROWS)
+        self.assert_rows(DeductiveReasoningService.evaluate_batch(build_knowledge_base(), dataframe))
+
+    def test_matches_start_reasoning(self):
+        kb = build_knowledge_base()
+        results = DeductiveReasoningService.evaluate_batch(kb, ROWS)
+        for row, result in zip(ROWS, results):
+            rp = DeductiveReasoningService.start_reasoning(ReasoningProcess(ReasoningMethod.DEDUCTION, build_knowledge_base()))
+            rp = DeductiveReasoningService.continue_reasoning(DeductiveReasoningService.set_values(rp, row))
+            self.assertEqual(result.evaluation_message, rp.evaluation_message)
+            self.assertEqual([(item.id, item.value) for item in result.reasoned_items], [(item.id, item.value) for item in rp.reasoned_items])
+
+    def test_hypothesis_testing(self):
+        options = {"hypothesis": Variable(id="loan_accepted", value=True)}
+        results = DeductiveReasoningService.evaluate_batch(build_knowledge_base(), ROWS[:4], ReasoningMethod.HYPOTHESIS_TESTING, options)
+        self.assertEqual([result.evaluation_message for result in results], [
+            EvaluationMessage.PASSED, EvaluationMessage.FAILED, EvaluationMessage.MISSING_VALUES, EvaluationMessage.FAILED
+        ])
+
+    def test_normalize_fact_value(self):
+        self.assertIsNone(normalize_fact_value(float("nan")))
+        self.assertIsNone(normalize_fact_value(None))
+        self.assertEqual(normalize_fact_value(pd.Series([7]).iloc[0]), 7)
+        self.assertIsInstance(normalize_fact_value(pd.Series([7]).iloc[0]), int)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import random
+from src.business_rules_reasoning.base.reasoning_enums import ReasoningMethod
+from src.business_rules_reasoning.deductive import ReasoningSession, SessionReasoningService, BitsetResults
+from test.deductive.knowledge_bases import build_decision_knowledge_base
+
+class TestBitsetState(unittest.TestCase):
+    def test_behaves_like_dict(self):
+        results = BitsetResults()
+        results[3] = True
+        results[0] = False
+        results[70] = True
+
+        self.assertEqual(dict(results.items()), {0: False, 3: True, 70: True})
+        self.assertEqual(len(results), 3)
+        self.assertIn(0, results)
+        self.assertNotIn(1, results)
+        self.assertIsNone(results.get(1))
+        self.assertFalse(results[0])
+
+        results[3] = False
+        del results[70]
+        self.assertEqual(dict(results.items()), {0: False, 3: False})
+        with self.assertRaises(KeyError):
+            results[70]
+
+    def test_all_true(self):
+        results = BitsetResults.from_dict({0: True, 2: True, 5: False})
+
+        self.assertTrue(results.all_true(0b101))
+        self.assertFalse(results.all_true(0b100101))
+        self.assertFalse(results.all_true(0b110))
+
+    def test_bytes_round_trip(self):
+        results = BitsetResults.from_dict({0: True, 9: False, 200: True})
+        restored = BitsetResults.from_bytes(results.to_bytes())
+
+        self.assertEqual(dict(restored.items()), dict(results.items()))
+        self.assertEqual(dict(BitsetResults.from_bytes(BitsetResults().to_bytes()).items()), {})
+
+    def test_session_snapshot_restores_results(self):
+        session = SessionReasoningService.start_reasoning(ReasoningSession(ReasoningMethod.DEDUCTION, build_decision_knowledge_base(), state_backend="bitset"))
+        session = SessionReasoningService.continue_reasoning(SessionReasoningService.set_values(session, {"fraud_flag": False, "income": 1000}))
+        snapshot = session.get_state_snapshot()
+
+        restored = ReasoningSession(ReasoningMethod.DEDUCTION, build_decision_knowledge_base())
+        restored.restore_state_snapshot(snapshot)
+        self.assertEqual(restored.node_results, dict(session.node_results.items()))
+        self.assertEqual(restored.rule_results, dict(session.rule_results.items()))
+
+    def test_unknown_backend_raises(self):
+        with self.assertRaises(ValueError):
+            ReasoningSession(ReasoningMethod.DEDUCTION, build_decision_knowledge_base(), state_backend="array")
+
+    def test_bitset_session_matches_dict_session(self):
+        values = {
+            "fraud_flag": [True, False],
+            "income": [1000, 2000, 5000],
+            "debt": [0, 500, 900],
+            "region": ["north", "East"],
+        }
+        for seed in range(20):
+            generator = random.Random(seed)
+            variable_ids = list(values)
+            generator.shuffle(variable_ids)
+
+            dict_session = SessionReasoningService.start_reasoning(ReasoningSession(ReasoningMethod.DEDUCTION, build_decision_knowledge_base()))
+            bitset_session = SessionReasoningService.start_reasoning(ReasoningSession(ReasoningMethod.DEDUCTION, build_decision_knowledge_base(), state_backend="bitset"))
+            for variable_id in variable_ids:
+                fact = {variable_id: generator.choice(values[variable_id])}
+                dict_session = SessionReasoningService.continue_reasoning(SessionReasoningService.set_values(dict_session, fact))
+                bitset_session = SessionReasoningService.continue_reasoning(SessionReasoningService.set_values(bitset_session, fact))
+
+                self.assertIsInstance(bitset_session.rule_results, BitsetResults)
+                self.assertEqual(bitset_session.state, dict_session.state)
+                self.assertEqual(bitset_session.evaluation_message, dict_session.evaluation_message)
+                self.assertEqual(dict(bitset_session.rule_results.items()), dict_session.rule_results)
+                self.assertEqual([item.value for item in bitset_session.reasoned_items], [item.value for item in dict_session.reasoned_items])
+
+if __name__ == '__main__':
+    unittest.main()
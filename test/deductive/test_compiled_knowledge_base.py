@@ -0,0 +1,86 @@
+import unittest
+from src.business_rules_reasoning.base import ReasoningProcess, KnowledgeBase, Rule, Variable, OperatorType
+from src.business_rules_reasoning.base.reasoning_enums import ReasoningMethod
+from src.business_rules_reasoning.deductive import DeductivePredicate, DeductiveConclusion, DeductiveReasoningService, CompiledKnowledgeBase
+
+def build_predicate(variable_id, operator, value):
+    return DeductivePredicate(left_term=Variable(id=variable_id), right_term=Variable(id=variable_id, value=value), operator=operator)
+
+class TestCompiledKnowledgeBase(unittest.TestCase):
+    def setUp(self):
+        self.rule1 = Rule(conclusion=DeductiveConclusion(Variable(id="result", value=True)), predicates=[
+            build_predicate("age", OperatorType.GREATER_OR_EQUAL, 18),
+            build_predicate("income", OperatorType.GREATER_THAN, 1000)
+        ])
+        self.rule2 = Rule(conclusion=DeductiveConclusion(Variable(id="result", value=False)), predicates=[
+            build_predicate("income", OperatorType.LESS_OR_EQUAL, 1000)
+        ])
+        self.kb = KnowledgeBase(rule_set=[self.rule1, self.rule2])
+
+    def test_index(self):
+        compiled = CompiledKnowledgeBase(self.kb)
+        self.assertEqual(len(compiled.predicates_by_variable["income"]), 2)
+        self.assertEqual(compiled.rules_by_variable["income"], [0, 1])
+        self.assertEqual(compiled.rules_by_variable["age"], [0])
+        self.assertEqual(compiled.get_frequency("income"), 2)
+        self.assertEqual(compiled.variable_ids, ["income", "age"])
+
+    def test_set_values_touches_only_indexed_predicates(self):
+        compiled = CompiledKnowledgeBase(self.kb)
+        compiled.set_values({"income": 500, "unknown": 1})
+        self.assertEqual(self.rule1.predicates[1].left_term.value, 500)
+        self.assertEqual(self.rule2.predicates[0].left_term.value, 500)
+        self.assertIsNone(self.rule1.predicates[0].left_term.value)
+        self.assertEqual([variable.id for variable in compiled.get_missing_variables()], ["age"])
+
+    def test_compile_is_cached_until_rule_set_changes(self):
+        compiled = CompiledKnowledgeBase.compile(self.kb)
+        self.assertIs(CompiledKnowledgeBase.compile(self.kb), compiled)
+
+        self.kb.rule_set.append(Rule(conclusion=DeductiveConclusion(Variable(id="result", value=True)), predicates=[build_predicate("age", OperatorType.LESS_THAN, 18)]))
+        recompiled = CompiledKnowledgeBase.compile(self.kb)
+        self.assertIsNot(recompiled, compiled)
+        self.assertEqual(recompiled.get_frequency("age"), 2)
+
+        CompiledKnowledgeBase.invalidate(self.kb)
+        self.assertIsNot(CompiledKnowledgeBase.compile(self.kb), recompiled)
+
+    def test_rules_and_predicates_changed_in_place_need_invalidate(self):
+        compiled = CompiledKnowledgeBase.compile(self.kb)
+        self.kb.rule_set[1] = Rule(conclusion=DeductiveConclusion(Variable(id="result", value=False)), predicates=[build_predicate("debt", OperatorType.GREATER_THAN, 0)])
+        self.rule1.predicates.append(build_predicate("student", OperatorType.EQUAL, False))
+        # The cached index is checked in O(1), rules are not walked on lookup
+        self.assertIs(CompiledKnowledgeBase.compile(self.kb), compiled)
+
+        CompiledKnowledgeBase.invalidate(self.kb)
+        recompiled = CompiledKnowledgeBase.compile(self.kb)
+        self.assertIsNot(recompiled, compiled)
+        self.assertEqual(recompiled.rules_by_variable["debt"], [1])
+        self.assertIn("student", recompiled.rules_by_variable)
+
+        rp = DeductiveReasoningService.start_reasoning(ReasoningProcess(reasoning_method=ReasoningMethod.DEDUCTION, knowledge_base=self.kb))
+        rp = DeductiveReasoningService.continue_reasoning(DeductiveReasoningService.set_values(rp, {"age": 20, "income": 2000, "debt": 0}))
+        self.assertEqual(DeductiveReasoningService.get_all_missing_variable_ids(rp), ["student"])
+
+    def test_service_uses_frequency_order(self):
+        rp = ReasoningProcess(reasoning_method=ReasoningMethod.DEDUCTION, knowledge_base=self.kb)
+        DeductiveReasoningService.clear_reasoning(rp)
+        self.assertEqual(self.rule2.predicates[0].left_term.frequency, 2)
+        self.assertEqual(DeductiveReasoningService.get_all_missing_variable_ids(rp), ["income", "age"])
+        variables = DeductiveReasoningService.analyze_variables_frequency(rp)
+        self.assertEqual([(variable.id, variable.frequency) for variable in variables], [("income", 2), ("age", 1)])
+
+    def test_conclusion_index(self):
+        rule3 = Rule(conclusion=DeductiveConclusion(Variable(id="grade", value=["a", "b"])), predicates=[build_predicate("age", OperatorType.LESS_THAN, 18)])
+        rule4 = Rule(conclusion=DeductiveConclusion(Variable(id="result", value=1)), predicates=[build_predicate("age", OperatorType.LESS_THAN, 10)])
+        compiled = CompiledKnowledgeBase(KnowledgeBase(rule_set=[self.rule1, self.rule2, rule3, rule4]))
+
+        # Values compare with == as in hypothesis testing, so True and 1 conclude the same
+        self.assertEqual(compiled.get_conclusion_rule_indexes("result", True), [0, 3])
+        self.assertEqual(compiled.get_conclusion_rule_indexes("result", False), [1])
+        self.assertEqual(compiled.get_conclusion_rule_indexes("grade", ["a", "b"]), [2])
+        self.assertEqual(compiled.get_conclusion_rule_indexes("missing", True), [])
+        self.assertEqual([variable.id for variable in compiled.conclusions], ["result", "grade"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import pickle
+from src.business_rules_reasoning.base import Variable, OperatorType
+from src.business_rules_reasoning.deductive import DeductivePredicate
+
+def build_predicate(operator, right_value, left_value=None):
+    return DeductivePredicate(Variable(id="score", value=left_value), Variable(id="score", value=right_value), operator)
+
+class TestDeductivePredicate(unittest.TestCase):
+    def test_operator_is_resolved_when_assigned(self):
+        predicate = build_predicate(OperatorType.GREATER_THAN, 10, 5)
+        self.assertFalse(predicate.evaluate_value(5))
+
+        predicate.operator = OperatorType.LESS_THAN
+        self.assertTrue(predicate.evaluate_value(5))
+        self.assertEqual(predicate.display(), "score < 10")
+
+    def test_right_value_cache_follows_value_changes(self):
+        predicate = build_predicate(OperatorType.EQUAL, "approved")
+        first_value = predicate.get_right_value()
+        self.assertIs(predicate.get_right_value()[0], first_value[0])
+        self.assertEqual(first_value[1], "string")
+
+        predicate.right_term.value = 10
+        self.assertEqual(predicate.get_right_value()[1], "number")
+        self.assertTrue(predicate.evaluate_value(10.0))
+
+    def test_right_value_cache_follows_list_changed_in_place(self):
+        predicate = build_predicate(OperatorType.IS_IN, ["A", "B"])
+        cached = predicate.get_right_value()[0]
+        self.assertFalse(predicate.evaluate_value("C"))
+        self.assertIs(predicate.get_right_value()[0], cached)
+
+        predicate.right_term.value.append("C")
+        self.assertTrue(predicate.evaluate_value("C"))
+        predicate.right_term.value[0] = "D"
+        self.assertFalse(predicate.evaluate_value("A"))
+        predicate.right_term.value.clear()
+        self.assertFalse(predicate.evaluate_value("C"))
+
+    def test_evaluate_keeps_error_messages(self):
+        predicate = build_predicate(OperatorType.EQUAL, 10, "ten")
+        with self.assertRaises(Exception) as context:
+            predicate.evaluate()
+        self.assertIn("Type mismatch between left term value (string) and right term value (number)", str(context.exception))
+
+        predicate = build_predicate(None, 10, 10)
+        with self.assertRaises(Exception) as context:
+            predicate.evaluate()
+        self.assertEqual(str(context.exception), "Unknown operator instance of predicate")
+
+        with self.assertRaises(Exception):
+            build_predicate(OperatorType.EQUAL, 10).evaluate_value(None)
+
+    def test_knowledge_base_objects_have_no_instance_dict(self):
+        predicate = build_predicate(OperatorType.IS_IN, ["a", "b"], "a")
+        predicate.get_right_value()
+        for item in (predicate, predicate.left_term, predicate.get_right_value()[0], predicate.get_right_value()[0].values[0]):
+            self.assertFalse(hasattr(item, "__dict__"))
+        with self.assertRaises(AttributeError):
+            predicate.left_term.unknown = 1
+
+    def test_slotted_predicate_survives_pickle(self):
+        predicate = pickle.loads(pickle.dumps(build_predicate(OperatorType.IS_IN, ["a", "b"], "B")))
+        self.assertEqual(predicate.operator, OperatorType.IS_IN)
+        self.assertTrue(predicate.evaluate_value("b"))
+        self.assertTrue(predicate.get_right_value()[0] == Variable(id="score", value=["B", "A"]).get_value())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from src.business_rules_reasoning.base import Variable, OperatorType
+from src.business_rules_reasoning.base.reasoning_process import ReasoningProcess
+from src.business_rules_reasoning.base.reasoning_enums import ReasoningMethod
+from src.business_rules_reasoning.deductive import KnowledgeBaseBuilder, RuleBuilder, PredicateBuilder, VariableBuilder, DeductiveReasoningService, DiscriminationTree, DiscriminationTreeEvaluator, CompiledKnowledgeBase
+from src.business_rules_reasoning.deductive.decision_table import c45_ruleset
+from test.deductive.knowledge_bases import build_random_knowledge_base, build_random_rows, describe
+
+def build_c45_knowledge_base():
+    data = {
+        "Outlook": ["Sunny", "Sunny", "Overcast", "Rain", "Rain", "Rain", "Overcast", "Sunny", "Sunny", "Rain", "Sunny", "Overcast", "Overcast", "Rain"],
+        "Humidity": ["High", "High", "High", "High", "Normal", "Normal", "Normal", "High", "Normal", "Normal", "Normal", "High", "Normal", "High"],
+        "Wind": ["Weak", "Strong", "Weak", "Weak", "Weak", "Strong", "Strong", "Weak", "Weak", "Weak", "Strong", "Strong", "Weak", "Strong"],
+        "PlayTennis": ["No", "No", "Yes", "Yes", "Yes", "No", "Yes", "No", "Yes", "Yes", "Yes", "Yes", "Yes", "No"]
+    }
+    builder = KnowledgeBaseBuilder().set_id("tennis")
+    for rule in c45_ruleset(pd.DataFrame(data), conclusion_index=-1):
+        builder.add_rule(rule)
+    return builder.unwrap()
+
+class TestDiscriminationTree(unittest.TestCase):
+    def test_walk_depth_follows_tree(self):
+        kb = build_c45_knowledge_base()
+        tree = DiscriminationTree(kb)
+
+        # EQUAL tests of a variable share one switch node
+        self.assertEqual(tree.get_depth(), 3)
+        self.assertLess(tree.node_count, 10)
+        leaf = tree.walk({"outlook": "Overcast", "humidity": "High", "wind": "Weak"})
+        self.assertTrue(leaf.finished)
+        self.assertEqual([kb.rule_set[rule_index].conclusion.get_value() for rule_index in leaf.fired_rule_indexes], [True])
+
+    def test_reasoned_items_match_deduction(self):
+        kb = build_c45_knowledge_base()
+        evaluator = DiscriminationTreeEvaluator(kb)
+        for facts in [{"outlook": "Sunny", "humidity": "Normal"}, {"outlook": "rain", "wind": "Strong"}, {"outlook": "Sunny"}, {"outlook": "Rain", "wind": 1}]:
+            process = DeductiveReasoningService.start_reasoning(ReasoningProcess(ReasoningMethod.DEDUCTION, kb))
+            process = DeductiveReasoningService.continue_reasoning(DeductiveReasoningService.set_values(process, facts))
+            result = evaluator.evaluate([facts])[0]
+            self.assertEqual(result.evaluation_message, process.evaluation_message)
+            self.assertEqual(result.reasoning_error_message, process.reasoning_error_message)
+            self.assertEqual([(item.id, item.value) for item in result.reasoned_items], [(item.id, item.value) for item in process.reasoned_items])
+
+    def test_matches_scalar_engine(self):
+        for seed in range(5):
+            kb = build_random_knowledge_base(seed)
+            rows = build_random_rows(seed, 300)
+            expected = DeductiveReasoningService.evaluate_batch(kb, rows)
+            actual = DeductiveReasoningService.evaluate_batch(kb, rows, backend="tree")
+            self.assertEqual(describe(actual), describe(expected))
+
+    def test_hypothesis_matches_scalar_engine(self):
+        kb = build_random_knowledge_base(1)
+        rows = build_random_rows(2, 300)
+        options = {"hypothesis": Variable(id="decision_1", value=True)}
+        expected = DeductiveReasoningService.evaluate_batch(kb, rows, ReasoningMethod.HYPOTHESIS_TESTING, options)
+        actual = DeductiveReasoningService.evaluate_batch(kb, rows, ReasoningMethod.HYPOTHESIS_TESTING, options, backend="tree")
+        self.assertEqual(describe(actual), describe(expected))
+
+    def test_equality_table_builds_one_switch_per_column(self):
+        builder = KnowledgeBaseBuilder().set_id("table")
+        for rule_index in range(3000):
+            rule_builder = RuleBuilder().set_conclusion(VariableBuilder().set_id("decision").set_value(rule_index).unwrap())
+            for column, value in [("a", rule_index // 100), ("b", rule_index // 10 % 10), ("c", rule_index % 10)]:
+                rule_builder.add_predicate(PredicateBuilder().configure_predicate(column, OperatorType.EQUAL, value).unwrap())
+            builder.add_rule(rule_builder.unwrap())
+        kb = builder.unwrap()
+
+        tree = DiscriminationTree(kb)
+
+        self.assertEqual(tree.get_depth(), 3)
+        self.assertLess(tree.node_count, 4000)
+        leaf = tree.walk({"a": 12, "b": 3, "c": 4})
+        self.assertTrue(leaf.finished)
+        self.assertEqual(leaf.fired_rule_indexes, (1234,))
+
+    def test_trees_are_cached_per_compiled_knowledge_base(self):
+        kb = build_random_knowledge_base(3)
+        rows = build_random_rows(3, 20)
+        options = {"hypothesis": Variable(id="decision_1", value=True)}
+        tree = DiscriminationTreeEvaluator(kb).tree
+        DeductiveReasoningService.evaluate_batch(kb, rows, backend="tree")
+        DeductiveReasoningService.evaluate_batch(kb, rows, ReasoningMethod.HYPOTHESIS_TESTING, options, backend="tree")
+
+        with patch.object(DiscriminationTree, "_build", side_effect=AssertionError("tree rebuilt")):
+            DeductiveReasoningService.evaluate_batch(kb, rows, backend="tree")
+            DeductiveReasoningService.evaluate_batch(kb, rows, ReasoningMethod.HYPOTHESIS_TESTING, options, backend="tree")
+
+        CompiledKnowledgeBase.invalidate(kb)
+        self.assertIsNot(DiscriminationTreeEvaluator(kb).tree, tree)
+
+    def test_node_limit(self):
+        with self.assertRaises(Exception):
+            DiscriminationTree(build_random_knowledge_base(0), max_nodes=10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import random
+import unittest
+from src.business_rules_reasoning.base import Variable, OperatorType
+from src.business_rules_reasoning.base.reasoning_enums import EvaluationMessage, ReasoningMethod
+from src.business_rules_reasoning.deductive import DeductiveReasoningService, KnowledgeBaseBuilder, RuleBuilder, PredicateBuilder, VariableBuilder, EqualityIndex, IndexedEvaluator, CompiledKnowledgeBase
+from test.deductive.knowledge_bases import build_random_knowledge_base, build_random_rows
+
+VALUES = {
+    "segment": ["Retail", "corporate", "SME"],
+    "country": ["PL", "DE", "NL"],
+    "vip": [True, False],
+    "score": [1, 2, 3.0],
+}
+
+def build_knowledge_base(seed):
+    generator = random.Random(seed)
+    kb_builder = KnowledgeBaseBuilder().set_id("kb")
+    for rule_index in range(40):
+        rule_builder = RuleBuilder().set_conclusion(VariableBuilder().set_id("decision").set_value(rule_index % 5).unwrap())
+        for variable_id in generator.sample(list(VALUES), generator.randint(1, 4)):
+            rule_builder.add_predicate(PredicateBuilder().configure_predicate(variable_id, OperatorType.EQUAL, generator.choice(VALUES[variable_id])).unwrap())
+        if generator.random() < 0.3:
+            rule_builder.add_predicate(PredicateBuilder().configure_predicate("income", OperatorType.GREATER_OR_EQUAL, generator.choice([1000, 5000])).unwrap())
+        kb_builder.add_rule(rule_builder.unwrap())
+    return kb_builder.unwrap()
+
+def build_rows(seed, count):
+    generator = random.Random(seed)
+    options = {
+        "segment": ["retail", "CORPORATE", "sme"] * 6 + [None, 3],
+        "country": ["pl", "DE", "nl"] * 6 + [None],
+        "vip": [True, False] * 8 + [None, 1],
+        "score": [1, 2.0, 3] * 6 + [None, True],
+        "income": [500, 2000, 8000] * 6 + [None, "high"],
+    }
+    return [{variable_id: generator.choice(values) for variable_id, values in options.items()} for _ in range(count)]
+
+def describe(results):
+    return [(result.evaluation_message, [(item.id, item.value) for item in result.reasoned_items], result.missing_variable_ids, result.reasoning_error_message) for result in results]
+
+class TestEqualityIndex(unittest.TestCase):
+    def test_rules_are_grouped_by_equality_columns(self):
+        kb = KnowledgeBaseBuilder().set_id("kb") \
+            .add_rule(RuleBuilder().set_conclusion(VariableBuilder().set_id("decision").set_value(1).unwrap())
+                .add_predicate(PredicateBuilder().configure_predicate("segment", OperatorType.EQUAL, "Retail").unwrap())
+                .add_predicate(PredicateBuilder().configure_predicate("income", OperatorType.GREATER_THAN, 1000).unwrap())
+                .unwrap()) \
+            .add_rule(RuleBuilder().set_conclusion(VariableBuilder().set_id("decision").set_value(2).unwrap())
+                .add_predicate(PredicateBuilder().configure_predicate("segment", OperatorType.EQUAL, "SME").unwrap())
+                .unwrap()) \
+            .unwrap()
+        index = EqualityIndex(CompiledKnowledgeBase.compile(kb).rule_set)
+
+        self.assertEqual(index.groups, {("segment",): {("retail",): [0], ("sme",): [1]}})
+        self.assertEqual(index.match({"segment": "RETAIL", "income": 2000}), ([0], []))
+        self.assertEqual(index.match({"segment": "retail"}), ([], [0]))
+        self.assertEqual(index.match({"segment": "other"}), ([], []))
+
+    def test_matches_scalar_engine(self):
+        messages = set()
+        for seed in range(5):
+            kb = build_knowledge_base(seed)
+            rows = build_rows(seed, 300)
+            expected = DeductiveReasoningService.evaluate_batch(kb, rows)
+            actual = DeductiveReasoningService.evaluate_batch(kb, rows, backend="index")
+            self.assertEqual(describe(actual), describe(expected))
+            messages.update(result.evaluation_message for result in expected)
+        self.assertEqual(messages, {EvaluationMessage.PASSED, EvaluationMessage.FAILED, EvaluationMessage.MISSING_VALUES, EvaluationMessage.ERROR})
+
+    def test_hypothesis_matches_scalar_engine(self):
+        kb = build_knowledge_base(0)
+        rows = build_rows(1, 300)
+        options = {"hypothesis": Variable(id="decision", value=2)}
+        expected = DeductiveReasoningService.evaluate_batch(kb, rows, ReasoningMethod.HYPOTHESIS_TESTING, options)
+        actual = IndexedEvaluator(kb).evaluate(rows, ReasoningMethod.HYPOTHESIS_TESTING, options)
+        self.assertEqual(describe(actual), describe(expected))
+
+    def test_missing_variables_of_random_knowledge_bases_match_scalar_engine(self):
+        for seed in range(5):
+            kb = build_random_knowledge_base(seed)
+            rows = build_random_rows(seed, 300)
+            for reasoning_method, options in [(ReasoningMethod.DEDUCTION, None), (ReasoningMethod.HYPOTHESIS_TESTING, {"hypothesis": Variable(id="decision_0", value=True)})]:
+                with self.subTest(seed=seed, reasoning_method=reasoning_method.name):
+                    expected = DeductiveReasoningService.evaluate_batch(kb, rows, reasoning_method, options)
+                    actual = IndexedEvaluator(kb).evaluate(rows, reasoning_method, options)
+                    self.assertEqual(describe(actual), describe(expected))
+
+if __name__ == '__main__':
+    unittest.main()
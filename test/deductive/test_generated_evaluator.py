@@ -0,0 +1,133 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.business_rules_reasoning.base import Variable, OperatorType
+from src.business_rules_reasoning.base.reasoning_process import ReasoningProcess
+from src.business_rules_reasoning.base.reasoning_enums import EvaluationMessage, ReasoningMethod
+from src.business_rules_reasoning.deductive import DeductiveReasoningService, GeneratedEvaluator, KnowledgeBaseBuilder, RuleBuilder, PredicateBuilder, VariableBuilder
+from src.business_rules_reasoning.deductive.generated_evaluator import generate_source
+
+PREDICATES = [
+    ("age", OperatorType.GREATER_OR_EQUAL, 18),
+    ("age", OperatorType.LESS_THAN, 65),
+    ("age", OperatorType.BETWEEN, [30, 40]),
+    ("age", OperatorType.NOT_BETWEEN, [20, 25]),
+    ("age", OperatorType.IS_IN, [1, True, "x"]),
+    ("income", OperatorType.GREATER_THAN, 1000.5),
+    ("income", OperatorType.LESS_OR_EQUAL, 5000),
+    ("income", OperatorType.NOT_EQUAL, 3000),
+    ("country", OperatorType.EQUAL, "PL"),
+    ("country", OperatorType.NOT_IN, ["de", "FR"]),
+    ("country", OperatorType.IS_IN, "Poland"),
+    ("country", OperatorType.SUBSET, ["pl", "nl"]),
+    ("country", OperatorType.GREATER_THAN, "A"),
+    ("student", OperatorType.EQUAL, True),
+    ("student", OperatorType.NOT_SUBSET, [0]),
+    ("student", OperatorType.LESS_THAN, True),
+    ("product", OperatorType.IS_IN, ["lease", "LOAN"]),
+    ("product", OperatorType.NOT_EQUAL, ["lease"]),
+    ("product", OperatorType.BETWEEN, ["a", "z"]),
+]
+
+def build_knowledge_base(seed):
+    generator = random.Random(seed)
+    kb_builder = KnowledgeBaseBuilder().set_id("kb")
+    for rule_index in range(12):
+        rule_builder = RuleBuilder().set_conclusion(VariableBuilder().set_id(f"decision_{rule_index % 3}").set_value(rule_index % 2 == 0).unwrap())
+        for variable_id, operator, value in generator.sample(PREDICATES, generator.randint(1, 3)):
+            rule_builder.add_predicate(PredicateBuilder().configure_predicate(variable_id, operator, value).unwrap())
+        kb_builder.add_rule(rule_builder.unwrap())
+    return kb_builder.unwrap()
+
+def build_rows(seed, count):
+    generator = random.Random(seed)
+    values = {
+        "age": [10, 18, 30, 35.5, 40, 64, 70, 1] * 8 + [None, True, "30"],
+        "income": [500, 1000.5, 3000, 4999.99, 5000, 8000] * 8 + [None, "high", float("nan")],
+        "country": ["PL", "pl", "Pol", "de", "NL", "USA"] * 4 + [None, "=lookup()", 1],
+        "student": [True, False] * 8 + [None, 0],
+        "product": ["lease", "LOAN", "mortgage"] * 10 + [None, 2, ["lease"]],
+    }
+    return [{variable_id: generator.choice(options) for variable_id, options in values.items()} for _ in range(count)]
+
+def describe(results):
+    return [(result.evaluation_message, [(item.id, item.value) for item in result.reasoned_items], result.missing_variable_ids, result.reasoning_error_message) for result in results]
+
+class TestGeneratedEvaluator(unittest.TestCase):
+    def test_matches_reasoning_service(self):
+        for seed in range(5):
+            kb = build_knowledge_base(seed)
+            evaluator = GeneratedEvaluator(kb)
+            for facts in build_rows(seed, 100):
+                with self.subTest(seed=seed, facts=facts):
+                    process = DeductiveReasoningService.start_reasoning(ReasoningProcess(ReasoningMethod.DEDUCTION, kb))
+                    process = DeductiveReasoningService.continue_reasoning(DeductiveReasoningService.set_values(process, {variable_id: value for variable_id, value in facts.items() if value is not None and value == value}))
+                    result = evaluator.evaluate([facts])[0]
+                    self.assertEqual(result.evaluation_message, process.evaluation_message)
+                    self.assertEqual(result.reasoning_error_message, process.reasoning_error_message)
+                    if process.evaluation_message == EvaluationMessage.ERROR:
+                        # Items reasoned before the error depend on the order each engine evaluates rules in
+                        continue
+                    # The stateful service fires rules in its own order, evaluate_batch order is checked below
+                    self.assertEqual(sorted((item.id, item.value) for item in result.reasoned_items), sorted((item.id, item.value) for item in process.reasoned_items))
+
+    def test_matches_scalar_engine(self):
+        for seed in range(5):
+            kb = build_knowledge_base(seed)
+            rows = build_rows(seed + 10, 300)
+            expected = DeductiveReasoningService.evaluate_batch(kb, rows)
+            actual = DeductiveReasoningService.evaluate_batch(kb, rows, backend="codegen")
+            self.assertEqual(describe(actual), describe(expected))
+
+    def test_hypothesis_matches_scalar_engine(self):
+        kb = build_knowledge_base(1)
+        rows = build_rows(2, 300)
+        for value in [True, False]:
+            options = {"hypothesis": Variable(id="decision_1", value=value)}
+            expected = DeductiveReasoningService.evaluate_batch(kb, rows, ReasoningMethod.HYPOTHESIS_TESTING, options)
+            actual = DeductiveReasoningService.evaluate_batch(kb, rows, ReasoningMethod.HYPOTHESIS_TESTING, options, backend="codegen")
+            self.assertEqual(describe(actual), describe(expected))
+
+    def test_inlines_normalized_constants(self):
+        kb = KnowledgeBaseBuilder().set_id("kb").add_rule(
+            RuleBuilder().set_conclusion(VariableBuilder().set_id("accepted").set_value(True).unwrap())
+            .add_predicate(PredicateBuilder().configure_predicate("country", OperatorType.EQUAL, "PL").unwrap())
+            .add_predicate(PredicateBuilder().configure_predicate("income", OperatorType.GREATER_OR_EQUAL, 2000).unwrap())
+            .unwrap()
+        ).unwrap()
+        source = generate_source(kb)
+        self.assertIn("v0 == 'pl'", source)
+        self.assertIn("not v1 < 2000.0", source)
+
+        evaluator = GeneratedEvaluator(kb)
+        self.assertEqual(evaluator.get_fired_rule_indexes({"country": "pl", "income": 2000}), ([0], []))
+        self.assertEqual(evaluator.get_fired_rule_indexes({"income": 2000}), ([], [0]))
+        # A type mismatch raises in the scalar engine, the row is left to it
+        self.assertIsNone(evaluator.get_fired_rule_indexes({"country": "pl", "income": True}))
+        self.assertEqual(evaluator.evaluate([{"country": "pl", "income": True}])[0].evaluation_message, EvaluationMessage.ERROR)
+
+    def test_compiled_code_is_cached_on_disk(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            evaluator = GeneratedEvaluator(build_knowledge_base(3), cache_dir)
+            self.assertTrue(os.path.exists(evaluator.get_cache_path()))
+
+            rows = build_rows(3, 50)
+            kb = build_knowledge_base(3)
+            with patch("src.business_rules_reasoning.deductive.generated_evaluator.generate_source") as generate:
+                loaded = GeneratedEvaluator(kb, cache_dir)
+                generate.assert_not_called()
+            self.assertEqual(loaded.get_cache_path(), evaluator.get_cache_path())
+            self.assertEqual(describe(loaded.evaluate(rows)), describe(DeductiveReasoningService.evaluate_batch(kb, rows)))
+
+            other = GeneratedEvaluator(build_knowledge_base(4), cache_dir)
+            self.assertNotEqual(other.get_cache_path(), evaluator.get_cache_path())
+
+            # A corrupted file is generated again
+            with open(evaluator.get_cache_path(), "wb") as file:
+                file.write(b"\x00")
+            self.assertEqual(describe(GeneratedEvaluator(build_knowledge_base(3), cache_dir).evaluate(rows)), describe(loaded.evaluate(rows)))
+
+if __name__ == '__main__':
+    unittest.main()
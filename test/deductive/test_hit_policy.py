@@ -0,0 +1,134 @@
+import unittest
+from src.business_rules_reasoning.base import ReasoningProcess, Variable, OperatorType, HitPolicy
+from src.business_rules_reasoning.base.reasoning_enums import ReasoningState, EvaluationMessage, ReasoningMethod
+from src.business_rules_reasoning.deductive import KnowledgeBaseBuilder, RuleBuilder, PredicateBuilder, VariableBuilder, ReasoningSession, SessionReasoningService, DeductiveReasoningService, ReasoningCache, get_hit_policy, optimize_knowledge_base
+
+SERVICES = [(DeductiveReasoningService, ReasoningProcess), (SessionReasoningService, ReasoningSession)]
+
+def build_rule(conclusion_value, *predicates):
+    builder = RuleBuilder().set_conclusion(VariableBuilder().set_id("decision").set_value(conclusion_value).unwrap())
+    for variable_id, operator, value in predicates:
+        builder.add_predicate(PredicateBuilder().configure_predicate(variable_id, operator, value).unwrap())
+    return builder.unwrap()
+
+def build_knowledge_base(hit_policy: HitPolicy, output_priority: list = None):
+    return KnowledgeBaseBuilder().set_id("kb").set_hit_policy(hit_policy, output_priority) \
+        .add_rule(build_rule("accept", ("vip", OperatorType.EQUAL, True), ("monthly_net_salary", OperatorType.GREATER_OR_EQUAL, 2000))) \
+        .add_rule(build_rule("review", ("monthly_net_salary", OperatorType.BETWEEN, [1000, 5000]))) \
+        .add_rule(build_rule("reject", ("fraud_flag", OperatorType.EQUAL, True))) \
+        .add_rule(build_rule("reject", ("monthly_net_salary", OperatorType.LESS_THAN, 1000))) \
+        .unwrap()
+
+def reason(service, process_class, knowledge_base, facts, reasoning_method=ReasoningMethod.DEDUCTION, options=None):
+    process = service.start_reasoning(process_class(reasoning_method, knowledge_base, options))
+    return service.continue_reasoning(service.set_values(process, facts))
+
+def get_decisions(process):
+    return [item.value for item in process.reasoned_items]
+
+class TestHitPolicy(unittest.TestCase):
+    def test_first_stops_at_first_hit_in_rule_order(self):
+        for service, process_class in SERVICES:
+            with self.subTest(service=service.__name__):
+                kb = build_knowledge_base(HitPolicy.FIRST)
+                process = reason(service, process_class, kb, {"vip": True, "monthly_net_salary": 3000, "fraud_flag": True})
+                self.assertEqual(process.state, ReasoningState.FINISHED)
+                self.assertEqual(get_decisions(process), ["accept"])
+                if service is SessionReasoningService:
+                    self.assertEqual(dict((rule_index, process.rule_results[rule_index]) for rule_index in process.rule_results), {0: True})
+                else:
+                    self.assertEqual([rule.evaluated for rule in kb.rule_set], [True, False, False, False])
+
+    def test_first_waits_for_undecided_earlier_rule(self):
+        for service, process_class in SERVICES:
+            with self.subTest(service=service.__name__):
+                process = reason(service, process_class, build_knowledge_base(HitPolicy.FIRST), {"monthly_net_salary": 3000})
+                # The review rule fires, but the accept rule before it is undecided
+                self.assertEqual(process.evaluation_message, EvaluationMessage.MISSING_VALUES)
+                self.assertEqual(service.get_all_missing_variable_ids(process), ["vip", "fraud_flag"])
+
+                process = service.continue_reasoning(service.set_values(process, {"vip": False}))
+                self.assertEqual(process.evaluation_message, EvaluationMessage.PASSED)
+                self.assertEqual(get_decisions(process), ["review"])
+
+    def test_priority_follows_output_priority(self):
+        for service, process_class in SERVICES:
+            with self.subTest(service=service.__name__):
+                kb = build_knowledge_base(HitPolicy.PRIORITY, ["reject", "review", "accept"])
+                process = reason(service, process_class, kb, {"vip": True, "monthly_net_salary": 3000, "fraud_flag": True})
+                self.assertEqual(get_decisions(process), ["reject"])
+                process = reason(service, process_class, kb, {"vip": True, "monthly_net_salary": 3000, "fraud_flag": False})
+                self.assertEqual(get_decisions(process), ["review"])
+
+    def test_unique_and_any_stop_at_any_hit(self):
+        for hit_policy in [HitPolicy.UNIQUE, HitPolicy.ANY]:
+            for service, process_class in SERVICES:
+                with self.subTest(hit_policy=hit_policy.name, service=service.__name__):
+                    process = reason(service, process_class, build_knowledge_base(hit_policy), {"fraud_flag": True})
+                    self.assertEqual(process.state, ReasoningState.FINISHED)
+                    self.assertEqual(get_decisions(process), ["reject"])
+
+                    process = reason(service, process_class, build_knowledge_base(hit_policy), {"fraud_flag": False, "monthly_net_salary": 7000, "vip": False})
+                    self.assertEqual(process.evaluation_message, EvaluationMessage.FAILED)
+
+    def test_unique_and_any_wait_for_rules_undecided_in_earlier_turns(self):
+        for hit_policy in [HitPolicy.UNIQUE, HitPolicy.ANY]:
+            for service, process_class in SERVICES:
+                with self.subTest(hit_policy=hit_policy.name, service=service.__name__):
+                    kb = KnowledgeBaseBuilder().set_id("kb").set_hit_policy(hit_policy) \
+                        .add_rule(build_rule("x", ("a", OperatorType.EQUAL, 1))) \
+                        .add_rule(build_rule("y", ("b", OperatorType.EQUAL, 1))) \
+                        .unwrap()
+                    process = service.start_reasoning(process_class(ReasoningMethod.DEDUCTION, kb))
+                    self.assertEqual(process.evaluation_message, EvaluationMessage.MISSING_VALUES)
+
+                    process = service.continue_reasoning(service.set_values(process, {"a": 2}))
+                    self.assertEqual(process.state, ReasoningState.STOPPED)
+                    self.assertEqual(process.evaluation_message, EvaluationMessage.MISSING_VALUES)
+                    self.assertEqual(service.get_all_missing_variable_ids(process), ["b"])
+
+                    process = service.continue_reasoning(service.set_values(process, {"b": 1}))
+                    self.assertEqual(process.state, ReasoningState.FINISHED)
+                    self.assertEqual(get_decisions(process), ["y"])
+
+    def test_hypothesis_passes_only_for_selected_conclusion(self):
+        for service, process_class in SERVICES:
+            with self.subTest(service=service.__name__):
+                kb = build_knowledge_base(HitPolicy.FIRST)
+                facts = {"vip": True, "monthly_net_salary": 3000}
+                process = reason(service, process_class, kb, facts, ReasoningMethod.HYPOTHESIS_TESTING, {"hypothesis": Variable(id="decision", value="review")})
+                self.assertEqual(process.evaluation_message, EvaluationMessage.FAILED)
+                hypothesis = Variable(id="decision", value="accept")
+                process = reason(service, process_class, kb, facts, ReasoningMethod.HYPOTHESIS_TESTING, {"hypothesis": hypothesis})
+                self.assertEqual(process.evaluation_message, EvaluationMessage.PASSED)
+                self.assertEqual(process.reasoned_items, [hypothesis])
+
+    def test_batch_backends_and_cache_follow_hit_policy(self):
+        kb = build_knowledge_base(HitPolicy.FIRST)
+        rows = [{"vip": True, "monthly_net_salary": 3000, "fraud_flag": True}, {"vip": False, "monthly_net_salary": 500, "fraud_flag": False}]
+        for backend in ["python", "index", "tree", "codegen"]:
+            with self.subTest(backend=backend):
+                results = DeductiveReasoningService.evaluate_batch(kb, rows, backend=backend)
+                self.assertEqual([[item.value for item in result.reasoned_items] for result in results], [["accept"], ["reject"]])
+
+        cache = ReasoningCache()
+        self.assertEqual(get_decisions(DeductiveReasoningService.evaluate(kb, rows[0], cache=cache)), ["accept"])
+        kb.properties["hit_policy"] = "collect"
+        self.assertEqual(sorted(get_decisions(DeductiveReasoningService.evaluate(kb, rows[0], cache=cache))), ["accept", "reject", "review"])
+        self.assertEqual(cache.get_metrics()["hits"], 0)
+
+    def test_policy_property(self):
+        kb = build_knowledge_base(HitPolicy.FIRST)
+        self.assertEqual(kb.properties["hit_policy"], "FIRST")
+        kb.properties["hit_policy"] = "priority"
+        self.assertEqual(get_hit_policy(kb), HitPolicy.PRIORITY)
+        with self.assertRaises(Exception):
+            optimize_knowledge_base(kb)
+        kb.properties["hit_policy"] = "RULE ORDER"
+        with self.assertRaises(Exception):
+            get_hit_policy(kb)
+        kb.properties = {}
+        self.assertEqual(get_hit_policy(kb), HitPolicy.COLLECT)
+
+if __name__ == '__main__':
+    unittest.main()
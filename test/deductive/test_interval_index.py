@@ -0,0 +1,70 @@
+import unittest
+import random
+from src.business_rules_reasoning.base import OperatorType
+from src.business_rules_reasoning.base.reasoning_process import ReasoningProcess
+from src.business_rules_reasoning.base.reasoning_enums import ReasoningMethod
+from src.business_rules_reasoning.deductive import KnowledgeBaseBuilder, RuleBuilder, PredicateBuilder, VariableBuilder, DeductiveReasoningService, CompiledKnowledgeBase, IntervalIndex, ReasoningSession, SessionReasoningService
+
+def build_predicate(operator, value):
+    return PredicateBuilder().configure_predicate("income", operator, value).unwrap()
+
+class TestIntervalIndex(unittest.TestCase):
+    def test_query_returns_satisfied_predicates(self):
+        predicates = [
+            build_predicate(OperatorType.BETWEEN, [0, 30000]),
+            build_predicate(OperatorType.BETWEEN, [30000, 60000]),
+            build_predicate(OperatorType.GREATER_OR_EQUAL, 60000),
+            build_predicate(OperatorType.LESS_THAN, 30000),
+            build_predicate(OperatorType.NOT_BETWEEN, [50000, 55000]),
+            build_predicate(OperatorType.EQUAL, 54000),
+        ]
+        index = IntervalIndex(predicates)
+
+        self.assertEqual(len(index.predicates), 5)
+        self.assertEqual(index.get_satisfied_predicates(54000), [predicates[1]])
+        self.assertEqual(index.get_satisfied_predicates(30000), [predicates[0], predicates[1], predicates[4]])
+        self.assertEqual(index.get_satisfied_predicates(-5.5), [predicates[3], predicates[4]])
+
+    def test_matches_predicate_evaluation(self):
+        generator = random.Random(0)
+        operators = [OperatorType.GREATER_THAN, OperatorType.GREATER_OR_EQUAL, OperatorType.LESS_THAN, OperatorType.LESS_OR_EQUAL, OperatorType.BETWEEN, OperatorType.NOT_BETWEEN]
+        for _ in range(20):
+            predicates = []
+            for _ in range(15):
+                operator = generator.choice(operators)
+                if operator in (OperatorType.BETWEEN, OperatorType.NOT_BETWEEN):
+                    value = [generator.randint(0, 20), generator.choice([generator.randint(0, 20), generator.random() * 20])]
+                else:
+                    value = generator.choice([generator.randint(0, 20), generator.random() * 20])
+                predicates.append(build_predicate(operator, value))
+            index = IntervalIndex(predicates)
+
+            for value in [generator.randint(-2, 22) for _ in range(30)] + [generator.random() * 20 for _ in range(30)]:
+                self.assertEqual(index.get_satisfied_predicates(value), [predicate for predicate in predicates if predicate.evaluate_value(value)])
+
+    def test_sessions_use_interval_index(self):
+        def build_knowledge_base():
+            builder = KnowledgeBaseBuilder().set_id("kb1")
+            for band, bounds in enumerate([[0, 30000], [30000, 60000], [60000, 90000]]):
+                builder.add_rule(RuleBuilder()
+                    .set_conclusion(VariableBuilder().set_id("band").set_value(band).unwrap())
+                    .add_predicate(PredicateBuilder().configure_predicate("income", OperatorType.BETWEEN, bounds).unwrap())
+                    .add_predicate(PredicateBuilder().configure_predicate("age", OperatorType.GREATER_OR_EQUAL, 18).unwrap())
+                    .unwrap())
+            return builder.unwrap()
+
+        kb = build_knowledge_base()
+        network = CompiledKnowledgeBase.compile(kb).get_rete_network()
+        self.assertIn("income", network.interval_indexes)
+        self.assertNotIn("age", network.interval_indexes)
+
+        for facts in [{"income": 54000, "age": 30}, {"income": 30000, "age": 30}, {"income": "high", "age": 30}, {"income": 54000}]:
+            session = SessionReasoningService.start_reasoning(ReasoningSession(ReasoningMethod.DEDUCTION, kb))
+            session = SessionReasoningService.continue_reasoning(SessionReasoningService.set_values(session, facts))
+            process = DeductiveReasoningService.start_reasoning(ReasoningProcess(ReasoningMethod.DEDUCTION, build_knowledge_base()))
+            process = DeductiveReasoningService.continue_reasoning(DeductiveReasoningService.set_values(process, facts))
+            self.assertEqual(session.evaluation_message, process.evaluation_message)
+            self.assertEqual(sorted(item.value for item in session.reasoned_items), sorted(item.value for item in process.reasoned_items))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from src.business_rules_reasoning.base import OperatorType
+from src.business_rules_reasoning.base.reasoning_process import ReasoningProcess
+from src.business_rules_reasoning.base.reasoning_enums import ReasoningMethod, EvaluationMessage
+from src.business_rules_reasoning.deductive import KnowledgeBaseBuilder, RuleBuilder, PredicateBuilder, VariableBuilder, DeductiveReasoningService, CompiledKnowledgeBase, normalize_knowledge_base
+
+def build_rule(conclusion_value, predicates):
+    builder = RuleBuilder().set_conclusion(VariableBuilder().set_id("decision").set_value(conclusion_value).unwrap())
+    for variable_id, operator, value in predicates:
+        builder.add_predicate(PredicateBuilder().configure_predicate(variable_id, operator, value).unwrap())
+    return builder.unwrap()
+
+def build_knowledge_base():
+    return KnowledgeBaseBuilder().set_id("kb1") \
+        .add_rule(build_rule("high", [("credit_score", OperatorType.GREATER_OR_EQUAL, 700), ("income", OperatorType.GREATER_THAN, 5000)])) \
+        .add_rule(build_rule("medium", [("credit_score", OperatorType.GREATER_OR_EQUAL, 700), ("income", OperatorType.LESS_OR_EQUAL, 5000)])) \
+        .add_rule(build_rule("low", [("credit_score", OperatorType.LESS_THAN, 700), ("region", OperatorType.IS_IN, ["north", "south"])])) \
+        .add_rule(build_rule("none", [("credit_score", OperatorType.LESS_THAN, 700), ("region", OperatorType.IS_IN, ["north", "south"]), ("income", OperatorType.EQUAL, 5000.0)])) \
+        .unwrap()
+
+class TestKnowledgeBaseNormalizer(unittest.TestCase):
+    def test_identical_predicates_are_interned(self):
+        kb = normalize_knowledge_base(build_knowledge_base())
+        rules = kb.rule_set
+
+        self.assertIs(rules[0].predicates[0], rules[1].predicates[0])
+        self.assertIs(rules[2].predicates[0], rules[3].predicates[0])
+        self.assertIs(rules[2].predicates[1], rules[3].predicates[1])
+        self.assertIsNot(rules[0].predicates[0], rules[2].predicates[0])
+        self.assertIsNot(rules[1].predicates[1], rules[3].predicates[2])
+
+        self.assertIs(rules[0].predicates[0].left_term, rules[2].predicates[0].left_term)
+        self.assertIs(rules[0].predicates[0].right_term, rules[2].predicates[0].right_term)
+        self.assertIsNot(rules[1].predicates[1].right_term, rules[3].predicates[2].right_term)
+
+    def test_compiled_index_counts_shared_predicates_once(self):
+        kb = normalize_knowledge_base(build_knowledge_base())
+        compiled = CompiledKnowledgeBase.compile(kb)
+
+        self.assertEqual(len(compiled.predicates_by_variable["credit_score"]), 2)
+        self.assertEqual(compiled.get_frequency("credit_score"), 4)
+
+    def test_reasoning_results_are_unchanged(self):
+        facts_list = [
+            {"credit_score": 720, "income": 6000},
+            {"credit_score": 720, "income": 5000},
+            {"credit_score": 600, "region": "North", "income": 5000},
+            {"credit_score": 600},
+            {"credit_score": "high"},
+        ]
+        for facts in facts_list:
+            results = []
+            for kb in (build_knowledge_base(), normalize_knowledge_base(build_knowledge_base())):
+                process = DeductiveReasoningService.start_reasoning(ReasoningProcess(ReasoningMethod.DEDUCTION, kb))
+                process = DeductiveReasoningService.set_values(process, facts)
+                process = DeductiveReasoningService.continue_reasoning(process)
+                results.append((process.state, process.evaluation_message, sorted(item.value for item in process.reasoned_items), DeductiveReasoningService.get_all_missing_variable_ids(process)))
+            self.assertEqual(results[0], results[1])
+
+        self.assertEqual(results[0][1], EvaluationMessage.ERROR)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from src.business_rules_reasoning.base import OperatorType
+from src.business_rules_reasoning.base.reasoning_enums import ReasoningMethod
+from src.business_rules_reasoning.deductive import KnowledgeBaseBuilder, RuleBuilder, PredicateBuilder, VariableBuilder, ReasoningSession, CompiledKnowledgeBase, specialize
+from src.business_rules_reasoning.deductive.batch_evaluation import evaluate_fact_row
+
+def build_rule(conclusion_value, predicates):
+    builder = RuleBuilder().set_conclusion(VariableBuilder().set_id("decision").set_value(conclusion_value).unwrap())
+    for variable_id, operator, value in predicates:
+        builder.add_predicate(PredicateBuilder().configure_predicate(variable_id, operator, value).unwrap())
+    return builder.unwrap()
+
+def build_knowledge_base():
+    return KnowledgeBaseBuilder().set_id("kb1") \
+        .add_rule(build_rule("high", [("country", OperatorType.EQUAL, "PL"), ("income", OperatorType.GREATER_THAN, 5000)])) \
+        .add_rule(build_rule("medium", [("country", OperatorType.EQUAL, "PL"), ("product_line", OperatorType.IS_IN, ["cash", "mortgage"]), ("income", OperatorType.LESS_OR_EQUAL, 5000)])) \
+        .add_rule(build_rule("low", [("country", OperatorType.EQUAL, "DE"), ("income", OperatorType.GREATER_THAN, 0)])) \
+        .add_rule(build_rule("none", [("income", OperatorType.EQUAL, 0)])) \
+        .unwrap()
+
+class TestKnowledgeBaseSpecializer(unittest.TestCase):
+    def test_satisfied_predicates_removed_and_contradicted_rules_dropped(self):
+        kb = build_knowledge_base()
+        specialized = specialize(kb, {"country": "PL", "product_line": "cash"})
+
+        self.assertEqual([rule.conclusion.get_value() for rule in specialized.rule_set], ["high", "medium", "none"])
+        self.assertEqual([[predicate.left_term.id for predicate in rule.predicates] for rule in specialized.rule_set], [["income"], ["income"], ["income"]])
+        self.assertEqual(CompiledKnowledgeBase.compile(specialized).variable_ids, ["income"])
+        # The source knowledge base is left untouched
+        self.assertEqual(len(kb.rule_set), 4)
+        self.assertEqual(len(kb.rule_set[1].predicates), 3)
+        self.assertIsNone(kb.rule_set[0].predicates[0].left_term.value)
+
+    def test_specialized_results_match_full_evaluation(self):
+        kb = build_knowledge_base()
+        fixed_facts = {"country": "PL", "product_line": "loan"}
+        specialized = specialize(kb, fixed_facts)
+        full_session = ReasoningSession(ReasoningMethod.DEDUCTION, kb)
+        specialized_session = ReasoningSession(ReasoningMethod.DEDUCTION, specialized)
+
+        for income in [0, 3000, 9000]:
+            full = evaluate_fact_row(full_session, dict(fixed_facts, income=income))
+            partial = evaluate_fact_row(specialized_session, {"income": income})
+            self.assertEqual(partial.evaluation_message, full.evaluation_message)
+            self.assertEqual([item.value for item in partial.reasoned_items], [item.value for item in full.reasoned_items])
+
+    def test_type_mismatch_on_fixed_fact_raises(self):
+        with self.assertRaises(Exception) as context:
+            specialize(build_knowledge_base(), {"income": "high"})
+        self.assertIn("Cannot specialize predicate", str(context.exception))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from src.business_rules_reasoning.base import OperatorType
+from src.business_rules_reasoning.base.reasoning_process import ReasoningProcess
+from src.business_rules_reasoning.base.reasoning_enums import ReasoningMethod
+from src.business_rules_reasoning.deductive import KnowledgeBaseBuilder, RuleBuilder, PredicateBuilder, VariableBuilder, DeductiveReasoningService, PredicateStatistics, order_predicates_by_cost
+
+def build_knowledge_base():
+    rule = RuleBuilder() \
+        .set_conclusion(VariableBuilder().set_id("decision").set_value("accept").unwrap()) \
+        .add_predicate(PredicateBuilder().configure_predicate("region", OperatorType.IS_IN, ["north", "south", "east"]).unwrap()) \
+        .add_predicate(PredicateBuilder().configure_predicate("age", OperatorType.BETWEEN, [18, 65]).unwrap()) \
+        .add_predicate(PredicateBuilder().configure_predicate("income", OperatorType.GREATER_THAN, 5000).unwrap()) \
+        .add_predicate(PredicateBuilder().configure_predicate("fraud_flag", OperatorType.EQUAL, False).unwrap()) \
+        .unwrap()
+    return KnowledgeBaseBuilder().set_id("kb1").add_rule(rule).unwrap()
+
+def get_order(kb):
+    return [predicate.left_term.id for predicate in kb.rule_set[0].predicates]
+
+class TestPredicateOrdering(unittest.TestCase):
+    def test_cheap_comparisons_go_before_list_scans(self):
+        kb = order_predicates_by_cost(build_knowledge_base())
+        self.assertEqual(get_order(kb), ["income", "fraud_flag", "age", "region"])
+
+    def test_observed_failures_move_selective_predicates_first(self):
+        kb = build_knowledge_base()
+        statistics = PredicateStatistics()
+        statistics.observe(kb, [{"income": 6000, "fraud_flag": False, "age": 70} for _ in range(20)])
+        self.assertAlmostEqual(statistics.get_failure_rate(kb.rule_set[0].predicates[1]), 21 / 22)
+
+        kb = order_predicates_by_cost(kb, statistics)
+        self.assertEqual(get_order(kb), ["age", "region", "income", "fraud_flag"])
+
+    def test_reasoning_results_are_unchanged(self):
+        facts = {"region": "North", "age": 30, "income": 7000, "fraud_flag": False}
+        for kb in (build_knowledge_base(), order_predicates_by_cost(build_knowledge_base())):
+            process = DeductiveReasoningService.start_reasoning(ReasoningProcess(ReasoningMethod.DEDUCTION, kb))
+            process = DeductiveReasoningService.set_values(process, facts)
+            process = DeductiveReasoningService.continue_reasoning(process)
+            self.assertEqual([item.value for item in process.reasoned_items], ["accept"])
+
+if __name__ == '__main__':
+    unittest.main()
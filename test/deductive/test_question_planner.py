@@ -0,0 +1,87 @@
+import unittest
+import itertools
+from src.business_rules_reasoning.base import ReasoningProcess, ReasoningState, Variable
+from src.business_rules_reasoning.base.reasoning_enums import ReasoningMethod
+from src.business_rules_reasoning.deductive import ReasoningSession, SessionReasoningService, DeductiveReasoningService, QuestionPlanner, PredicateStatistics, CompiledKnowledgeBase
+from test.deductive.knowledge_bases import build_decision_knowledge_base
+
+VALUES = {
+    "fraud_flag": [True, False],
+    "income": [1000, 5000],
+    "debt": [0, 900],
+    "region": ["north", "East"],
+}
+
+def get_most_frequent_missing_variable(session):
+    compiled = CompiledKnowledgeBase.compile(session.knowledge_base)
+    variable_id = next(variable_id for variable_id in compiled.variable_ids if session.facts.get(variable_id) is None)
+    return compiled.predicates_by_variable[variable_id][0].right_term
+
+def count_questions(row, choose_variable, reasoning_method=ReasoningMethod.DEDUCTION, options=None):
+    session = SessionReasoningService.start_reasoning(ReasoningSession(reasoning_method, build_decision_knowledge_base(), options))
+    questions = 0
+    while session.state != ReasoningState.FINISHED:
+        variable = choose_variable(session)
+        questions += 1
+        session = SessionReasoningService.continue_reasoning(SessionReasoningService.set_values(session, {variable.id: row[variable.id]}))
+    return questions, session
+
+class TestQuestionPlanner(unittest.TestCase):
+    def test_skips_variables_of_failed_rules(self):
+        session = SessionReasoningService.start_reasoning(ReasoningSession(ReasoningMethod.DEDUCTION, build_decision_knowledge_base()))
+        planner = QuestionPlanner(session.knowledge_base)
+        self.assertEqual(planner.get_next_variable(session).id, "fraud_flag")
+
+        session = SessionReasoningService.continue_reasoning(SessionReasoningService.set_values(session, {"fraud_flag": True}))
+        # Rules testing income already failed on fraud_flag
+        self.assertEqual([variable.id for variable in planner.rank_missing_variables(session)], ["debt", "region"])
+
+    def test_facts_set_before_continuing_are_considered(self):
+        process = DeductiveReasoningService.start_reasoning(ReasoningProcess(ReasoningMethod.DEDUCTION, build_decision_knowledge_base()))
+        process = DeductiveReasoningService.set_values(process, {"fraud_flag": False, "debt": 0})
+        planner = QuestionPlanner(process.knowledge_base)
+
+        self.assertEqual([variable.id for variable in planner.rank_missing_variables(process)], ["income"])
+        self.assertIsNone(planner.get_next_variable(process, exclude=["income"]))
+
+    def test_hypothesis_testing_asks_only_relevant_variables(self):
+        hypothesis = Variable(id="decision", value="escalate")
+        session = SessionReasoningService.start_reasoning(ReasoningSession(ReasoningMethod.HYPOTHESIS_TESTING, build_decision_knowledge_base(), {"hypothesis": hypothesis}))
+
+        self.assertEqual([variable.id for variable in QuestionPlanner(session.knowledge_base).rank_missing_variables(session)], ["debt", "region"])
+
+    def test_planner_is_cached_per_compiled_knowledge_base(self):
+        kb = build_decision_knowledge_base()
+        planner = CompiledKnowledgeBase.compile(kb).get_question_planner()
+        self.assertIs(CompiledKnowledgeBase.compile(kb).get_question_planner(), planner)
+        kb.rule_set = kb.rule_set[1:]
+        self.assertIsNot(CompiledKnowledgeBase.compile(kb).get_question_planner(), planner)
+
+    def test_statistics_change_the_plan(self):
+        knowledge_base = build_decision_knowledge_base()
+        statistics = PredicateStatistics()
+        statistics.observe(knowledge_base, [{"region": "East"}] * 20)
+        session = SessionReasoningService.start_reasoning(ReasoningSession(ReasoningMethod.DEDUCTION, knowledge_base))
+        session = SessionReasoningService.continue_reasoning(SessionReasoningService.set_values(session, {"fraud_flag": True}))
+
+        # Region almost always fails, so it decides the escalate rule
+        self.assertEqual(QuestionPlanner(knowledge_base, statistics).get_next_variable(session).id, "region")
+
+    def test_planned_questions_reach_the_same_result_with_fewer_questions(self):
+        planned_total = 0
+        frequency_total = 0
+        for combination in itertools.product(*VALUES.values()):
+            row = dict(zip(VALUES, combination))
+            planned, planned_session = count_questions(row, lambda session: QuestionPlanner(session.knowledge_base).get_next_variable(session))
+            by_frequency, frequency_session = count_questions(row, get_most_frequent_missing_variable)
+
+            self.assertEqual(planned_session.evaluation_message, frequency_session.evaluation_message)
+            self.assertEqual([item.value for item in planned_session.reasoned_items], [item.value for item in frequency_session.reasoned_items])
+            self.assertLessEqual(planned, by_frequency)
+            planned_total += planned
+            frequency_total += by_frequency
+
+        self.assertLess(planned_total, frequency_total)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+from unittest.mock import patch
+from src.business_rules_reasoning.base import Variable, OperatorType, Rule
+from src.business_rules_reasoning.base.reasoning_enums import EvaluationMessage, ReasoningMethod
+from src.business_rules_reasoning.deductive import DeductiveReasoningService, ReasoningCache, PredicateBuilder, CompiledKnowledgeBase
+from test.deductive.knowledge_bases import build_loan_knowledge_base, build_rule
+
+class TestReasoningCache(unittest.TestCase):
+    def test_repeated_rows_are_served_from_cache(self):
+        kb = build_loan_knowledge_base()
+        cache = ReasoningCache()
+        rows = [
+            {"monthly_net_salary": 3000, "fraud_flag": False},
+            {"fraud_flag": False, "monthly_net_salary": 3000, "applicant_name": "John"},
+            {"monthly_net_salary": 1000},
+            {"monthly_net_salary": "high", "fraud_flag": False},
+        ]
+
+        results = DeductiveReasoningService.evaluate_batch(kb, rows, cache=cache)
+        self.assertEqual([result.evaluation_message for result in results], [EvaluationMessage.PASSED, EvaluationMessage.PASSED, EvaluationMessage.PASSED, EvaluationMessage.ERROR])
+        # Columns the knowledge base does not test do not count toward the key
+        self.assertEqual(cache.get_metrics()["hits"], 1)
+        self.assertEqual(cache.get_metrics()["size"], 2)
+
+        with patch("src.business_rules_reasoning.deductive.deductive_reasoning_service.evaluate_fact_row") as evaluate_fact_row:
+            result = DeductiveReasoningService.evaluate(kb, {"monthly_net_salary": 1000}, cache=cache)
+            evaluate_fact_row.assert_not_called()
+        self.assertEqual([(item.id, item.value) for item in result.reasoned_items], [("loan_accepted", False)])
+        self.assertEqual(cache.get_metrics()["hit_rate"], 0.4)
+
+    def test_key_includes_method_and_hypothesis(self):
+        kb = build_loan_knowledge_base()
+        cache = ReasoningCache()
+        row = {"monthly_net_salary": 3000, "fraud_flag": False}
+        DeductiveReasoningService.evaluate(kb, row, cache=cache)
+        result = DeductiveReasoningService.evaluate(kb, row, ReasoningMethod.HYPOTHESIS_TESTING, {"hypothesis": Variable(id="loan_accepted", value=False)}, cache=cache)
+        self.assertEqual(result.evaluation_message, EvaluationMessage.FAILED)
+        result = DeductiveReasoningService.evaluate(kb, row, ReasoningMethod.HYPOTHESIS_TESTING, {"hypothesis": Variable(id="loan_accepted", value=True)}, cache=cache)
+        self.assertEqual(result.evaluation_message, EvaluationMessage.PASSED)
+        self.assertEqual(cache.get_metrics()["hits"], 0)
+
+    def test_knowledge_base_change_invalidates_results(self):
+        kb = build_loan_knowledge_base()
+        cache = ReasoningCache()
+        row = {"monthly_net_salary": 3000, "fraud_flag": False}
+        self.assertEqual(DeductiveReasoningService.evaluate(kb, row, cache=cache).evaluation_message, EvaluationMessage.PASSED)
+
+        kb.rule_set[0].predicates.append(PredicateBuilder().configure_predicate("monthly_net_salary", OperatorType.GREATER_THAN, 5000).unwrap())
+        kb.rule_set = list(kb.rule_set)
+        self.assertEqual(DeductiveReasoningService.evaluate(kb, row, cache=cache).evaluation_message, EvaluationMessage.FAILED)
+        self.assertEqual(cache.get_metrics()["hits"], 0)
+
+    def test_right_term_changed_in_place_invalidates_results(self):
+        kb = build_loan_knowledge_base()
+        cache = ReasoningCache()
+        row = {"monthly_net_salary": 3000, "fraud_flag": False}
+        self.assertEqual(DeductiveReasoningService.evaluate(kb, row, cache=cache).evaluation_message, EvaluationMessage.PASSED)
+
+        for rule in kb.rule_set:
+            for predicate in rule.predicates:
+                if predicate.left_term.id == "monthly_net_salary":
+                    predicate.right_term.value = 5000 if predicate.operator == OperatorType.GREATER_OR_EQUAL else 0
+        CompiledKnowledgeBase.invalidate(kb)
+        expected = DeductiveReasoningService.evaluate(kb, row)
+        self.assertEqual(expected.evaluation_message, EvaluationMessage.FAILED)
+        result = DeductiveReasoningService.evaluate(kb, row, cache=cache)
+        self.assertEqual((result.evaluation_message, result.reasoned_items), (expected.evaluation_message, expected.reasoned_items))
+        self.assertEqual(cache.get_metrics()["hits"], 0)
+
+    def test_hits_do_not_walk_the_rule_set(self):
+        kb = build_loan_knowledge_base()
+        for threshold in range(2000):
+            kb.rule_set.append(build_rule("review", [("monthly_net_salary", OperatorType.EQUAL, threshold)]))
+        cache = ReasoningCache()
+        row = {"monthly_net_salary": 3000, "fraud_flag": False}
+        DeductiveReasoningService.evaluate(kb, row, cache=cache)
+
+        # Any access to a rule fails, so the cost of a hit cannot depend on the rule count
+        with patch.object(Rule, "predicates", property(lambda rule: self.fail("rule walked"))), patch.object(Rule, "conclusion", property(lambda rule: self.fail("rule walked"))):
+            result = DeductiveReasoningService.evaluate(kb, row, cache=cache)
+        self.assertEqual([(item.id, item.value) for item in result.reasoned_items], [("loan_accepted", True)])
+        self.assertEqual(cache.get_metrics()["hits"], 1)
+
+    def test_lru_eviction_and_ttl(self):
+        kb = build_loan_knowledge_base()
+        cache = ReasoningCache(max_size=2)
+        for salary in [1000, 1100, 1200]:
+            DeductiveReasoningService.evaluate(kb, {"monthly_net_salary": salary}, cache=cache)
+        DeductiveReasoningService.evaluate(kb, {"monthly_net_salary": 1000}, cache=cache)
+        self.assertEqual(cache.get_metrics()["evictions"], 2)
+        self.assertEqual(cache.get_metrics()["hits"], 0)
+
+        cache = ReasoningCache(ttl=10)
+        with patch("src.business_rules_reasoning.deductive.reasoning_cache.time.monotonic", side_effect=[0, 5, 20, 20]):
+            for _ in range(3):
+                DeductiveReasoningService.evaluate(kb, {"monthly_net_salary": 1000}, cache=cache)
+        self.assertEqual(cache.get_metrics()["hits"], 1)
+        self.assertEqual(cache.get_metrics()["expirations"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
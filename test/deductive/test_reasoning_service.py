@@ -158,6 +158,23 @@ class TestReasoningService(unittest.TestCase):
         self.assertEqual(len(result.reasoned_items), 1)
         self.assertEqual(result.reasoned_items[0].id, "conclusion")
 
+    def test_deduction_reports_equal_conclusions_once(self):
+        kb_builder = KnowledgeBaseBuilder().set_id("kb1")
+        for variable_id in ["1", "2"]:
+            kb_builder.add_rule(RuleBuilder()
+                .set_conclusion(VariableBuilder().set_id("conclusion").set_value(True).unwrap())
+                .add_predicate(PredicateBuilder().configure_predicate(variable_id, OperatorType.LESS_THAN, 10).unwrap())
+                .unwrap())
+        kb = kb_builder.unwrap()
+
+        rp = DeductiveReasoningService.start_reasoning(ReasoningProcess(ReasoningMethod.DEDUCTION, kb))
+        rp = DeductiveReasoningService.continue_reasoning(DeductiveReasoningService.set_values(rp, {"1": 5, "2": 5}))
+        self.assertEqual([(item.id, item.value) for item in rp.reasoned_items], [("conclusion", True)])
+        for backend in ["python", "numpy", "index", "tree", "codegen"]:
+            with self.subTest(backend=backend):
+                result = DeductiveReasoningService.evaluate_batch(kb, [{"1": 5, "2": 5}], backend=backend)[0]
+                self.assertEqual([(item.id, item.value) for item in result.reasoned_items], [("conclusion", True)])
+
     def test_hypothesis_testing(self):
         kb = KnowledgeBase(reasoning_type=ReasoningType.CRISP)
         left_term = Variable(id="var1", value=5)
@@ -172,6 +189,40 @@ class TestReasoningService(unittest.TestCase):
         self.assertEqual(result.state, ReasoningState.FINISHED)
         self.assertEqual(result.evaluation_message, EvaluationMessage.PASSED)
 
+    def test_deduction_with_conclusion_as_fact(self):
+        def build_chained_knowledge_base():
+            eligible = RuleBuilder() \
+                .set_conclusion(VariableBuilder().set_id("eligible").set_value(True).unwrap()) \
+                .add_predicate(PredicateBuilder().configure_predicate("monthly_net_salary", OperatorType.GREATER_OR_EQUAL, 2000).unwrap()) \
+                .unwrap()
+            accepted = RuleBuilder() \
+                .set_conclusion(VariableBuilder().set_id("loan_accepted").set_value(True).unwrap()) \
+                .add_predicate(PredicateBuilder().configure_predicate("eligible", OperatorType.EQUAL, True).unwrap()) \
+                .add_predicate(PredicateBuilder().configure_predicate("fraud_flag", OperatorType.EQUAL, False).unwrap()) \
+                .unwrap()
+            # Feeds back into the first conclusion, the cycle must stop
+            cycle = RuleBuilder() \
+                .set_conclusion(VariableBuilder().set_id("eligible").set_value(True).unwrap()) \
+                .add_predicate(PredicateBuilder().configure_predicate("loan_accepted", OperatorType.EQUAL, True).unwrap()) \
+                .unwrap()
+            return KnowledgeBaseBuilder().set_id("kb1").add_rule(accepted).add_rule(cycle).add_rule(eligible).unwrap()
+
+        rp = ReasoningProcess(ReasoningMethod.DEDUCTION, build_chained_knowledge_base())
+        rp = DeductiveReasoningService.start_reasoning(rp)
+        rp = DeductiveReasoningService.set_values(rp, {"monthly_net_salary": 3000, "fraud_flag": False})
+        rp = DeductiveReasoningService.continue_reasoning(rp)
+        self.assertEqual(rp.evaluation_message, EvaluationMessage.MISSING_VALUES)
+        self.assertEqual([item.id for item in rp.reasoned_items], ["eligible"])
+
+        rp = ReasoningProcess(ReasoningMethod.DEDUCTION, build_chained_knowledge_base(), {"conclusion_as_fact": True})
+        rp = DeductiveReasoningService.start_reasoning(rp)
+        rp = DeductiveReasoningService.set_values(rp, {"monthly_net_salary": 3000, "fraud_flag": False})
+        rp = DeductiveReasoningService.continue_reasoning(rp)
+        # The last rule fires on the derived loan_accepted, eligible is not asserted again
+        self.assertEqual(rp.state, ReasoningState.FINISHED)
+        self.assertEqual(rp.evaluation_message, EvaluationMessage.PASSED)
+        self.assertEqual([(item.id, item.value) for item in rp.reasoned_items], [("eligible", True), ("loan_accepted", True)])
+
 class TestLeasingDocumentProcessingKB(unittest.TestCase):
     def test_leasing_document_processing_kb(self):
         # Build the knowledge base
@@ -0,0 +1,74 @@
+import unittest
+import random
+from src.business_rules_reasoning.base.reasoning_process import ReasoningProcess
+from src.business_rules_reasoning.base.reasoning_enums import ReasoningMethod
+from src.business_rules_reasoning.deductive import ReasoningSession, SessionReasoningService, DeductiveReasoningService, CompiledKnowledgeBase
+from src.business_rules_reasoning.deductive.rete_network import ReteNetwork
+from test.deductive.knowledge_bases import build_decision_knowledge_base
+
+class TestReteNetwork(unittest.TestCase):
+    def test_equal_predicates_share_alpha_node(self):
+        network = CompiledKnowledgeBase.compile(build_decision_knowledge_base()).get_rete_network()
+
+        self.assertEqual(len(network.alpha_nodes), 7)
+        fraud_nodes = network.alpha_indexes_by_variable["fraud_flag"]
+        self.assertEqual(len(fraud_nodes), 2)
+        self.assertEqual(network.alpha_nodes[fraud_nodes[1]].rule_indexes, [1, 2])
+
+    def test_value_key_keeps_types_apart(self):
+        self.assertNotEqual(ReteNetwork.get_value_key(1), ReteNetwork.get_value_key(True))
+        self.assertNotEqual(ReteNetwork.get_value_key(1), ReteNetwork.get_value_key(1.0))
+        self.assertEqual(ReteNetwork.get_value_key(["a", 1]), ReteNetwork.get_value_key(["a", 1]))
+
+    def test_set_values_activates_only_affected_rules(self):
+        kb = build_decision_knowledge_base()
+        session = SessionReasoningService.start_reasoning(ReasoningSession(ReasoningMethod.DEDUCTION, kb))
+        self.assertEqual(session.agenda, set())
+
+        session = SessionReasoningService.set_values(session, {"region": "north"})
+        self.assertEqual(session.agenda, {3})
+
+        session = SessionReasoningService.set_values(session, {"income": 1000})
+        self.assertEqual(session.agenda, {1, 2, 3})
+
+    def test_alpha_node_evaluated_once_per_session(self):
+        kb = build_decision_knowledge_base()
+        session = ReasoningSession(ReasoningMethod.DEDUCTION, kb)
+        session = SessionReasoningService.set_values(session, {"fraud_flag": False})
+        session = SessionReasoningService.start_reasoning(session)
+        session = SessionReasoningService.set_values(session, {"fraud_flag": False, "income": 2500})
+        session = SessionReasoningService.continue_reasoning(session)
+
+        network = CompiledKnowledgeBase.compile(kb).get_rete_network()
+        evaluated = [network.alpha_nodes[index].variable_id for index in session.node_results]
+        self.assertEqual(sorted(evaluated), ["fraud_flag", "fraud_flag", "income", "income"])
+        self.assertEqual(session.rule_results, {0: False, 1: False})
+
+    def test_incremental_reasoning_matches_stateful_engine(self):
+        values = {
+            "fraud_flag": [True, False],
+            "income": [1000, 2000, 5000],
+            "debt": [0, 500, 900],
+            "region": ["north", "East"],
+        }
+        for seed in range(20):
+            generator = random.Random(seed)
+            variable_ids = list(values)
+            generator.shuffle(variable_ids)
+
+            session = SessionReasoningService.start_reasoning(ReasoningSession(ReasoningMethod.DEDUCTION, build_decision_knowledge_base()))
+            process = DeductiveReasoningService.start_reasoning(ReasoningProcess(ReasoningMethod.DEDUCTION, build_decision_knowledge_base()))
+            for variable_id in variable_ids:
+                fact = {variable_id: generator.choice(values[variable_id])}
+                session = SessionReasoningService.continue_reasoning(SessionReasoningService.set_values(session, fact))
+                process = DeductiveReasoningService.continue_reasoning(DeductiveReasoningService.set_values(process, fact))
+
+                self.assertEqual(session.state, process.state)
+                self.assertEqual(session.evaluation_message, process.evaluation_message)
+                self.assertEqual(
+                    sorted(item.value for item in session.reasoned_items),
+                    sorted(item.value for item in process.reasoned_items)
+                )
+
+if __name__ == '__main__':
+    unittest.main()
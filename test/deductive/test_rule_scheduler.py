@@ -0,0 +1,68 @@
+import unittest
+import random
+from src.business_rules_reasoning.base import OperatorType
+from src.business_rules_reasoning.base.reasoning_process import ReasoningProcess
+from src.business_rules_reasoning.base.reasoning_enums import ReasoningMethod
+from src.business_rules_reasoning.deductive import KnowledgeBaseBuilder, RuleBuilder, PredicateBuilder, VariableBuilder, DeductiveReasoningService, CompiledKnowledgeBase
+from src.business_rules_reasoning.deductive.rule_scheduler import RuleScheduler
+
+VARIABLE_IDS = ["a", "b", "c", "d", "e"]
+
+def build_knowledge_base(generator: random.Random):
+    builder = KnowledgeBaseBuilder().set_id("kb1")
+    for rule_index in range(30):
+        rule = RuleBuilder().set_conclusion(VariableBuilder().set_id("result").set_value(rule_index).unwrap())
+        for variable_id in generator.sample(VARIABLE_IDS, generator.randint(1, 3)):
+            rule.add_predicate(PredicateBuilder().configure_predicate(variable_id, OperatorType.GREATER_THAN, generator.randint(0, 10)).unwrap())
+        builder.add_rule(rule.unwrap())
+    return builder.unwrap()
+
+def sort_rules(rules):
+    rules.sort(key=lambda rule: (any(predicate.left_term.is_empty() for predicate in rule.predicates), len(rule.predicates)))
+
+class TestRuleScheduler(unittest.TestCase):
+    def test_order_matches_repeated_stable_sort(self):
+        for seed in range(10):
+            generator = random.Random(seed)
+            kb = build_knowledge_base(generator)
+            compiled = CompiledKnowledgeBase.compile(kb)
+            scheduler = compiled.get_rule_scheduler()
+            expected = list(kb.rule_set)
+
+            for _ in range(15):
+                variables = {variable_id: generator.choice([None, 5]) for variable_id in generator.sample(VARIABLE_IDS, 2)}
+                compiled.set_values(variables)
+                sort_rules(expected)
+                self.assertEqual([compiled.rule_set[rule_index] for rule_index in scheduler.get_order()], expected)
+                subset = generator.sample(range(len(kb.rule_set)), 8)
+                self.assertEqual(scheduler.get_order(subset), [rule_index for rule_index in scheduler.get_order() if rule_index in subset])
+
+    def test_rule_states(self):
+        kb = KnowledgeBaseBuilder().set_id("kb1").add_rule(
+            RuleBuilder().set_conclusion(VariableBuilder().set_id("result").set_value(True).unwrap())
+                .add_predicate(PredicateBuilder().configure_predicate("a", OperatorType.EQUAL, 1).unwrap())
+                .add_predicate(PredicateBuilder().configure_predicate("b", OperatorType.EQUAL, 1).unwrap())
+                .unwrap()
+        ).unwrap()
+        compiled = CompiledKnowledgeBase.compile(kb)
+        scheduler = compiled.get_rule_scheduler()
+
+        self.assertEqual(scheduler.get_state(0), RuleScheduler.BLOCKED)
+        compiled.set_values({"a": 1})
+        self.assertEqual(scheduler.get_state(0), RuleScheduler.PARTIALLY_READY)
+        compiled.set_values({"b": 1})
+        self.assertEqual(scheduler.get_state(0), RuleScheduler.READY)
+
+    def test_reasoning_does_not_reorder_knowledge_base(self):
+        kb = build_knowledge_base(random.Random(0))
+        rule_order = list(kb.rule_set)
+
+        process = DeductiveReasoningService.start_reasoning(ReasoningProcess(ReasoningMethod.DEDUCTION, kb))
+        process = DeductiveReasoningService.set_values(process, {"a": 6, "b": 6})
+        process = DeductiveReasoningService.continue_reasoning(process)
+
+        self.assertEqual(kb.rule_set, rule_order)
+        self.assertTrue(process.reasoned_items)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import itertools
+from src.business_rules_reasoning.base import OperatorType
+from src.business_rules_reasoning.base.reasoning_enums import ReasoningMethod
+from src.business_rules_reasoning.deductive import KnowledgeBaseBuilder, RuleBuilder, PredicateBuilder, VariableBuilder, ReasoningSession, CompiledKnowledgeBase, optimize_knowledge_base
+from src.business_rules_reasoning.deductive.batch_evaluation import evaluate_fact_row
+
+def build_rule(conclusion_value, predicates):
+    builder = RuleBuilder().set_conclusion(VariableBuilder().set_id("decision").set_value(conclusion_value).unwrap())
+    for variable_id, operator, value in predicates:
+        builder.add_predicate(PredicateBuilder().configure_predicate(variable_id, operator, value).unwrap())
+    return builder.unwrap()
+
+def build_knowledge_base():
+    return KnowledgeBaseBuilder().set_id("kb1") \
+        .add_rule(build_rule("high", [("income", OperatorType.GREATER_OR_EQUAL, 5000), ("region", OperatorType.EQUAL, "north")])) \
+        .add_rule(build_rule("high", [("region", OperatorType.EQUAL, "north"), ("income", OperatorType.GREATER_OR_EQUAL, 5000)])) \
+        .add_rule(build_rule("high", [("income", OperatorType.GREATER_THAN, 8000), ("region", OperatorType.EQUAL, "north"), ("debt", OperatorType.EQUAL, 0)])) \
+        .add_rule(build_rule("medium", [("income", OperatorType.GREATER_OR_EQUAL, 2000), ("income", OperatorType.LESS_THAN, 3000), ("income", OperatorType.GREATER_THAN, 1000)])) \
+        .add_rule(build_rule("medium", [("income", OperatorType.GREATER_OR_EQUAL, 3000), ("income", OperatorType.LESS_THAN, 5000)])) \
+        .add_rule(build_rule("low", [("income", OperatorType.LESS_THAN, 1000), ("income", OperatorType.GREATER_THAN, 1500)])) \
+        .add_rule(build_rule("low", [("debt", OperatorType.BETWEEN, [10, 5])])) \
+        .add_rule(build_rule("low", [("debt", OperatorType.GREATER_THAN, 500), ("region", OperatorType.IS_IN, ["north", "south"])])) \
+        .add_rule(build_rule("none", [("segment", OperatorType.IS_IN, [])])) \
+        .unwrap()
+
+VALUES = {
+    "income": [0, 999.5, 1000, 1500, 2000, 2999, 3000, 4999, 5000, 8000, 9000],
+    "region": ["north", "south", "east"],
+    "debt": [0, 7, 500, 900],
+    # An empty list is in the empty list
+    "segment": ["retail", []],
+}
+
+def get_conclusions(session, row):
+    result = evaluate_fact_row(session, row)
+    return result.evaluation_message, {(item.id, item.value) for item in result.reasoned_items}
+
+class TestRuleSetOptimizer(unittest.TestCase):
+    def test_optimized_rule_set(self):
+        kb = build_knowledge_base()
+        report = optimize_knowledge_base(kb)
+
+        self.assertEqual([rule.display() for rule in kb.rule_set], [
+            "(income >= 5000 ∧ region = north) → decision = high",
+            "(income >= 2000 ∧ income < 5000) → decision = medium",
+            "(debt > 500 ∧ region IN ['north', 'south']) → decision = low",
+            "(segment IN []) → decision = none",
+        ])
+        self.assertEqual((report.initial_rule_count, len(report.rule_set)), (9, 4))
+        self.assertEqual((report.dead_rules, report.duplicate_rules, report.subsumed_rules, report.merged_rules, report.redundant_predicates), (2, 1, 1, 1, 1))
+        self.assertEqual(len(report.changes), 6)
+        self.assertIn("Rules: 9 -> 4", report.display())
+        self.assertEqual(len(CompiledKnowledgeBase.compile(kb).rule_set), 4)
+
+    def test_deduction_is_equivalent(self):
+        original = ReasoningSession(ReasoningMethod.DEDUCTION, build_knowledge_base())
+        optimized_kb = build_knowledge_base()
+        optimize_knowledge_base(optimized_kb)
+        optimized = ReasoningSession(ReasoningMethod.DEDUCTION, optimized_kb)
+
+        for values in itertools.product(*VALUES.values()):
+            row = dict(zip(VALUES.keys(), values))
+            with self.subTest(row=row):
+                self.assertEqual(get_conclusions(optimized, dict(row)), get_conclusions(original, dict(row)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import unittest
+import random
+from concurrent.futures import ThreadPoolExecutor
+from src.business_rules_reasoning.base import Variable, OperatorType, ReasoningProcess
+from src.business_rules_reasoning.base.reasoning_enums import ReasoningState, EvaluationMessage, ReasoningMethod
+from src.business_rules_reasoning.deductive import KnowledgeBaseBuilder, RuleBuilder, PredicateBuilder, VariableBuilder, ReasoningSession, SessionReasoningService, DeductiveReasoningService, CompiledKnowledgeBase
+from test.deductive.knowledge_bases import build_loan_knowledge_base, build_decision_knowledge_base
+
+class TestSessionReasoningService(unittest.TestCase):
+    def test_sessions_do_not_mutate_knowledge_base(self):
+        kb = build_loan_knowledge_base()
+        rule_order = list(kb.rule_set)
+
+        session = SessionReasoningService.start_reasoning(ReasoningSession(ReasoningMethod.DEDUCTION, kb))
+        self.assertEqual(session.state, ReasoningState.STOPPED)
+        self.assertEqual(session.evaluation_message, EvaluationMessage.MISSING_VALUES)
+        self.assertEqual(SessionReasoningService.get_all_missing_variable_ids(session), ["monthly_net_salary", "fraud_flag"])
+
+        session = SessionReasoningService.set_values(session, {"monthly_net_salary": 3000, "fraud_flag": False})
+        session = SessionReasoningService.continue_reasoning(session)
+        self.assertEqual(session.state, ReasoningState.FINISHED)
+        self.assertEqual(session.evaluation_message, EvaluationMessage.PASSED)
+        self.assertEqual([(item.id, item.value) for item in session.reasoned_items], [("loan_accepted", True)])
+
+        self.assertEqual(kb.rule_set, rule_order)
+        for rule in kb.rule_set:
+            self.assertFalse(rule.evaluated)
+            for predicate in rule.predicates:
+                self.assertIsNone(predicate.left_term.value)
+                self.assertFalse(predicate.evaluated)
+
+    def test_concurrent_sessions_share_knowledge_base(self):
+        kb = build_loan_knowledge_base()
+
+        def reason(salary):
+            session = ReasoningSession(ReasoningMethod.DEDUCTION, kb)
+            session = SessionReasoningService.start_reasoning(session)
+            session = SessionReasoningService.set_values(session, {"monthly_net_salary": salary, "fraud_flag": False})
+            session = SessionReasoningService.continue_reasoning(session)
+            return salary, [item.value for item in session.reasoned_items]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(reason, [1000 + 100 * i for i in range(40)]))
+
+        for salary, reasoned_values in results:
+            self.assertEqual(reasoned_values, [salary >= 2000])
+
+    def test_session_keeps_compiled_knowledge_base_until_restarted(self):
+        kb = build_loan_knowledge_base()
+        session = SessionReasoningService.start_reasoning(ReasoningSession(ReasoningMethod.DEDUCTION, kb))
+        compiled = session.compiled
+        self.assertIsNotNone(compiled)
+
+        kb.rule_set[0].predicates[0].right_term.value = 5000
+        CompiledKnowledgeBase.invalidate(kb)
+        session = SessionReasoningService.continue_reasoning(SessionReasoningService.set_values(session, {"monthly_net_salary": 3000, "fraud_flag": False}))
+        # Results of a running session refer to the index it started with
+        self.assertIs(session.compiled, compiled)
+        self.assertEqual(session.evaluation_message, EvaluationMessage.PASSED)
+
+        session = SessionReasoningService.start_reasoning(session)
+        self.assertIsNot(session.compiled, compiled)
+        session = SessionReasoningService.continue_reasoning(SessionReasoningService.set_values(session, {"monthly_net_salary": 3000, "fraud_flag": False}))
+        self.assertEqual(session.evaluation_message, EvaluationMessage.FAILED)
+
+    def test_hypothesis_testing(self):
+        kb = build_loan_knowledge_base()
+        session = ReasoningSession(ReasoningMethod.HYPOTHESIS_TESTING, kb, options={"hypothesis": Variable(id="loan_accepted", value=False)})
+        session = SessionReasoningService.start_reasoning(session)
+        # fraud_flag is tested only by the rule concluding the other value
+        self.assertEqual(SessionReasoningService.get_all_missing_variable_ids(session), ["monthly_net_salary"])
+
+        session = SessionReasoningService.set_values(session, {"monthly_net_salary": 1500})
+        session = SessionReasoningService.continue_reasoning(session)
+        self.assertEqual(session.state, ReasoningState.FINISHED)
+        self.assertEqual(session.evaluation_message, EvaluationMessage.PASSED)
+
+    def test_type_mismatch_sets_error(self):
+        kb = build_loan_knowledge_base()
+        session = SessionReasoningService.start_reasoning(ReasoningSession(ReasoningMethod.DEDUCTION, kb))
+        session = SessionReasoningService.set_values(session, {"monthly_net_salary": "high"})
+        session = SessionReasoningService.continue_reasoning(session)
+        self.assertEqual(session.evaluation_message, EvaluationMessage.ERROR)
+        self.assertIn("Type mismatch", session.reasoning_error_message)
+
+    def test_missing_variables_skip_decided_rules(self):
+        session = SessionReasoningService.start_reasoning(ReasoningSession(ReasoningMethod.DEDUCTION, build_decision_knowledge_base()))
+        self.assertEqual(SessionReasoningService.get_all_missing_variable_ids(session), ["fraud_flag", "income", "debt", "region"])
+
+        session = SessionReasoningService.continue_reasoning(SessionReasoningService.set_values(session, {"fraud_flag": True}))
+        # Both rules testing income failed on fraud_flag
+        self.assertEqual(SessionReasoningService.get_all_missing_variable_ids(session), ["debt", "region"])
+
+        session = SessionReasoningService.continue_reasoning(SessionReasoningService.set_values(session, {"debt": 0}))
+        self.assertEqual(session.state, ReasoningState.FINISHED)
+        self.assertEqual(SessionReasoningService.get_all_missing_variable_ids(session), [])
+
+    def test_missing_variables_match_stateful_engine(self):
+        values = {
+            "fraud_flag": [True, False],
+            "income": [1000, 5000],
+            "debt": [0, 900],
+            "region": ["north", "East"],
+        }
+        hypotheses = [None, Variable(id="decision", value="accept"), Variable(id="decision", value="escalate")]
+        for seed in range(30):
+            generator = random.Random(seed)
+            hypothesis = generator.choice(hypotheses)
+            method = ReasoningMethod.HYPOTHESIS_TESTING if hypothesis else ReasoningMethod.DEDUCTION
+            options = {"hypothesis": hypothesis} if hypothesis else None
+            variable_ids = list(values)
+            generator.shuffle(variable_ids)
+
+            session = SessionReasoningService.start_reasoning(ReasoningSession(method, build_decision_knowledge_base(), options))
+            process = DeductiveReasoningService.start_reasoning(ReasoningProcess(method, build_decision_knowledge_base(), options))
+            for variable_id in variable_ids:
+                self.assertEqual(SessionReasoningService.get_all_missing_variable_ids(session), DeductiveReasoningService.get_all_missing_variable_ids(process))
+                fact = {variable_id: generator.choice(values[variable_id])}
+                session = SessionReasoningService.continue_reasoning(SessionReasoningService.set_values(session, fact))
+                process = DeductiveReasoningService.continue_reasoning(DeductiveReasoningService.set_values(process, fact))
+
+    def test_overwritten_fact_reopens_rules(self):
+        for service, process_class in [(DeductiveReasoningService, ReasoningProcess), (SessionReasoningService, ReasoningSession)]:
+            with self.subTest(service=service.__name__):
+                process = service.start_reasoning(process_class(ReasoningMethod.DEDUCTION, build_loan_knowledge_base()))
+                process = service.continue_reasoning(service.set_values(process, {"monthly_net_salary": 3000, "fraud_flag": False}))
+                self.assertEqual([(item.id, item.value) for item in process.reasoned_items], [("loan_accepted", True)])
+
+                process = service.continue_reasoning(service.set_values(process, {"monthly_net_salary": 1000}))
+                self.assertEqual(process.evaluation_message, EvaluationMessage.PASSED)
+                self.assertEqual([(item.id, item.value) for item in process.reasoned_items], [("loan_accepted", False)])
+
+                # Setting the same value again keeps the results
+                process = service.continue_reasoning(service.set_values(process, {"monthly_net_salary": 1000, "fraud_flag": False}))
+                self.assertEqual([(item.id, item.value) for item in process.reasoned_items], [("loan_accepted", False)])
+
+                process = service.continue_reasoning(service.set_values(process, {"monthly_net_salary": "high"}))
+                self.assertEqual(process.evaluation_message, EvaluationMessage.ERROR)
+
+    def test_deduction_with_conclusion_as_fact(self):
+        eligible = RuleBuilder() \
+            .set_conclusion(VariableBuilder().set_id("eligible").set_value(True).unwrap()) \
+            .add_predicate(PredicateBuilder().configure_predicate("monthly_net_salary", OperatorType.GREATER_OR_EQUAL, 2000).unwrap()) \
+            .unwrap()
+        accepted = RuleBuilder() \
+            .set_conclusion(VariableBuilder().set_id("loan_accepted").set_value(True).unwrap()) \
+            .add_predicate(PredicateBuilder().configure_predicate("eligible", OperatorType.EQUAL, True).unwrap()) \
+            .add_predicate(PredicateBuilder().configure_predicate("fraud_flag", OperatorType.EQUAL, False).unwrap()) \
+            .unwrap()
+        kb = KnowledgeBaseBuilder().set_id("kb1").add_rule(accepted).add_rule(eligible).unwrap()
+
+        session = SessionReasoningService.start_reasoning(ReasoningSession(ReasoningMethod.DEDUCTION, kb, {"conclusion_as_fact": True}))
+        session = SessionReasoningService.set_values(session, {"monthly_net_salary": 3000, "fraud_flag": False})
+        session = SessionReasoningService.continue_reasoning(session)
+        self.assertEqual(session.state, ReasoningState.FINISHED)
+        self.assertEqual([(item.id, item.value) for item in session.reasoned_items], [("eligible", True), ("loan_accepted", True)])
+        self.assertEqual(session.facts["eligible"], True)
+        for rule in kb.rule_set:
+            for predicate in rule.predicates:
+                self.assertIsNone(predicate.left_term.value)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import pandas as pd
+from src.business_rules_reasoning.base import Variable, OperatorType
+from src.business_rules_reasoning.base.reasoning_enums import EvaluationMessage, ReasoningMethod
+from src.business_rules_reasoning.deductive import DeductiveReasoningService, KnowledgeBaseBuilder, RuleBuilder, PredicateBuilder, VariableBuilder
+from src.business_rules_reasoning.deductive.vectorized_evaluator import VectorizedEvaluator, VectorizedColumn
+from test.deductive.knowledge_bases import build_random_knowledge_base, build_random_rows, describe
+
+class TestVectorizedEvaluator(unittest.TestCase):
+    def test_matches_scalar_engine(self):
+        messages = set()
+        for seed in range(5):
+            kb = build_random_knowledge_base(seed)
+            rows = build_random_rows(seed, 300)
+            expected = DeductiveReasoningService.evaluate_batch(kb, rows)
+            actual = VectorizedEvaluator(kb).evaluate(rows, chunk_size=64)
+            self.assertEqual(describe(actual), describe(expected))
+            messages.update(result.evaluation_message for result in expected)
+        self.assertEqual(messages, {EvaluationMessage.PASSED, EvaluationMessage.FAILED, EvaluationMessage.MISSING_VALUES, EvaluationMessage.ERROR})
+
+    def test_matches_scalar_engine_for_hypothesis_testing(self):
+        kb = build_random_knowledge_base(7)
+        rows = build_random_rows(7, 300)
+        options = {"hypothesis": Variable(id="decision_1", value=True)}
+        expected = DeductiveReasoningService.evaluate_batch(kb, rows, ReasoningMethod.HYPOTHESIS_TESTING, options)
+        actual = DeductiveReasoningService.evaluate_batch(kb, rows, ReasoningMethod.HYPOTHESIS_TESTING, options, backend="numpy")
+        self.assertEqual(describe(actual), describe(expected))
+
+    def test_dataframe_input(self):
+        kb = build_random_knowledge_base(3)
+        rows = build_random_rows(3, 200)
+        expected = DeductiveReasoningService.evaluate_batch(kb, rows)
+        actual = DeductiveReasoningService.evaluate_batch(kb, pd.DataFrame(rows), backend="numpy")
+        self.assertEqual(describe(actual), describe(expected))
+
+    def test_unsupported_values_fall_back_to_scalar_engine(self):
+        kb = KnowledgeBaseBuilder().add_rule(RuleBuilder()
+            .set_conclusion(VariableBuilder().set_id("result").set_value(True).unwrap())
+            .add_predicate(PredicateBuilder().configure_predicate("tags", OperatorType.SUBSET, ["a", "b"]).unwrap())
+            .unwrap()).unwrap()
+        results = VectorizedEvaluator(kb).evaluate([{"tags": ["a"]}, {"tags": ["c"]}, {"tags": "b"}])
+        self.assertEqual([result.evaluation_message for result in results], [EvaluationMessage.PASSED, EvaluationMessage.FAILED, EvaluationMessage.PASSED])
+
+    def test_predicate_mask(self):
+        kb = build_random_knowledge_base(0)
+        predicate = PredicateBuilder().configure_predicate("country", OperatorType.EQUAL, "PL").unwrap()
+        truth, error = VectorizedEvaluator(kb).predicate_mask(predicate, VectorizedColumn.from_values(["pl", "de", None, 5]))
+        self.assertEqual(truth.tolist(), [True, False, False, False])
+        self.assertEqual(error.tolist(), [False, False, False, True])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,8 +2,9 @@ import unittest
 from unittest.mock import MagicMock, patch
 from src.business_rules_reasoning.base import KnowledgeBase, ReasoningProcess, ReasoningMethod, Variable, Rule, ReasoningType, ReasoningState, EvaluationMessage
 from src.business_rules_reasoning.base.operator_enums import OperatorType
-from src.business_rules_reasoning.deductive import DeductivePredicate, DeductiveConclusion
-from src.business_rules_reasoning.orchestrator import OrchestratorStatus
+from src.business_rules_reasoning.deductive import DeductivePredicate, DeductiveConclusion, ReasoningSession
+from test.deductive.knowledge_bases import build_decision_knowledge_base
+from src.business_rules_reasoning.orchestrator import OrchestratorStatus, OrchestratorOptions, VariablesFetchingMode
 from src.business_rules_reasoning.orchestrator.llm import HuggingFacePipeline, LLMOrchestrator
 
 class TestHuggingFaceOrchestrator(unittest.TestCase):
@@ -210,5 +211,39 @@ class TestHuggingFaceOrchestrator(unittest.TestCase):
             self.orchestrator._fetch_hypothesis_conclusion("test query", "kb1")
         self.assertIn("[Orchestrator]: No matching hypothesis_value found in the response.", str(context.exception))
 
+    def test_fetch_hypothesis_conclusion_keeps_knowledge_base_conclusion(self):
+        variable1 = Variable(id="hypothesis1", name="Hypothesis 1", value=True)
+        knowledge_base = KnowledgeBase(id="kb1", rule_set=[Rule(conclusion=DeductiveConclusion(variable1)), Rule(conclusion=DeductiveConclusion(variable1))])
+        self.orchestrator.knowledge_bases = [knowledge_base]
+        self.orchestrator.llm.prompt_text_generation.return_value = '{"hypothesis_id": "hypothesis1", "hypothesis_value": "false"}'
+
+        result = self.orchestrator._fetch_hypothesis_conclusion("test query", "kb1")
+
+        self.assertFalse(result.value)
+        self.assertIsNot(result, variable1)
+        self.assertTrue(variable1.value)
+        conclusions_info = self.orchestrator.llm.templates.FetchHypothesisTestingTemplate.format.call_args.kwargs["conclusions"]
+        self.assertEqual(conclusions_info, "hypothesis1 - Hypothesis 1")
+
+    def test_step_by_step_asks_planned_variables(self):
+        orchestrator = LLMOrchestrator(
+            knowledge_base_retriever=self.knowledge_base_retriever,
+            inference_state_retriever=self.inference_state_retriever,
+            llm=self.llm,
+            options=OrchestratorOptions(variables_fetching=VariablesFetchingMode.STEP_BY_STEP, use_reasoning_sessions=True)
+        )
+        facts = {"fraud_flag": True, "income": 1000, "debt": 0, "region": "north"}
+        orchestrator.reasoning_process = ReasoningSession(ReasoningMethod.DEDUCTION, build_decision_knowledge_base())
+        orchestrator._start_reasoning_process()
+        orchestrator._fetch_variables = MagicMock(side_effect=lambda text, variables: {variable.id: facts[variable.id] for variable in variables})
+
+        orchestrator._next_step("test query mock")
+
+        # Income is only tested by rules that failed on fraud_flag
+        asked = [call.args[1][0].id for call in orchestrator._fetch_variables.call_args_list]
+        self.assertEqual(asked, ["fraud_flag", "debt"])
+        self.assertEqual(orchestrator.status, OrchestratorStatus.INFERENCE_FINISHED)
+        self.assertEqual([item.value for item in orchestrator.reasoning_process.reasoned_items], ["reject"])
+
 if __name__ == '__main__':
     unittest.main()
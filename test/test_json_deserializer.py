@@ -1,9 +1,10 @@
 import unittest
 from src.business_rules_reasoning.json_deserializer import deserialize_reasoning_process, deserialize_knowledge_base
 from src.business_rules_reasoning.base import ReasoningProcess, KnowledgeBase, Rule, Variable, OperatorType
-from src.business_rules_reasoning.deductive import DeductivePredicate, DeductiveConclusion
+from src.business_rules_reasoning.deductive import DeductivePredicate, DeductiveConclusion, DeductiveReasoningService, SessionReasoningService, ReasoningSession
 from src.business_rules_reasoning.base.reasoning_enums import ReasoningState, EvaluationMessage, ReasoningMethod, ReasoningType
 from src.business_rules_reasoning.json_serializer import serialize_reasoning_process, serialize_knowledge_base
+from test.deductive.knowledge_bases import build_decision_knowledge_base
 
 class TestJsonDeserializer(unittest.TestCase):
     def test_deserialize_reasoning_process(self):
@@ -38,6 +39,22 @@ class TestJsonDeserializer(unittest.TestCase):
         self.assertEqual(deserialized.knowledge_base.name, "Age Classification")
         self.assertEqual(deserialized.knowledge_base.description, "Classify age into categories")
 
+    def test_continue_reasoning_after_round_trip(self):
+        for service, reasoning_process in [
+            (DeductiveReasoningService, ReasoningProcess(reasoning_method=ReasoningMethod.DEDUCTION, knowledge_base=build_decision_knowledge_base())),
+            (SessionReasoningService, ReasoningSession(ReasoningMethod.DEDUCTION, build_decision_knowledge_base()))
+        ]:
+            with self.subTest(service=service.__name__):
+                reasoning_process = service.start_reasoning(reasoning_process)
+                reasoning_process = service.continue_reasoning(service.set_values(reasoning_process, {"fraud_flag": False, "income": 1000}))
+                self.assertEqual(reasoning_process.evaluation_message, EvaluationMessage.MISSING_VALUES)
+
+                deserialized = deserialize_reasoning_process(serialize_reasoning_process(reasoning_process))
+                self.assertEqual([(item.id, item.value) for item in deserialized.reasoned_items], [("decision", "review")])
+                deserialized = service.continue_reasoning(service.set_values(deserialized, {"debt": 100}))
+                self.assertEqual(deserialized.evaluation_message, EvaluationMessage.PASSED)
+                self.assertEqual([(item.id, item.value) for item in deserialized.reasoned_items], [("decision", "review")])
+
     def test_deserialize_knowledge_base(self):
         # Create variables
         age_variable = Variable(id="1", name="Age", value=25)